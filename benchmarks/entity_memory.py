@@ -0,0 +1,166 @@
+"""
+Reports the memory cost per breed of the entity representations.
+
+Usage:
+    python -m benchmarks.entity_memory [--count 10000]
+
+'dict dataclasses' replicates the original (non-slotted) entity classes,
+'slotted dataclasses' is the current domain model and 'BreedTable' is the
+array-backed store with interned strings.
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from src.domain.entities.breed import Breed, BreedAttributes, LifeSpan, WeightRange, BreedRelationships, GroupRelationship, BreedLinks
+from src.infrastructure.storage.entity_tables import BreedTable
+
+
+@dataclass
+class DictWeightRange:
+    min: float
+    max: float
+
+
+@dataclass
+class DictLifeSpan:
+    min: int
+    max: int
+
+
+@dataclass
+class DictGroupRelationship:
+    id: str
+    type: str = "group"
+
+
+@dataclass
+class DictBreedAttributes:
+    name: str
+    description: Optional[str] = None
+    life: Optional[DictLifeSpan] = None
+    male_weight: Optional[DictWeightRange] = None
+    female_weight: Optional[DictWeightRange] = None
+    hypoallergenic: bool = False
+
+
+@dataclass
+class DictBreedRelationships:
+    group: Optional[DictGroupRelationship] = None
+
+
+@dataclass
+class DictBreedLinks:
+    self: str
+
+
+@dataclass
+class DictBreed:
+    id: str
+    attributes: DictBreedAttributes
+    type: str = "breed"
+    relationships: Optional[DictBreedRelationships] = None
+    links: Optional[DictBreedLinks] = None
+    breed_group: Optional[str] = None
+    image_url: Optional[str] = None
+
+
+GROUP_IDS = [f"group-{i:04d}" for i in range(8)]
+
+
+def _raw(i: int) -> dict:
+    return {
+        "id": f"breed-{i:08d}",
+        "name": f"Breed {i}",
+        "description": f"Synthetic breed number {i}",
+        "life": (10 + i % 4, 14 + i % 5),
+        "male_weight": (20.0 + i % 10, 30.0 + i % 10),
+        "female_weight": (18.0 + i % 10, 26.0 + i % 10),
+        "hypoallergenic": i % 5 == 0,
+        "group": GROUP_IDS[i % len(GROUP_IDS)],
+        "link": f"https://dogapi.dog/api/v2/breeds/breed-{i:08d}",
+    }
+
+
+def build_dict_breeds(count: int) -> List[DictBreed]:
+    breeds = []
+    for i in range(count):
+        raw = _raw(i)
+        breeds.append(DictBreed(
+            id=raw["id"],
+            attributes=DictBreedAttributes(
+                name=raw["name"],
+                description=raw["description"],
+                life=DictLifeSpan(*raw["life"]),
+                male_weight=DictWeightRange(*raw["male_weight"]),
+                female_weight=DictWeightRange(*raw["female_weight"]),
+                hypoallergenic=raw["hypoallergenic"]
+            ),
+            relationships=DictBreedRelationships(group=DictGroupRelationship(id=raw["group"])),
+            links=DictBreedLinks(self=raw["link"])
+        ))
+    return breeds
+
+
+def _slotted(i: int) -> Breed:
+    raw = _raw(i)
+    return Breed(
+        id=raw["id"],
+        attributes=BreedAttributes(
+            name=raw["name"],
+            description=raw["description"],
+            life=LifeSpan(*raw["life"]),
+            male_weight=WeightRange(*raw["male_weight"]),
+            female_weight=WeightRange(*raw["female_weight"]),
+            hypoallergenic=raw["hypoallergenic"]
+        ),
+        relationships=BreedRelationships(group=GroupRelationship(id=raw["group"])),
+        links=BreedLinks(self=raw["link"])
+    )
+
+
+def build_slotted_breeds(count: int) -> List[Breed]:
+    return [_slotted(i) for i in range(count)]
+
+
+def build_table(count: int) -> BreedTable:
+    # Stream the entities into the table so only the table stays alive
+    table = BreedTable()
+    for i in range(count):
+        table.append(_slotted(i))
+    return table
+
+
+def measure(build: Callable[[int], object], count: int) -> float:
+    """Returns the bytes retained per breed by the structure `build` returns."""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    retained = build(count)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return (after - before) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args()
+
+    results = [
+        ("dict dataclasses", measure(build_dict_breeds, args.count)),
+        ("slotted dataclasses", measure(build_slotted_breeds, args.count)),
+        ("BreedTable", measure(build_table, args.count)),
+    ]
+    baseline = results[0][1]
+    print(f"{'representation':<22}{'bytes/breed':>14}{'vs dict':>10}")
+    for name, per_breed in results:
+        print(f"{name:<22}{per_breed:>14.1f}{per_breed / baseline:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
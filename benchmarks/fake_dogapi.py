@@ -0,0 +1,196 @@
+"""
+Local stand-in for dogapi.dog serving deterministic JSON:API payloads.
+
+Usage:
+    python -m benchmarks.fake_dogapi [--port 8081] [--latency 0.02] [--error-rate 0.01]
+
+Serves /api/v2/breeds, /breeds/<id>, /groups, /groups/<id> and /facts with
+the pagination and relationship shapes of the real API. Every response is
+delayed by `latency` plus up to `jitter` seconds, and a fraction
+`error_rate` of the requests fail with `error_status`.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+API_PREFIX = "/api/v2"
+GROUP_NAMES = ("Herding", "Hound", "Sporting", "Terrier", "Toy", "Working", "Non-Sporting", "Foundation")
+
+
+def build_catalog(breed_count: int = 300, fact_count: int = 100) -> Dict[str, List[Dict[str, Any]]]:
+    """Builds the JSON:API resources served by the fake; the same counts always give the same catalog."""
+    groups = [
+        {
+            "id": f"group-{index:04d}",
+            "type": "group",
+            "attributes": {"name": name},
+            "relationships": {"breeds": {"data": []}},
+        }
+        for index, name in enumerate(GROUP_NAMES)
+    ]
+    breeds = []
+    for index in range(breed_count):
+        group = groups[index % len(groups)]
+        breed = {
+            "id": f"breed-{index:06d}",
+            "type": "breed",
+            "attributes": {
+                "name": f"{group['attributes']['name']} Breed {index}",
+                "description": f"Synthetic breed number {index}, bred for benchmarks.",
+                "life": {"min": 10 + index % 4, "max": 14 + index % 5},
+                "male_weight": {"min": 20 + index % 10, "max": 30 + index % 10},
+                "female_weight": {"min": 18 + index % 10, "max": 26 + index % 10},
+                "hypoallergenic": index % 5 == 0,
+            },
+            "relationships": {"group": {"data": {"id": group["id"], "type": "group"}}},
+        }
+        breeds.append(breed)
+        group["relationships"]["breeds"]["data"].append({"id": breed["id"], "type": "breed"})
+    facts = [
+        {"id": f"fact-{index:05d}", "type": "fact", "attributes": {"body": f"Dog fact number {index}."}}
+        for index in range(fact_count)
+    ]
+    return {"breeds": breeds, "groups": groups, "facts": facts}
+
+
+class FakeDogAPI:
+    """Threaded HTTP/1.1 server answering like dogapi.dog, with injectable latency and errors."""
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        breed_count: int = 300,
+        fact_count: int = 100,
+        seed: int = 0
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.catalog = build_catalog(breed_count, fact_count)
+        self._index = {name: {item["id"]: item for item in items} for name, items in self.catalog.items()}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}{API_PREFIX}"
+
+    def start(self) -> "FakeDogAPI":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-dogapi", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _draw(self) -> Tuple[float, bool]:
+        """Returns this request's delay and whether it fails."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0.0, self.jitter) if self.jitter else 0.0)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+        return delay, failed
+
+    def respond(self, path: str) -> Tuple[int, Dict[str, Any]]:
+        """Returns the status and JSON document for an upstream path such as /api/v2/breeds?page[number]=2."""
+        parts = urllib.parse.urlsplit(path)
+        query = dict(urllib.parse.parse_qsl(parts.query))
+        segments = [segment for segment in parts.path[len(API_PREFIX):].split("/") if segment]
+        if not segments or segments[0] not in self.catalog:
+            return 404, {"errors": [{"status": "404", "title": "Not Found"}]}
+
+        resource = segments[0]
+        if len(segments) == 2:
+            item = self._index[resource].get(segments[1])
+            if item is None:
+                return 404, {"errors": [{"status": "404", "title": "Not Found"}]}
+            return 200, {"data": item, "links": {"self": f"https://dogapi.dog{API_PREFIX}/{resource}/{item['id']}"}}
+
+        items = self.catalog[resource]
+        if resource == "facts":
+            limit = max(1, min(int(query.get("limit", 1)), len(items)))
+            with self._lock:
+                return 200, {"data": self._random.sample(items, limit)}
+
+        search = query.get("filter[search]", "").lower()
+        if search:
+            items = [item for item in items if search in item["attributes"]["name"].lower()]
+        page = max(1, int(query.get("page[number]", 1)))
+        size = max(1, int(query.get("page[size]", 10)))
+        last = max(1, -(-len(items) // size))
+        return 200, {
+            "data": items[(page - 1) * size:page * size],
+            "meta": {"pagination": {"current": page, "next": page + 1 if page < last else None, "last": last, "records": len(items)}},
+            "links": {},
+        }
+
+    def _handler_class(self) -> type:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Small responses would otherwise wait on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                delay, failed = fake._draw()
+                if delay:
+                    time.sleep(delay)
+                status, document = (fake.error_status, {"errors": []}) if failed else fake.respond(self.path)
+                body = json.dumps(document).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/vnd.api+json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--breeds", type=int, default=300)
+    args = parser.parse_args()
+
+    fake = FakeDogAPI(
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        breed_count=args.breeds
+    ).start()
+    print(f"Fake dogapi serving at {fake.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
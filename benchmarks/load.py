@@ -0,0 +1,280 @@
+"""
+Load-tests every route against a local dogapi stand-in and reports the
+throughput and p50/p95/p99 latency of each route.
+
+Usage:
+    python -m benchmarks.load [--duration 3] [--concurrency 8] [--repository cached|snapshot|direct]
+                              [--mode sync|async] [--latency 0.02] [--error-rate 0.0]
+                              [--output results.json] [--baseline results.json]
+
+The app is served over HTTP by a threaded werkzeug server, and the fake
+upstream (benchmarks.fake_dogapi) runs in the same process unless
+--upstream points at one started separately. --catalog-size serves a
+synthetic catalog (benchmarks.synthetic_catalog) from memory instead. Routes are loaded one after
+another by a closed-loop generator with keep-alive connections, after a
+warm-up. --output saves the results with the commit they were measured on;
+--baseline compares against such a file and exits with status 1 when a
+route's p95 or throughput regressed by more than --tolerance.
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from benchmarks.fake_dogapi import FakeDogAPI
+from benchmarks.synthetic_catalog import generate_catalog, parse_size
+from src.application.ports.output.dog_repository import DogRepository
+
+SAMPLE_IDS = 20
+
+
+@dataclass
+class RouteResult:
+    route: str
+    requests: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+class _KeepAliveHandler(WSGIRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_request(self, *args) -> None:
+        pass
+
+
+def _routes(pairs: List[Tuple[str, str]], groups: List[str], names: List[str]) -> List[Tuple[str, Iterator[str]]]:
+    """
+    Every route of the API with the request paths to cycle through, spread
+    over the (group, breed) ID pairs given and searching the breed names' words.
+    """
+    breeds = [breed for _, breed in pairs]
+    terms = sorted({urllib.parse.quote(word.lower()) for name in names for word in name.split()[:2]})
+    pages = range(1, 6)
+    return [
+        ("/breeds", (f"/breeds?page={page}&per_page=20" for page in itertools.cycle(pages))),
+        ("/breeds?search", (f"/breeds?search={term}" for term in itertools.cycle(terms))),
+        ("/breeds?sort_by", itertools.cycle(["/breeds?sort_by=name&sort_order=desc&per_page=20"])),
+        ("/breeds?ids", (f"/breeds?ids={','.join(breeds[index:index + 5])}" for index in itertools.cycle(range(0, SAMPLE_IDS, 5)))),
+        ("/breeds?cursor", itertools.cycle(["/breeds?cursor=&per_page=20"])),
+        ("/breeds/<breed_id>", (f"/breeds/{breed_id}" for breed_id in itertools.cycle(breeds))),
+        ("/facts", itertools.cycle(["/facts"])),
+        ("/groups", itertools.cycle(["/groups"])),
+        ("/groups?ids", itertools.cycle([f"/groups?ids={','.join(groups[:3])}"])),
+        ("/groups?cursor", itertools.cycle(["/groups?cursor="])),
+        ("/groups/<group_id>", (f"/groups/{group_id}" for group_id in itertools.cycle(groups))),
+        ("/group-details/<group_id>", (f"/group-details/{group_id}" for group_id in itertools.cycle(groups))),
+        ("/group-details/<group_id>/breed/<breed_id>", (f"/group-details/{group}/breed/{breed}" for group, breed in itertools.cycle(pairs))),
+        ("/group-details/<group_id>/breeds", (f"/group-details/{group_id}/breeds" for group_id in itertools.cycle(groups))),
+        ("/export/breeds.ndjson", itertools.cycle(["/export/breeds.ndjson"])),
+    ]
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def _worker(port: int, paths: Iterator[str], lock: threading.Lock, stop_at: float, latencies: List[float], errors: List[int]) -> None:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    local: List[float] = []
+    failed = 0
+    while time.perf_counter() < stop_at:
+        with lock:
+            path = next(paths)
+        started = time.perf_counter()
+        try:
+            connection.request("GET", path, headers={"Accept-Encoding": "gzip"})
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                failed += 1
+            if response.getheader("Connection", "").lower() == "close":
+                connection.close()
+        except (OSError, http.client.HTTPException):
+            failed += 1
+            connection.close()
+            continue
+        local.append(time.perf_counter() - started)
+    connection.close()
+    with lock:
+        latencies.extend(local)
+        errors.append(failed)
+
+
+def run_route(port: int, route: str, paths: Iterator[str], duration: float, concurrency: int, warmup: float) -> RouteResult:
+    """Loads one route with `concurrency` closed-loop clients for `duration` seconds after a warm-up."""
+    lock = threading.Lock()
+    # Only the last phase is kept: the warm-up fills caches and connection pools
+    for phase_duration in (warmup, duration):
+        latencies: List[float] = []
+        errors: List[int] = []
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=_worker, args=(port, paths, lock, started + phase_duration, latencies, errors))
+            for _ in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return RouteResult(
+        route=route,
+        requests=len(latencies),
+        errors=sum(errors),
+        throughput=round(len(latencies) / elapsed, 1),
+        p50_ms=round(_percentile(latencies, 0.50) * 1000, 3),
+        p95_ms=round(_percentile(latencies, 0.95) * 1000, 3),
+        p99_ms=round(_percentile(latencies, 0.99) * 1000, 3),
+    )
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _start_app(upstream_url: str, args: argparse.Namespace, dog_repository: Optional[DogRepository] = None):
+    """Points the clients at the fake upstream and serves the app, or one over `dog_repository`, on an ephemeral port."""
+    os.environ["DOG_API_REPOSITORY"] = args.repository
+    os.environ["DOG_API_MODE"] = args.mode
+    os.environ["DOG_API_RATE_LIMIT"] = str(args.rate_limit)
+
+    from src.infrastructure.api.app import create_app
+    from src.infrastructure.external.dog_api.client import DogAPIClient
+    DogAPIClient.BASE_URL = upstream_url
+    if args.mode == "async":
+        from src.infrastructure.external.dog_api.async_client import AsyncDogAPIClient
+        AsyncDogAPIClient.BASE_URL = upstream_url
+
+    server = make_server("127.0.0.1", 0, create_app(dog_repository), threaded=True, request_handler=_KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, name="benchmark-app", daemon=True).start()
+    return server
+
+
+def compare(results: List[RouteResult], baseline: Dict, tolerance: float) -> List[str]:
+    """Returns a description of every route that got slower than the baseline by more than `tolerance`."""
+    previous = {entry["route"]: entry for entry in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(result.route)
+        if before is None:
+            continue
+        if before["p95_ms"] and result.p95_ms > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{result.route}: p95 {before['p95_ms']:.2f} -> {result.p95_ms:.2f} ms")
+        if result.throughput < before["throughput"] * (1 - tolerance):
+            regressions.append(f"{result.route}: throughput {before['throughput']:.1f} -> {result.throughput:.1f} req/s")
+    return regressions
+
+
+def _print_results(results: List[RouteResult], baseline: Optional[Dict]) -> None:
+    previous = {entry["route"]: entry for entry in baseline["results"]} if baseline else {}
+    width = max(len(result.route) for result in results) + 2
+    print(f"{'route':<{width}}{'req':>8}{'err':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'p95 vs base':>13}")
+    for result in results:
+        before = previous.get(result.route)
+        delta = f"{result.p95_ms / before['p95_ms'] - 1:>+12.0%}" if before and before["p95_ms"] else f"{'':>12}"
+        print(
+            f"{result.route:<{width}}{result.requests:>8}{result.errors:>6}{result.throughput:>10.1f}"
+            f"{result.p50_ms:>10.2f}{result.p95_ms:>10.2f}{result.p99_ms:>10.2f} {delta}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=3.0, help="measured seconds per route")
+    parser.add_argument("--warmup", type=float, default=0.5, help="unmeasured seconds per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repository", choices=("cached", "snapshot", "direct"), default="cached")
+    parser.add_argument("--mode", choices=("sync", "async"), default="sync")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="upstream calls per second, 0 for unlimited")
+    parser.add_argument("--latency", type=float, default=0.02, help="fake upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--breeds", type=int, default=300)
+    parser.add_argument("--catalog-size", help="serve a synthetic catalog of this size (10k, 100k, 1m) from memory instead")
+    parser.add_argument("--upstream", help="base URL of a fake dogapi started separately")
+    parser.add_argument("--routes", nargs="*", help="only load these routes")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results written by --output")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    fake = FakeDogAPI(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, breed_count=args.breeds).start()
+    if args.catalog_size:
+        catalog = generate_catalog(parse_size(args.catalog_size))
+        server = _start_app(args.upstream or fake.base_url, args, catalog.repository())
+        pairs = [(breed.relationships.group.id, breed.id) for breed in catalog.breeds[:SAMPLE_IDS]]
+        groups = [group.id for group in catalog.groups[:SAMPLE_IDS]]
+        names = [breed.attributes.name for breed in catalog.breeds[:SAMPLE_IDS]]
+    else:
+        server = _start_app(args.upstream or fake.base_url, args)
+        pairs = [
+            (breed["relationships"]["group"]["data"]["id"], breed["id"])
+            for breed in fake.catalog["breeds"][:SAMPLE_IDS]
+        ]
+        groups = [group["id"] for group in fake.catalog["groups"][:SAMPLE_IDS]]
+        names = [breed["attributes"]["name"] for breed in fake.catalog["breeds"][:SAMPLE_IDS]]
+
+    results = []
+    for route, paths in _routes(pairs, groups, names):
+        if args.routes and route not in args.routes:
+            continue
+        results.append(run_route(server.server_port, route, paths, args.duration, args.concurrency, args.warmup))
+    server.shutdown()
+    fake.stop()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    _print_results(results, baseline)
+
+    if args.output:
+        config = {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+        with open(args.output, "w") as output_file:
+            json.dump({
+                "commit": _commit(),
+                "python": platform.python_version(),
+                "config": config,
+                "results": [asdict(result) for result in results],
+            }, output_file, indent=2)
+
+    if baseline is not None:
+        baseline_config = baseline.get("config", {})
+        if any(baseline_config.get(key) != getattr(args, key) for key in ("repository", "mode", "catalog_size")):
+            print("\nwarning: the baseline was measured with a different repository, mode or catalog size")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%} against {baseline.get('commit') or args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Generates realistic synthetic catalogs of breeds, groups and facts, and
+serves them through the full Flask stack from an InMemoryDogRepository.
+
+Usage:
+    python -m benchmarks.synthetic_catalog [--size 10k|100k|1m|<count>] [--trace-memory] [--serve 5000]
+
+It reports how long generating and indexing the catalog takes and, with
+--trace-memory, how much memory it holds. With --serve the app runs on that port
+so it can be loaded or profiled (DOG_API_PROFILE_ALLOWLIST + X-Profile)
+offline. The same size and seed always produce the same catalog.
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.domain.entities.breed import Breed, BreedAttributes, LifeSpan, WeightRange, BreedRelationships, GroupRelationship, BreedLinks
+from src.domain.entities.fact import Fact, FactAttributes
+from src.domain.entities.group import Group, GroupAttributes, GroupRelationships, BreedReference
+from src.infrastructure.adapters.in_memory_dog_repository import InMemoryDogRepository
+
+# Number of breeds per named scale
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+API_URL = "https://dogapi.dog/api/v2"
+
+ORIGINS = (
+    "Alpine", "American", "Anatolian", "Andalusian", "Arctic", "Australian", "Basque", "Bavarian",
+    "Belgian", "Bohemian", "Breton", "Carpathian", "Catalan", "Caucasian", "Croatian", "Danish",
+    "Dutch", "English", "Finnish", "Flemish", "French", "Frisian", "German", "Greek", "Highland",
+    "Hungarian", "Icelandic", "Irish", "Italian", "Japanese", "Karelian", "Korean", "Lapland",
+    "Mexican", "Moroccan", "Nordic", "Norwegian", "Patagonian", "Polish", "Portuguese", "Pyrenean",
+    "Russian", "Saxon", "Scottish", "Siberian", "Slovak", "Spanish", "Swedish", "Swiss", "Tibetan",
+    "Transylvanian", "Tuscan", "Welsh", "Yakutian",
+)
+COATS = ("", "", "", "Wirehaired", "Smooth", "Long-haired", "Rough-coated", "Curly-coated")
+# Base type, its weight range in kg, and its life span in years
+TYPES = (
+    ("Terrier", (5, 12), (12, 16)), ("Spaniel", (9, 20), (11, 15)), ("Retriever", (25, 36), (10, 13)),
+    ("Shepherd", (22, 40), (10, 14)), ("Hound", (20, 35), (10, 14)), ("Mastiff", (55, 90), (7, 10)),
+    ("Setter", (25, 32), (11, 14)), ("Pointer", (20, 30), (12, 15)), ("Collie", (18, 30), (12, 14)),
+    ("Spitz", (8, 25), (12, 15)), ("Bulldog", (18, 25), (8, 11)), ("Pinscher", (4, 40), (11, 14)),
+    ("Schnauzer", (6, 45), (11, 15)), ("Sheepdog", (25, 45), (10, 13)), ("Laika", (18, 28), (12, 14)),
+    ("Greyhound", (25, 35), (10, 14)), ("Poodle", (4, 30), (12, 15)), ("Bichon", (3, 6), (13, 16)),
+)
+SIZE_PREFIXES = ("Miniature", "Toy", "Standard", "Giant")
+GROUP_KINDS = ("Herding", "Hound", "Sporting", "Terrier", "Toy", "Working", "Non-Sporting", "Foundation")
+TRAITS = (
+    "loyal", "alert", "gentle", "energetic", "independent", "affectionate", "playful", "calm",
+    "intelligent", "protective", "good-natured", "stubborn", "curious", "devoted", "lively",
+)
+JOBS = (
+    "herding sheep", "guarding livestock", "hunting small game", "retrieving waterfowl", "pulling sleds",
+    "guarding estates", "tracking by scent", "ratting on farms", "keeping company", "driving cattle",
+)
+FACT_TEMPLATES = (
+    "A {breed} can hear sounds up to {n} metres away.",
+    "The {breed} was first recorded in {year}.",
+    "Dogs like the {breed} have about {n} times more scent receptors than humans.",
+    "A healthy {breed} sleeps around {hours} hours a day.",
+    "The {breed} was originally bred for {job}.",
+)
+
+
+@dataclass
+class SyntheticCatalog:
+    breeds: List[Breed]
+    groups: List[Group]
+    facts: List[Fact]
+
+    def repository(self, seed: Optional[int] = None) -> InMemoryDogRepository:
+        return InMemoryDogRepository(self.breeds, self.groups, self.facts, seed=seed)
+
+
+def parse_size(size: str) -> int:
+    """Accepts a named scale (10k, 100k, 1m) or a plain breed count."""
+    return SCALES.get(size.lower()) or int(size)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _range(rng: random.Random, low: float, high: float, spread: float) -> tuple:
+    start = round(rng.uniform(low, high), 1)
+    return start, round(start + rng.uniform(0, spread), 1)
+
+
+def generate_catalog(
+    breed_count: int,
+    group_count: Optional[int] = None,
+    fact_count: Optional[int] = None,
+    seed: int = 0
+) -> SyntheticCatalog:
+    """
+    Generates `breed_count` breeds spread over `group_count` groups (one per
+    100 breeds, at least 8) and `fact_count` facts (one per 10 breeds).
+
+    IDs are UUIDs, names combine an origin, coat, size and type (numbered
+    once the combinations run out), and weights and life spans follow the
+    breed type, so searches, filters and sorts behave like on real data.
+    """
+    rng = random.Random(seed)
+    group_count = group_count if group_count is not None else max(len(GROUP_KINDS), breed_count // 100)
+    fact_count = fact_count if fact_count is not None else max(1, breed_count // 10)
+
+    groups = []
+    for index in range(group_count):
+        kind = GROUP_KINDS[index % len(GROUP_KINDS)]
+        region = index // len(GROUP_KINDS)
+        name = kind if region == 0 else f"{ORIGINS[region % len(ORIGINS)]} {kind} {region // len(ORIGINS) + 1}"
+        groups.append(Group(id=_uuid(rng), attributes=GroupAttributes(name=name), relationships=GroupRelationships()))
+
+    combinations = len(ORIGINS) * len(COATS) * len(TYPES)
+    breeds = []
+    for index in range(breed_count):
+        origin = ORIGINS[index % len(ORIGINS)]
+        coat = COATS[(index // len(ORIGINS)) % len(COATS)]
+        breed_type, weight, life = TYPES[(index // (len(ORIGINS) * len(COATS))) % len(TYPES)]
+        size_prefix = rng.choice(SIZE_PREFIXES) if rng.random() < 0.1 else ""
+        name = " ".join(part for part in (origin, coat, size_prefix, breed_type) if part)
+        if index >= combinations:
+            name = f"{name} {index // combinations + 1}"
+
+        scale = {"Miniature": 0.5, "Toy": 0.3, "Giant": 1.6}.get(size_prefix, 1.0)
+        male_min, male_max = _range(rng, weight[0] * scale, weight[1] * scale, 6 * scale)
+        female_min, female_max = _range(rng, weight[0] * scale * 0.85, weight[1] * scale * 0.85, 5 * scale)
+        life_min = rng.randint(*life)
+        group = groups[rng.randrange(group_count)]
+        breed_id = _uuid(rng)
+        # Two distinct traits; indexing is much cheaper than rng.sample at this volume
+        first_trait = rng.randrange(len(TRAITS))
+        traits = (TRAITS[first_trait], TRAITS[(first_trait + rng.randrange(1, len(TRAITS))) % len(TRAITS)])
+        breeds.append(Breed(
+            id=breed_id,
+            attributes=BreedAttributes(
+                name=name,
+                description=(
+                    f"The {name} is a {traits[0]} and {traits[1]} dog from the {origin} tradition, "
+                    f"originally kept for {rng.choice(JOBS)}."
+                ),
+                life=LifeSpan(min=life_min, max=life_min + rng.randint(0, 3)),
+                male_weight=WeightRange(min=male_min, max=male_max),
+                female_weight=WeightRange(min=female_min, max=female_max),
+                hypoallergenic=rng.random() < 0.15
+            ),
+            relationships=BreedRelationships(group=GroupRelationship(id=group.id)),
+            links=BreedLinks(self=f"{API_URL}/breeds/{breed_id}")
+        ))
+        group.relationships.breeds["data"].append(BreedReference(id=breed_id))
+
+    facts = []
+    for index in range(fact_count):
+        breed = breeds[rng.randrange(breed_count)] if breeds else None
+        template = FACT_TEMPLATES[index % len(FACT_TEMPLATES)]
+        body = template.format(
+            breed=breed.attributes.name if breed else "dog",
+            n=rng.randint(10, 400),
+            year=rng.randint(1600, 1990),
+            hours=rng.randint(10, 16),
+            job=rng.choice(JOBS)
+        )
+        facts.append(Fact(id=_uuid(rng), attributes=FactAttributes(body=body)))
+
+    return SyntheticCatalog(breeds=breeds, groups=groups, facts=facts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", default="10k", help="10k, 100k, 1m or a breed count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--serve", type=int, metavar="PORT", help="serve the app on this port")
+    parser.add_argument("--trace-memory", action="store_true", help="report the memory held (slows generation down)")
+    args = parser.parse_args()
+
+    gc.collect()
+    if args.trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    catalog = generate_catalog(parse_size(args.size), seed=args.seed)
+    generated = time.perf_counter()
+    repository = catalog.repository(seed=args.seed)
+    indexed = time.perf_counter()
+
+    print(f"{len(catalog.breeds)} breeds, {len(catalog.groups)} groups, {len(catalog.facts)} facts")
+    print(f"generated in {generated - started:.2f}s, indexed in {indexed - generated:.2f}s")
+    if args.trace_memory:
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{memory / 2 ** 20:.0f} MiB held by the catalog and its indexes")
+
+    if args.serve:
+        from werkzeug.serving import run_simple
+        from src.infrastructure.api.app import create_app
+        run_simple("127.0.0.1", args.serve, create_app(repository), threaded=True)
+
+
+if __name__ == "__main__":
+    main()
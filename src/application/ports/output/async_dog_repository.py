@@ -0,0 +1,106 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List, Optional
+
+from src.domain.entities.breed import Breed
+from src.domain.entities.fact import Fact
+from src.domain.entities.group import Group
+from src.application.ports.output.dog_repository import CRAWL_PAGE_SIZE
+from src.domain.entities.pagination import CursorPage, CursorParams, PaginationParams, SearchParams, PaginatedResponse
+from src.shared.utils.cursor import KeysetWindow
+
+
+class AsyncDogRepository(ABC):
+    @abstractmethod
+    async def get_breeds(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Breed]:
+        """Get all dog breeds with pagination and search"""
+        pass
+
+    @abstractmethod
+    async def get_breed_by_id(self, breed_id: str) -> Optional[Breed]:
+        """Get a specific breed by its ID"""
+        pass
+
+    @abstractmethod
+    async def get_facts(self, limit: Optional[int] = None) -> List[Fact]:
+        """Get interesting facts about dogs; `limit` asks for that many random facts"""
+        pass
+
+    @abstractmethod
+    async def get_groups(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Group]:
+        """Get all breed groups with pagination and search"""
+        pass
+
+    @abstractmethod
+    async def get_group_by_id(self, group_id: str) -> Optional[Group]:
+        """Get a specific group by its ID"""
+        pass
+
+    @abstractmethod
+    async def get_group_details(self, group_id: str) -> Optional[Group]:
+        """Get complete details of a group"""
+        pass
+
+    @abstractmethod
+    async def get_breed_in_group(self, group_id: str, breed_id: str) -> Optional[Breed]:
+        """Get a specific breed within a group"""
+        pass
+
+    @abstractmethod
+    async def get_group_breeds(self, group_id: str, pagination: PaginationParams) -> Optional[PaginatedResponse[Breed]]:
+        """Get the full breed records of a group, paginated"""
+        pass
+
+    @abstractmethod
+    async def get_breeds_by_ids(self, breed_ids: List[str]) -> Dict[str, Optional[Breed]]:
+        """Get several breeds by ID; missing breeds map to None"""
+        pass
+
+    @abstractmethod
+    async def get_groups_by_ids(self, group_ids: List[str]) -> Dict[str, Optional[Group]]:
+        """Get several groups by ID; missing groups map to None"""
+        pass
+
+    async def get_content_version(self) -> Optional[str]:
+        """
+        Get a token that changes whenever any served content changes,
+        or None if the repository cannot tell without fetching
+        """
+        return None
+
+    async def iter_breeds(self, search: Optional[SearchParams] = None) -> AsyncIterator[Breed]:
+        """Iterate over every breed, fetching one page at a time"""
+        page = 1
+        while True:
+            response = await self.get_breeds(PaginationParams(page=page, page_size=CRAWL_PAGE_SIZE), search)
+            for breed in response.items:
+                yield breed
+            if not response.items or not response.has_next:
+                return
+            page += 1
+
+    async def iter_groups(self, search: Optional[SearchParams] = None) -> AsyncIterator[Group]:
+        """Iterate over every group, fetching one page at a time"""
+        page = 1
+        while True:
+            response = await self.get_groups(PaginationParams(page=page, page_size=CRAWL_PAGE_SIZE), search)
+            for group in response.items:
+                yield group
+            if not response.items or not response.has_next:
+                return
+            page += 1
+
+    async def get_breeds_after(self, cursor: CursorParams, search: Optional[SearchParams] = None) -> CursorPage[Breed]:
+        """Get the breeds whose ID follows cursor.after, in ID order"""
+        window = KeysetWindow(cursor.after, cursor.page_size)
+        async for breed in self.iter_breeds(search):
+            window.offer(breed)
+        items, has_more = window.result()
+        return CursorPage.create(items, cursor, has_more)
+
+    async def get_groups_after(self, cursor: CursorParams, search: Optional[SearchParams] = None) -> CursorPage[Group]:
+        """Get the groups whose ID follows cursor.after, in ID order"""
+        window = KeysetWindow(cursor.after, cursor.page_size)
+        async for group in self.iter_groups(search):
+            window.offer(group)
+        items, has_more = window.result()
+        return CursorPage.create(items, cursor, has_more)
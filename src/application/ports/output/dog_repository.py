@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 
 from src.domain.entities.breed import Breed
 from src.domain.entities.fact import Fact
 from src.domain.entities.group import Group
-from src.domain.entities.pagination import PaginationParams, SearchParams, PaginatedResponse
+from src.domain.entities.pagination import CursorPage, CursorParams, PaginationParams, SearchParams, PaginatedResponse
+from src.shared.utils.cursor import KeysetWindow
+
+CRAWL_PAGE_SIZE = 100
 
 
 class DogRepository(ABC):
@@ -19,8 +22,8 @@ class DogRepository(ABC):
         pass
 
     @abstractmethod
-    def get_facts(self) -> List[Fact]:
-        """Get interesting facts about dogs"""
+    def get_facts(self, limit: Optional[int] = None) -> List[Fact]:
+        """Get interesting facts about dogs; `limit` asks for that many random facts"""
         pass
 
     @abstractmethod
@@ -41,4 +44,62 @@ class DogRepository(ABC):
     @abstractmethod
     def get_breed_in_group(self, group_id: str, breed_id: str) -> Optional[Breed]:
         """Get a specific breed within a group"""
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_group_breeds(self, group_id: str, pagination: PaginationParams) -> Optional[PaginatedResponse[Breed]]:
+        """Get the full breed records of a group, paginated"""
+        pass
+
+    @abstractmethod
+    def get_breeds_by_ids(self, breed_ids: List[str]) -> Dict[str, Optional[Breed]]:
+        """Get several breeds by ID; missing breeds map to None"""
+        pass
+
+    @abstractmethod
+    def get_groups_by_ids(self, group_ids: List[str]) -> Dict[str, Optional[Group]]:
+        """Get several groups by ID; missing groups map to None"""
+        pass
+
+    def get_content_version(self) -> Optional[str]:
+        """
+        Get a token that changes whenever any served content changes,
+        or None if the repository cannot tell without fetching
+        """
+        return None
+
+    def iter_breeds(self, search: Optional[SearchParams] = None) -> Iterator[Breed]:
+        """Iterate over every breed, fetching one page at a time"""
+        page = 1
+        while True:
+            response = self.get_breeds(PaginationParams(page=page, page_size=CRAWL_PAGE_SIZE), search)
+            yield from response.items
+            if not response.items or not response.has_next:
+                return
+            page += 1
+
+    def iter_groups(self, search: Optional[SearchParams] = None) -> Iterator[Group]:
+        """Iterate over every group, fetching one page at a time"""
+        page = 1
+        while True:
+            response = self.get_groups(PaginationParams(page=page, page_size=CRAWL_PAGE_SIZE), search)
+            yield from response.items
+            if not response.items or not response.has_next:
+                return
+            page += 1
+
+    def get_breeds_after(self, cursor: CursorParams, search: Optional[SearchParams] = None) -> CursorPage[Breed]:
+        """Get the breeds whose ID follows cursor.after, in ID order"""
+        window = KeysetWindow(cursor.after, cursor.page_size)
+        for breed in self.iter_breeds(search):
+            window.offer(breed)
+        items, has_more = window.result()
+        return CursorPage.create(items, cursor, has_more)
+
+    def get_groups_after(self, cursor: CursorParams, search: Optional[SearchParams] = None) -> CursorPage[Group]:
+        """Get the groups whose ID follows cursor.after, in ID order"""
+        window = KeysetWindow(cursor.after, cursor.page_size)
+        for group in self.iter_groups(search):
+            window.offer(group)
+        items, has_more = window.result()
+        return CursorPage.create(items, cursor, has_more)
@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional
+
+from src.application.ports.output.async_dog_repository import AsyncDogRepository
+from src.application.services.dog_service import _unique_ids
+from src.domain.entities.breed import Breed
+from src.domain.entities.fact import Fact
+from src.domain.entities.group import Group
+from src.domain.entities.pagination import CursorPage, CursorParams, PaginationParams, SearchParams, PaginatedResponse
+from src.shared.utils.timing import timed
+
+
+class AsyncDogService:
+    def __init__(self, dog_repository: AsyncDogRepository):
+        self._dog_repository = dog_repository
+
+    @timed("service")
+    async def get_all_breeds(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Breed]:
+        """Use case: Get all dog breeds with pagination and search"""
+        return await self._dog_repository.get_breeds(pagination, search)
+
+    @timed("service")
+    async def get_breed_by_id(self, breed_id: str) -> Optional[Breed]:
+        """Use case: Get a specific breed"""
+        return await self._dog_repository.get_breed_by_id(breed_id)
+
+    @timed("service")
+    async def get_all_facts(self, limit: Optional[int] = None) -> List[Fact]:
+        """Use case: Get random dog facts"""
+        return await self._dog_repository.get_facts(limit)
+
+    @timed("service")
+    async def get_all_groups(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Group]:
+        """Use case: Get all groups with pagination and search"""
+        return await self._dog_repository.get_groups(pagination, search)
+
+    @timed("service")
+    async def get_group_by_id(self, group_id: str) -> Optional[Group]:
+        """Use case: Get a specific group"""
+        return await self._dog_repository.get_group_by_id(group_id)
+
+    @timed("service")
+    async def get_group_details(self, group_id: str) -> Optional[Group]:
+        """Use case: Get group details"""
+        return await self._dog_repository.get_group_details(group_id)
+
+    @timed("service")
+    async def get_breed_in_group(self, group_id: str, breed_id: str) -> Optional[Breed]:
+        """Use case: Get a breed within a group"""
+        return await self._dog_repository.get_breed_in_group(group_id, breed_id)
+
+    @timed("service")
+    async def get_group_breeds(self, group_id: str, pagination: PaginationParams) -> Optional[PaginatedResponse[Breed]]:
+        """Use case: Get the breeds of a group"""
+        return await self._dog_repository.get_group_breeds(group_id, pagination)
+
+    @timed("service")
+    async def get_breeds_by_ids(self, breed_ids: List[str]) -> Dict[str, Optional[Breed]]:
+        """Use case: Get several breeds at once"""
+        return await self._dog_repository.get_breeds_by_ids(_unique_ids(breed_ids))
+
+    @timed("service")
+    async def get_groups_by_ids(self, group_ids: List[str]) -> Dict[str, Optional[Group]]:
+        """Use case: Get several groups at once"""
+        return await self._dog_repository.get_groups_by_ids(_unique_ids(group_ids))
+
+    @timed("service")
+    async def get_content_version(self) -> Optional[str]:
+        """Use case: Get the version of the served content"""
+        return await self._dog_repository.get_content_version()
+
+    @timed("service")
+    async def get_breeds_after(self, cursor: CursorParams, search: Optional[SearchParams] = None) -> CursorPage[Breed]:
+        """Use case: Get a keyset page of breeds"""
+        return await self._dog_repository.get_breeds_after(cursor, search)
+
+    @timed("service")
+    async def get_groups_after(self, cursor: CursorParams, search: Optional[SearchParams] = None) -> CursorPage[Group]:
+        """Use case: Get a keyset page of groups"""
+        return await self._dog_repository.get_groups_after(cursor, search)
@@ -1,40 +1,92 @@
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 
 from src.application.ports.output.dog_repository import DogRepository
+from src.application.services.fact_pool import FactPool
 from src.domain.entities.breed import Breed
 from src.domain.entities.fact import Fact
 from src.domain.entities.group import Group
-from src.domain.entities.pagination import PaginationParams, SearchParams, PaginatedResponse
+from src.domain.entities.pagination import CursorPage, CursorParams, PaginationParams, SearchParams, PaginatedResponse
+from src.shared.utils.timing import timed
+
+
+def _unique_ids(ids: List[str]) -> List[str]:
+    """Normalizes and dedupes IDs, keeping their first-seen order."""
+    return list(dict.fromkeys(str(item).strip() for item in ids if str(item).strip()))
 
 
 class DogService:
-    def __init__(self, dog_repository: DogRepository):
+    def __init__(self, dog_repository: DogRepository, fact_pool: Optional[FactPool] = None):
         self._dog_repository = dog_repository
+        self._fact_pool = fact_pool
 
+    @timed("service")
     def get_all_breeds(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Breed]:
         """Use case: Get all dog breeds with pagination and search"""
         return self._dog_repository.get_breeds(pagination, search)
 
+    @timed("service")
     def get_breed_by_id(self, breed_id: str) -> Optional[Breed]:
         """Use case: Get a specific breed"""
         return self._dog_repository.get_breed_by_id(breed_id)
 
-    def get_all_facts(self) -> List[Fact]:
-        """Use case: Get all dog facts"""
-        return self._dog_repository.get_facts()
+    @timed("service")
+    def get_all_facts(self, limit: Optional[int] = None) -> List[Fact]:
+        """Use case: Get random dog facts, from the fact pool when there is one"""
+        if self._fact_pool is not None:
+            # Like the upstream, a single fact unless more are asked for
+            return self._fact_pool.sample(limit or 1)
+        return self._dog_repository.get_facts(limit)
 
+    @timed("service")
     def get_all_groups(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Group]:
         """Use case: Get all groups with pagination and search"""
         return self._dog_repository.get_groups(pagination, search)
 
+    @timed("service")
     def get_group_by_id(self, group_id: str) -> Optional[Group]:
         """Use case: Get a specific group"""
         return self._dog_repository.get_group_by_id(group_id)
 
+    @timed("service")
     def get_group_details(self, group_id: str) -> Optional[Group]:
         """Use case: Get group details"""
         return self._dog_repository.get_group_details(group_id)
 
+    @timed("service")
     def get_breed_in_group(self, group_id: str, breed_id: str) -> Optional[Breed]:
         """Use case: Get a breed within a group"""
-        return self._dog_repository.get_breed_in_group(group_id, breed_id) 
\ No newline at end of file
+        return self._dog_repository.get_breed_in_group(group_id, breed_id)
+
+    @timed("service")
+    def get_group_breeds(self, group_id: str, pagination: PaginationParams) -> Optional[PaginatedResponse[Breed]]:
+        """Use case: Get the breeds of a group"""
+        return self._dog_repository.get_group_breeds(group_id, pagination)
+
+    @timed("service")
+    def get_breeds_by_ids(self, breed_ids: List[str]) -> Dict[str, Optional[Breed]]:
+        """Use case: Get several breeds at once"""
+        return self._dog_repository.get_breeds_by_ids(_unique_ids(breed_ids))
+
+    @timed("service")
+    def get_groups_by_ids(self, group_ids: List[str]) -> Dict[str, Optional[Group]]:
+        """Use case: Get several groups at once"""
+        return self._dog_repository.get_groups_by_ids(_unique_ids(group_ids))
+
+    @timed("service")
+    def get_content_version(self) -> Optional[str]:
+        """Use case: Get the version of the served content"""
+        return self._dog_repository.get_content_version()
+
+    @timed("service")
+    def get_breeds_after(self, cursor: CursorParams, search: Optional[SearchParams] = None) -> CursorPage[Breed]:
+        """Use case: Get a keyset page of breeds"""
+        return self._dog_repository.get_breeds_after(cursor, search)
+
+    @timed("service")
+    def get_groups_after(self, cursor: CursorParams, search: Optional[SearchParams] = None) -> CursorPage[Group]:
+        """Use case: Get a keyset page of groups"""
+        return self._dog_repository.get_groups_after(cursor, search)
+
+    def iter_all_breeds(self) -> Iterator[Breed]:
+        """Use case: Export every breed"""
+        return self._dog_repository.iter_breeds()
@@ -0,0 +1,163 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+from src.application.ports.output.dog_repository import DogRepository
+from src.domain.entities.fact import Fact
+from src.shared.utils.forking import reinit_after_fork
+from src.shared.utils.rate_limiter import BACKGROUND, upstream_priority
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FactPoolStats:
+    available: int = 0
+    served: int = 0
+    recycled: int = 0
+    refills: int = 0
+    fetched: int = 0
+    duplicates: int = 0
+
+
+class FactPool:
+    """
+    Local buffer of distinct facts that /facts samples from without calling
+    the upstream.
+
+    Each request takes facts at random, without replacement, from the ones
+    not served yet; served facts move to a recycle ring of `capacity` facts
+    that tops up a sample when the fresh ones run short. Once fewer than
+    `low_water` fresh facts are left, a background refill fetches batches of
+    `batch_size` until the pool holds `capacity` again. Only the very first
+    request, with nothing pooled yet, waits on the upstream.
+    """
+
+    def __init__(
+        self,
+        repository: DogRepository,
+        capacity: int = 500,
+        low_water: int = 100,
+        batch_size: int = 50,
+        retry_interval: float = 60.0,
+        seed: Optional[int] = None,
+        clock=time.monotonic
+    ):
+        self._repository = repository
+        self.capacity = capacity
+        self.low_water = low_water
+        self.batch_size = batch_size
+        # Pause after a refill that failed or found no new facts, so a small upstream catalog is not re-polled on every request
+        self._retry_interval = retry_interval
+        self._clock = clock
+        self._seed = seed
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cold_fill_lock = threading.Lock()
+        self._fresh: List[Fact] = []
+        self._served: List[Fact] = []
+        self._next_recycled = 0
+        self._known: Set[str] = set()
+        self._refilling = False
+        self._next_refill = 0.0
+        self._stats = FactPoolStats()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fact-pool")
+        reinit_after_fork(self, "_after_fork")
+
+    def _after_fork(self) -> None:
+        """Gives a forked worker its own refill thread and, unless seeded, its own random draws."""
+        if self._seed is None:
+            self._random.seed()
+        self._lock = threading.Lock()
+        self._cold_fill_lock = threading.Lock()
+        self._refilling = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fact-pool")
+
+    def sample(self, limit: int) -> List[Fact]:
+        """Returns up to `limit` distinct random facts, fetching only when the pool is still empty."""
+        if self._is_empty():
+            # Concurrent first requests share one fetch
+            with self._cold_fill_lock:
+                if self._is_empty():
+                    self._fill(self.batch_size)
+
+        with self._lock:
+            facts = [self._take_fresh() for _ in range(min(limit, len(self._fresh)))]
+            missing = min(limit - len(facts), len(self._served))
+            recycled = self._random.sample(self._served, missing) if missing > 0 else []
+            for fact in facts:
+                self._recycle(fact)
+            self._stats.served += len(facts) + len(recycled)
+            self._stats.recycled += len(recycled)
+            refill = self._should_refill()
+        if refill:
+            self._executor.submit(self._refill)
+        return facts + recycled
+
+    def _is_empty(self) -> bool:
+        with self._lock:
+            return not self._fresh and not self._served
+
+    def _take_fresh(self) -> Fact:
+        """Removes a random fresh fact in constant time (caller holds the lock)."""
+        index = self._random.randrange(len(self._fresh))
+        self._fresh[index], self._fresh[-1] = self._fresh[-1], self._fresh[index]
+        return self._fresh.pop()
+
+    def _recycle(self, fact: Fact) -> None:
+        """Moves a served fact into the recycle ring, forgetting the one it replaces (caller holds the lock)."""
+        if len(self._served) < self.capacity:
+            self._served.append(fact)
+            return
+        self._known.discard(self._served[self._next_recycled].id)
+        self._served[self._next_recycled] = fact
+        self._next_recycled = (self._next_recycled + 1) % self.capacity
+
+    def _should_refill(self) -> bool:
+        """Claims the refill if the pool is low and none is running (caller holds the lock)."""
+        if self._refilling or len(self._fresh) >= self.low_water or self._clock() < self._next_refill:
+            return False
+        self._refilling = True
+        return True
+
+    def _fill(self, limit: int) -> int:
+        """Fetches one batch and pools the facts not seen yet; returns how many were new."""
+        facts = self._repository.get_facts(limit)
+        with self._lock:
+            self._stats.fetched += len(facts)
+            added = 0
+            for fact in facts:
+                if fact.id in self._known:
+                    self._stats.duplicates += 1
+                    continue
+                if len(self._fresh) >= self.capacity:
+                    break
+                self._known.add(fact.id)
+                self._fresh.append(fact)
+                added += 1
+            return added
+
+    def _refill(self) -> None:
+        exhausted = False
+        try:
+            with upstream_priority(BACKGROUND):
+                # Stops early once a batch brings nothing new: the upstream has no more facts to give now
+                while len(self._fresh) < self.capacity and not exhausted:
+                    exhausted = self._fill(self.batch_size) == 0
+        except Exception:
+            exhausted = True
+            logger.warning("Fact pool refill failed", exc_info=True)
+        finally:
+            with self._lock:
+                self._stats.refills += 1
+                self._refilling = False
+                if exhausted:
+                    self._next_refill = self._clock() + self._retry_interval
+
+    def stats(self) -> FactPoolStats:
+        with self._lock:
+            return FactPoolStats(**{**vars(self._stats), "available": len(self._fresh)})
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Literal
 
 
-@dataclass
+@dataclass(slots=True)
 class WeightRange:
     min: float
     max: float
@@ -12,7 +12,7 @@ class WeightRange:
             raise ValueError("WeightRange: 'min' cannot be greater than 'max'")
 
 
-@dataclass
+@dataclass(slots=True)
 class LifeSpan:
     min: int
     max: int
@@ -22,13 +22,13 @@ class LifeSpan:
             raise ValueError("LifeSpan: 'min' cannot be greater than 'max'")
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupRelationship:
     id: str
     type: Literal["group"] = "group"
 
 
-@dataclass
+@dataclass(slots=True)
 class BreedAttributes:
     name: str
     description: Optional[str] = None
@@ -40,17 +40,17 @@ class BreedAttributes:
    
 
 
-@dataclass
+@dataclass(slots=True)
 class BreedRelationships:
     group: Optional[GroupRelationship] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BreedLinks:
     self: str
 
 
-@dataclass
+@dataclass(slots=True, weakref_slot=True)
 class Breed:
     id: str
     attributes: BreedAttributes
@@ -1,12 +1,12 @@
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class FactAttributes:
     body: str
 
 
-@dataclass
+@dataclass(slots=True, weakref_slot=True)
 class Fact:
     id: str
     attributes: FactAttributes
@@ -2,23 +2,23 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class BreedReference:
     id: str
     type: str = "breed"
 
 
-@dataclass
+@dataclass(slots=True, weakref_slot=True)
 class GroupRelationships:
     breeds: Dict[str, List[BreedReference]] = field(default_factory=lambda: {"data": []})
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupAttributes:
     name: str
 
 
-@dataclass
+@dataclass(slots=True, weakref_slot=True)
 class Group:
     id: str
     attributes: GroupAttributes
@@ -36,4 +36,28 @@ class PaginatedResponse(Generic[T]):
             total_pages=total_pages,
             has_next=params.page < total_pages,
             has_previous=params.page > 1
-        ) 
\ No newline at end of file
+        ) 
+
+@dataclass
+class CursorParams:
+    after: Optional[str] = None
+    page_size: int = 10
+
+@dataclass
+class CursorPage(Generic[T]):
+    """Keyset page: items ordered by ID, following the `after` ID of the request."""
+    items: List[T]
+    page_size: int
+    next_after: Optional[str]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_after is not None
+
+    @classmethod
+    def create(cls, items: List[T], params: CursorParams, has_more: bool) -> 'CursorPage[T]':
+        return cls(
+            items=items,
+            page_size=params.page_size,
+            next_after=items[-1].id if has_more and items else None
+        )
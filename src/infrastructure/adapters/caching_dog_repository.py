@@ -0,0 +1,324 @@
+import logging
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from src.application.ports.output.dog_repository import DogRepository
+from src.domain.entities.breed import Breed
+from src.domain.entities.fact import Fact
+from src.domain.entities.group import Group
+from src.domain.entities.pagination import PaginationParams, SearchParams, PaginatedResponse
+from src.infrastructure.adapters.snapshot_dog_repository import SnapshotDogRepository
+from src.shared.exceptions.api_exception import UpstreamError
+from src.shared.utils.fan_out import FanOut
+from src.shared.utils.forking import reinit_after_fork
+from src.shared.utils.rate_limiter import BACKGROUND, upstream_priority
+from src.shared.utils.ttl_cache import CacheStats, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class CachingDogRepository(DogRepository):
+    """
+    DogRepository decorator that caches the results of another repository.
+
+    Entries are fresh for their method's TTL and then served stale for
+    `stale_ttl` more seconds while a background refresh reloads them. When
+    the upstream fails (or its circuit is open), expired entries up to
+    `stale_if_error_ttl` seconds past their stale window are served instead.
+
+    Searches, breed filters and sorting are answered from `catalog`, a
+    snapshot of the whole catalog with its own search index and breed
+    columns, which the upstream cannot do; once the snapshot is older than
+    its refresh interval it keeps serving while a background refresh
+    replaces it. Without a catalog, they go to the wrapped repository.
+
+    The content version changes whenever a stored value differs from the
+    one it replaces, or the catalog is replaced, so conditional requests are
+    answered without loading or serializing anything.
+    """
+
+    DEFAULT_TTLS: Dict[str, float] = {
+        "get_breeds": 3600.0,
+        "get_breed_by_id": 3600.0,
+        "get_groups": 3600.0,
+        "get_group_by_id": 3600.0,
+        "get_group_details": 3600.0,
+        "get_facts": 60.0,
+    }
+
+    def __init__(
+        self,
+        repository: DogRepository,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 1024,
+        stale_ttl: float = 300.0,
+        not_found_ttl: float = 30.0,
+        refresh_workers: int = 2,
+        fan_out_workers: int = 8,
+        stale_if_error_ttl: float = 86400.0,
+        catalog: Optional[SnapshotDogRepository] = None
+    ):
+        self._repository = repository
+        self._catalog = catalog
+        self._ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self._stale_ttl = stale_ttl
+        self._not_found_ttl = not_found_ttl
+        self._stale_if_error_ttl = stale_if_error_ttl
+        self._served_on_error = 0
+        self._cache: TTLCache[Any] = TTLCache(max_entries=max_entries)
+        self._refresh_executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="cache-refresh")
+        self._refreshing: set = set()
+        self._refreshing_lock = threading.Lock()
+        self._fan_out = FanOut(max_workers=fan_out_workers, name="cache-fan-out")
+        self._content_version = 0
+        # Guards the content version and the served-on-error count, both bumped from request threads
+        self._counters_lock = threading.Lock()
+        # Keeps the versions counted by earlier runs and sibling workers apart from this one's
+        self._epoch = secrets.token_hex(4)
+        reinit_after_fork(self, "_after_fork")
+
+    def _after_fork(self) -> None:
+        """Starts a version sequence of its own in a forked worker, whose cache diverges from its siblings'."""
+        self._epoch = secrets.token_hex(4)
+        self._counters_lock = threading.Lock()
+
+    @staticmethod
+    def _pagination_key(pagination: PaginationParams) -> Tuple:
+        sort_order = (pagination.sort_order or "asc").lower() if pagination.sort_by else None
+        return (pagination.page, pagination.page_size, pagination.sort_by, sort_order)
+
+    @staticmethod
+    def _search_key(search: Optional[SearchParams]) -> Tuple:
+        if not search:
+            return (None, ())
+        query = (search.query or "").strip().lower() or None
+        filters = tuple(sorted((str(k), repr(v)) for k, v in (search.filters or {}).items()))
+        return (query, filters)
+
+    def _store(self, method: str, key: Hashable, value: Any) -> None:
+        ttl = self._ttls[method] if value is not None else min(self._ttls[method], self._not_found_ttl)
+        previous = self._cache.peek(key)
+        # A new key in a full cache evicts another one, which could then come back changed without a comparison
+        changed = previous.value != value if previous is not None else len(self._cache) >= self._cache.max_entries
+        self._cache.set(key, value, ttl, self._stale_ttl)
+        # Bumped only once the new value is visible, so no response pairs the new version with the old value
+        if changed:
+            with self._counters_lock:
+                self._content_version += 1
+
+    def _refresh(self, method: str, key: Hashable, loader: Callable[[], Any]) -> None:
+        try:
+            # Refreshes yield the upstream budget to requests that are waiting on a response
+            with upstream_priority(BACKGROUND):
+                value = loader()
+            self._store(method, key, value)
+        except Exception:
+            logger.warning("Background refresh of %s failed; keeping stale entry", key, exc_info=True)
+        finally:
+            with self._refreshing_lock:
+                self._refreshing.discard(key)
+
+    def _schedule_refresh(self, method: str, key: Hashable, loader: Callable[[], Any]) -> None:
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._refresh_executor.submit(self._refresh, method, key, loader)
+
+    def _refresh_catalog(self) -> None:
+        try:
+            with upstream_priority(BACKGROUND):
+                self._catalog.refresh()
+        except Exception:
+            logger.warning("Catalog refresh failed; searching the previous snapshot", exc_info=True)
+        finally:
+            with self._refreshing_lock:
+                self._refreshing.discard(("catalog",))
+
+    def _catalog_for(self, search: Optional[SearchParams], sort_by: Optional[str] = None) -> Optional[SnapshotDogRepository]:
+        """Returns the catalog if it should answer the query, scheduling its refresh once it is stale."""
+        if self._catalog is None or not (sort_by or (search and (search.query or search.filters))):
+            return None
+        # The first search loads the snapshot itself; later ones never wait for a refresh
+        if self._catalog.version and self._catalog.is_stale():
+            with self._refreshing_lock:
+                if ("catalog",) in self._refreshing:
+                    return self._catalog
+                self._refreshing.add(("catalog",))
+            self._refresh_executor.submit(self._refresh_catalog)
+        return self._catalog
+
+    def _fallback(self, key: Hashable, error: UpstreamError) -> Any:
+        """Returns the expired value of `key` while the upstream is failing, or re-raises `error`."""
+        entry = self._cache.peek(key)
+        if entry is None or self._cache.now() >= entry.stale_until + self._stale_if_error_ttl:
+            raise error
+        with self._counters_lock:
+            self._served_on_error += 1
+        logger.info("Upstream failing (%s); serving expired entry %s", error, key)
+        return entry.value
+
+    def _cached(self, method: str, key_args: Tuple, loader: Callable[[], Any]) -> Any:
+        """Returns the cached value for the call, loading or refreshing it as needed."""
+        key = (method,) + key_args
+        entry = self._cache.get(key)
+        if entry is not None:
+            if not entry.is_fresh(self._cache.now()):
+                self._schedule_refresh(method, key, loader)
+            return entry.value
+
+        try:
+            value = loader()
+        except UpstreamError as e:
+            return self._fallback(key, e)
+        self._store(method, key, value)
+        return value
+
+    def _cached_many(
+        self,
+        method: str,
+        ids: List[str],
+        batch_loader: Callable[[List[str]], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Serves each ID from the cache and loads the missing ones with a single batch call."""
+        results: Dict[str, Any] = {}
+        missing: List[str] = []
+        for item_id in ids:
+            key = (method, str(item_id))
+            entry = self._cache.get(key)
+            if entry is None:
+                missing.append(item_id)
+                continue
+            if not entry.is_fresh(self._cache.now()):
+                self._schedule_refresh(method, key, lambda item_id=item_id: batch_loader([item_id])[item_id])
+            results[item_id] = entry.value
+
+        if missing:
+            try:
+                loaded = batch_loader(missing)
+            except UpstreamError as e:
+                loaded = {item_id: self._fallback((method, str(item_id)), e) for item_id in missing}
+            else:
+                for item_id, value in loaded.items():
+                    self._store(method, (method, str(item_id)), value)
+            results.update(loaded)
+
+        return {item_id: results.get(item_id) for item_id in ids}
+
+    def cache_stats(self) -> CacheStats:
+        """Returns the hit/miss/eviction counters of the cache."""
+        return self._cache.stats()
+
+    def get_content_version(self) -> Optional[str]:
+        """Token of the cached content and catalog snapshot, without loading either."""
+        catalog_version = self._catalog.version if self._catalog is not None else 0
+        return f"cache-{self._epoch}-{self._content_version}.{catalog_version}"
+
+    def served_on_error(self) -> int:
+        """Returns how many expired entries were served because the upstream was failing."""
+        with self._counters_lock:
+            return self._served_on_error
+
+    def get_breeds(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Breed]:
+        """Get all dog breeds with pagination and search."""
+        catalog = self._catalog_for(search, pagination.sort_by)
+        if catalog is not None:
+            return catalog.get_breeds(pagination, search)
+        return self._cached(
+            "get_breeds",
+            (self._pagination_key(pagination), self._search_key(search)),
+            lambda: self._repository.get_breeds(pagination, search)
+        )
+
+    def get_breed_by_id(self, breed_id: str) -> Optional[Breed]:
+        """Get a specific breed by its ID."""
+        return self._cached(
+            "get_breed_by_id",
+            (str(breed_id),),
+            lambda: self._repository.get_breed_by_id(breed_id)
+        )
+
+    def get_facts(self, limit: Optional[int] = None) -> List[Fact]:
+        """Get interesting facts about dogs."""
+        return self._cached("get_facts", (limit,), lambda: self._repository.get_facts(limit))
+
+    def get_groups(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Group]:
+        """Get all breed groups with pagination and search."""
+        catalog = self._catalog_for(search)
+        if catalog is not None:
+            return catalog.get_groups(pagination, search)
+        return self._cached(
+            "get_groups",
+            (self._pagination_key(pagination), self._search_key(search)),
+            lambda: self._repository.get_groups(pagination, search)
+        )
+
+    def get_group_by_id(self, group_id: str) -> Optional[Group]:
+        """Get a specific group by its ID."""
+        return self._cached(
+            "get_group_by_id",
+            (str(group_id),),
+            lambda: self._repository.get_group_by_id(group_id)
+        )
+
+    def get_group_details(self, group_id: str) -> Optional[Group]:
+        """Get complete details of a group."""
+        return self._cached(
+            "get_group_details",
+            (str(group_id),),
+            lambda: self._repository.get_group_details(group_id)
+        )
+
+    def get_breed_in_group(self, group_id: str, breed_id: str) -> Optional[Breed]:
+        """Get a specific breed within a group, reusing the cached group and breed."""
+        group_future = self._fan_out.submit(self.get_group_details, group_id)
+        breed_future = self._fan_out.submit(self.get_breed_by_id, breed_id)
+
+        group = group_future.result()
+        if not group or not group.relationships or not group.relationships.breeds:
+            return None
+
+        breed_ids = [breed.id for breed in group.relationships.breeds.get("data", [])]
+        if str(breed_id) not in breed_ids:
+            return None
+
+        return breed_future.result()
+
+    def get_group_breeds(self, group_id: str, pagination: PaginationParams) -> Optional[PaginatedResponse[Breed]]:
+        """Get the breeds of a group from the cached group and breed entries."""
+        group = self.get_group_details(group_id)
+        if not group:
+            return None
+
+        references = group.relationships.breeds.get("data", []) if group.relationships else []
+        start_idx = (pagination.page - 1) * pagination.page_size
+        page_references = references[start_idx:start_idx + pagination.page_size]
+
+        breeds = self._fan_out.map(lambda reference: self.get_breed_by_id(reference.id), page_references)
+        return PaginatedResponse.create(
+            items=[breed for breed in breeds if breed],
+            total=len(references),
+            params=pagination
+        )
+
+    def get_breeds_by_ids(self, breed_ids: List[str]) -> Dict[str, Optional[Breed]]:
+        """Get several breeds by ID, fetching only the ones that are not cached."""
+        return self._cached_many("get_breed_by_id", breed_ids, self._repository.get_breeds_by_ids)
+
+    def get_groups_by_ids(self, group_ids: List[str]) -> Dict[str, Optional[Group]]:
+        """Get several groups by ID, fetching only the ones that are not cached."""
+        return self._cached_many("get_group_by_id", group_ids, self._repository.get_groups_by_ids)
+
+    def iter_breeds(self, search: Optional[SearchParams] = None) -> Iterator[Breed]:
+        catalog = self._catalog_for(search)
+        if catalog is not None:
+            return catalog.iter_breeds(search)
+        return super().iter_breeds(search)
+
+    def iter_groups(self, search: Optional[SearchParams] = None) -> Iterator[Group]:
+        catalog = self._catalog_for(search)
+        if catalog is not None:
+            return catalog.iter_groups(search)
+        return super().iter_groups(search)
@@ -1,24 +1,53 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Optional, Dict, Any
+from typing import TypeVar, Generic, Optional, Dict, Any, List
+import time
 import aiohttp
 from src.domain.entities.pagination import PaginationParams, SearchParams, PaginatedResponse
+from src.infrastructure.external.dog_api.instrumentation import UPSTREAM_LATENCY, upstream_endpoint, upstream_outcome
+from src.infrastructure.external.dog_api.resilience import ResilientCaller
+from src.shared.exceptions.api_exception import UpstreamError, UpstreamTimeout
+from src.shared.utils.event_loop import EventLoopThread
+from src.shared.utils.rate_limiter import DEFAULT, INTERACTIVE, current_priority
+from src.shared.utils.timing import span
 
 T = TypeVar('T')
 
 class ExternalAPIBase(Generic[T], ABC):
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        pool_size: int = 100,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+        loop_thread: Optional[EventLoopThread] = None,
+        resilience: Optional[ResilientCaller] = None
+    ):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
+        self._pool_size = pool_size
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self._resilience = resilience or ResilientCaller()
+        # Upstream request budget, spent by the resilience layer; paused here when the upstream answers 429
+        self._limiter = self._resilience.limiter
+        self._loop_thread = loop_thread or EventLoopThread(name=f"{type(self).__name__}-io")
         self._session: Optional[aiohttp.ClientSession] = None
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._pool_size, keepalive_timeout=30),
+                timeout=self._timeout
+            )
         return self._session
 
     async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        async def _close():
+            if self._session and not self._session.closed:
+                await self._session.close()
+        await self._loop_thread.run(_close())
 
     def _get_headers(self) -> Dict[str, str]:
         headers = {'Content-Type': 'application/json'}
@@ -47,38 +76,123 @@ class ExternalAPIBase(Generic[T], ABC):
         """
         pass
 
+    def _extract_items(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Returns the raw items of a list response
+        """
+        return data['items']
+
+    def _extract_total(self, data: Dict[str, Any], items: List[T]) -> int:
+        """
+        Returns the total number of records of a list response
+        """
+        return data['total']
+
+    @staticmethod
+    def _retry_after_seconds(response: aiohttp.ClientResponse, default: float = 1.0) -> float:
+        try:
+            return float(response.headers.get("Retry-After", default))
+        except ValueError:
+            return default
+
+    async def _attempt_json(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        time_left: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Performs one GET attempt that must finish within time_left; returns None on 404
+        """
+        session = await self._get_session()
+        timeout = aiohttp.ClientTimeout(
+            total=time_left,
+            sock_connect=min(self._connect_timeout, time_left),
+            sock_read=min(self._read_timeout, time_left)
+        )
+        try:
+            async with session.get(
+                f"{self.base_url}/{endpoint.lstrip('/')}",
+                headers=self._get_headers(),
+                params=params,
+                timeout=timeout
+            ) as response:
+                if response.status == 404:
+                    return None
+                if response.status == 429 and self._limiter is not None:
+                    self._limiter.pause(self._retry_after_seconds(response))
+                if response.status >= 400:
+                    raise UpstreamError(
+                        f"API Error: {response.status} - {response.reason}",
+                        upstream_status=response.status,
+                        retryable=response.status >= 500 or response.status == 429
+                    )
+                try:
+                    return await response.json(content_type=None)
+                except ValueError as e:
+                    raise UpstreamError(f"Error decoding response: {str(e)}", retryable=False)
+        except aiohttp.ClientError as e:
+            raise UpstreamError(f"Connection Error: {str(e)}")
+        except TimeoutError:
+            raise UpstreamTimeout("Upstream timed out")
+
+    async def _fetch_json(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = DEFAULT
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Performs a GET on the session loop under the deadline, retry, breaker and rate policy
+        """
+        started = time.perf_counter()
+        try:
+            data = await self._resilience.call_async(
+                lambda time_left: self._attempt_json(endpoint, params, time_left),
+                priority=priority
+            )
+        except Exception as e:
+            UPSTREAM_LATENCY.labels(upstream_endpoint(endpoint), upstream_outcome(e)).observe(time.perf_counter() - started)
+            raise
+        status = "404" if data is None else "200"
+        UPSTREAM_LATENCY.labels(upstream_endpoint(endpoint), status).observe(time.perf_counter() - started)
+        return data
+
+    async def get_json(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = DEFAULT
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Performs a GET from any event loop, reusing the long-lived session
+        """
+        # Resolved here: the session loop does not see the caller's upstream_priority context
+        priority = current_priority(priority)
+        with span("upstream"):
+            return await self._loop_thread.run(self._fetch_json(endpoint, params, priority))
+
     async def get_all(
         self,
         endpoint: str,
         pagination_params: PaginationParams,
         search_params: Optional[SearchParams] = None
     ) -> PaginatedResponse[T]:
-        session = await self._get_session()
         params = self._build_pagination_params(pagination_params)
-        
+
         if search_params:
             params.update(self._build_search_params(search_params))
 
-        async with session.get(
-            f"{self.base_url}/{endpoint.lstrip('/')}",
-            headers=self._get_headers(),
-            params=params
-        ) as response:
-            response.raise_for_status()
-            data = await response.json()
-            items = [self._parse_response(item) for item in data['items']]
-            total = data['total']
-            
-            return PaginatedResponse.create(items, total, pagination_params)
+        data = await self.get_json(endpoint, params)
+        if data is None:
+            raise UpstreamError(f"API Error: 404 - {endpoint} not found", upstream_status=404, retryable=False)
+        items = [self._parse_response(item) for item in self._extract_items(data)]
+        total = self._extract_total(data, items)
+
+        return PaginatedResponse.create(items, total, pagination_params)
 
     async def get_by_id(self, endpoint: str, id: str) -> Optional[T]:
-        session = await self._get_session()
-        async with session.get(
-            f"{self.base_url}/{endpoint.lstrip('/')}/{id}",
-            headers=self._get_headers()
-        ) as response:
-            if response.status == 404:
-                return None
-            response.raise_for_status()
-            data = await response.json()
-            return self._parse_response(data) 
\ No newline at end of file
+        data = await self.get_json(f"{endpoint.rstrip('/')}/{id}", priority=INTERACTIVE)
+        if data is None:
+            return None
+        return self._parse_response(data)
@@ -0,0 +1,53 @@
+import random
+import threading
+from typing import Iterable, List, Optional
+
+from src.domain.entities.breed import Breed
+from src.domain.entities.fact import Fact
+from src.domain.entities.group import Group
+from src.infrastructure.adapters.snapshot_dog_repository import CatalogSnapshot, SnapshotDogRepository
+
+
+class InMemoryDogRepository(SnapshotDogRepository):
+    """
+    DogRepository serving a fixed catalog held in memory, such as a
+    synthetic one, with the same indexes as SnapshotDogRepository.
+
+    Nothing is fetched or refreshed: the catalog is indexed once when the
+    repository is built. Like the upstream facts endpoint, get_facts returns
+    a random sample of `facts_per_request` facts rather than all of them.
+    """
+
+    def __init__(
+        self,
+        breeds: Iterable[Breed],
+        groups: Iterable[Group],
+        facts: Iterable[Fact] = (),
+        facts_per_request: int = 1,
+        seed: Optional[int] = None
+    ):
+        super().__init__(source=None)
+        self._catalog = (list(breeds), list(groups), list(facts))
+        self._facts_per_request = facts_per_request
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.refresh()
+
+    def _build_snapshot(self, version: int, previous: Optional[CatalogSnapshot]) -> CatalogSnapshot:
+        breeds, groups, facts = self._catalog
+        return self._index_catalog(version, breeds, groups, facts)
+
+    def start_background_refresh(self) -> None:
+        """The catalog is fixed, so there is nothing to refresh."""
+
+    def is_stale(self) -> bool:
+        return False
+
+    def refresh_if_stale(self) -> bool:
+        return False
+
+    def get_facts(self, limit: Optional[int] = None) -> List[Fact]:
+        """Get a random sample of `limit` dog facts, `facts_per_request` by default."""
+        facts = self._current().facts
+        with self._random_lock:
+            return self._random.sample(facts, min(limit or self._facts_per_request, len(facts)))
@@ -0,0 +1,256 @@
+import dataclasses
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+from src.application.ports.output.dog_repository import DogRepository
+from src.domain.entities.breed import Breed
+from src.domain.entities.fact import Fact
+from src.domain.entities.group import Group
+from src.domain.entities.pagination import PaginationParams, SearchParams, PaginatedResponse
+from src.shared.utils.forking import reinit_after_fork
+from src.shared.utils.metrics import REGISTRY
+from src.shared.utils.rate_limiter import BACKGROUND, upstream_priority
+
+logger = logging.getLogger(__name__)
+
+# One counter per PrefetchStats field, summed over every prefetching repository
+PREFETCH_COUNTERS = {
+    name: REGISTRY.counter(f"dogapi_prefetch_{name}_total", documentation).labels()
+    for name, documentation in (
+        ("scheduled", "Prefetches queued"),
+        ("dropped", "Prefetches dropped because too many were pending"),
+        ("completed", "Prefetches that finished loading"),
+        ("failed", "Prefetches whose load raised"),
+        ("loaded", "Pages and entities loaded by completed prefetches"),
+        ("hits", "Prefetched pages and entities that a request then asked for"),
+    )
+}
+
+
+@dataclass
+class PrefetchStats:
+    scheduled: int = 0
+    dropped: int = 0
+    completed: int = 0
+    failed: int = 0
+    # Pages and entities loaded by completed prefetches, and how many of them a request used
+    loaded: int = 0
+    hits: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the prefetched pages and entities that a later request used."""
+        return self.hits / self.loaded if self.loaded else 0.0
+
+
+class PrefetchingDogRepository(DogRepository):
+    """
+    DogRepository decorator that predicts the next request and loads it into
+    the wrapped (caching) repository off the request path.
+
+    After a page of breeds, groups or group breeds it loads the next page;
+    after a group it loads the breeds the group references, up to
+    `max_related`. Prefetches run on `max_workers` threads at BACKGROUND
+    priority, so they only spend upstream budget that requests leave unused,
+    and are dropped once `max_pending` are queued. A prefetch counts as a hit
+    when a request asks for what it loaded; the hit rate tells whether the
+    upstream calls it makes pay off.
+    """
+
+    def __init__(
+        self,
+        repository: DogRepository,
+        max_workers: int = 2,
+        max_pending: int = 32,
+        max_related: int = 20,
+        max_tracked: int = 4096
+    ):
+        self._repository = repository
+        self._max_pending = max_pending
+        self._max_related = max_related
+        self._max_tracked = max_tracked
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._pending: set = set()
+        # Keys loaded by a prefetch that no request has asked for yet, oldest first
+        self._prefetched: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._stats = PrefetchStats()
+        reinit_after_fork(self, "_after_fork")
+
+    def _after_fork(self) -> None:
+        """Gives a forked worker its own prefetch threads; prefetches pending in the parent are not its own."""
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    @staticmethod
+    def _page_key(method: str, pagination: PaginationParams, scope: Any) -> Hashable:
+        """Key of a page request; `scope` is its search or group ID."""
+        return (method, pagination.page, pagination.page_size, pagination.sort_by, pagination.sort_order, repr(scope))
+
+    def _record_request(self, *keys: Hashable) -> None:
+        """Counts a hit for every requested key that a prefetch loaded."""
+        with self._lock:
+            for key in keys:
+                if key in self._prefetched:
+                    del self._prefetched[key]
+                    self._stats.hits += 1
+                    PREFETCH_COUNTERS["hits"].inc()
+
+    def _schedule(self, keys: List[Hashable], loader: Callable[[], Any]) -> None:
+        """Runs `loader` in the background unless its keys are already prefetched or pending."""
+        with self._lock:
+            keys = [key for key in keys if key not in self._prefetched and key not in self._pending]
+            if not keys:
+                return
+            if len(self._pending) + len(keys) > self._max_pending:
+                self._stats.dropped += 1
+                PREFETCH_COUNTERS["dropped"].inc()
+                return
+            self._pending.update(keys)
+            self._stats.scheduled += 1
+            PREFETCH_COUNTERS["scheduled"].inc()
+        self._executor.submit(self._prefetch, keys, loader)
+
+    def _prefetch(self, keys: List[Hashable], loader: Callable[[], Any]) -> None:
+        try:
+            with upstream_priority(BACKGROUND):
+                loader()
+        except Exception:
+            with self._lock:
+                self._stats.failed += 1
+                PREFETCH_COUNTERS["failed"].inc()
+            logger.debug("Prefetch of %s failed", keys, exc_info=True)
+        else:
+            with self._lock:
+                self._stats.completed += 1
+                self._stats.loaded += len(keys)
+                PREFETCH_COUNTERS["completed"].inc()
+                PREFETCH_COUNTERS["loaded"].inc(len(keys))
+                for key in keys:
+                    self._prefetched[key] = None
+                    self._prefetched.move_to_end(key)
+                while len(self._prefetched) > self._max_tracked:
+                    self._prefetched.popitem(last=False)
+        finally:
+            with self._lock:
+                self._pending.difference_update(keys)
+
+    def _prefetch_next_page(
+        self,
+        response: Optional[PaginatedResponse],
+        method: str,
+        pagination: PaginationParams,
+        scope: Any,
+        load: Callable[[PaginationParams], Any]
+    ) -> None:
+        if not response or not response.has_next:
+            return
+        next_page = dataclasses.replace(pagination, page=pagination.page + 1)
+        self._schedule([self._page_key(method, next_page, scope)], lambda: load(next_page))
+
+    def _prefetch_group_breeds(self, group: Optional[Group], with_details: bool = False) -> None:
+        """Prefetches the breeds `group` references and, `with_details`, the group's details."""
+        if not group:
+            return
+        references = group.relationships.breeds.get("data", []) if group.relationships else []
+        breed_ids = [str(breed.id) for breed in references][:self._max_related]
+        keys = [("breed", breed_id) for breed_id in breed_ids]
+        if with_details:
+            keys.append(("group_details", str(group.id)))
+
+        def load() -> None:
+            if with_details:
+                self._repository.get_group_details(group.id)
+            if breed_ids:
+                self._repository.get_breeds_by_ids(breed_ids)
+
+        if keys:
+            self._schedule(keys, load)
+
+    def prefetch_stats(self) -> PrefetchStats:
+        """Returns the prefetch counters, hits included."""
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def get_breeds(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Breed]:
+        """Get all dog breeds with pagination and search, prefetching the next page."""
+        self._record_request(self._page_key("get_breeds", pagination, search))
+        response = self._repository.get_breeds(pagination, search)
+        self._prefetch_next_page(
+            response, "get_breeds", pagination, search,
+            lambda page: self._repository.get_breeds(page, search)
+        )
+        return response
+
+    def get_breed_by_id(self, breed_id: str) -> Optional[Breed]:
+        """Get a specific breed by its ID."""
+        self._record_request(("breed", str(breed_id)))
+        return self._repository.get_breed_by_id(breed_id)
+
+    def get_facts(self, limit: Optional[int] = None) -> List[Fact]:
+        """Get interesting facts about dogs."""
+        return self._repository.get_facts(limit)
+
+    def get_groups(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Group]:
+        """Get all breed groups with pagination and search, prefetching the next page."""
+        self._record_request(self._page_key("get_groups", pagination, search))
+        response = self._repository.get_groups(pagination, search)
+        self._prefetch_next_page(
+            response, "get_groups", pagination, search,
+            lambda page: self._repository.get_groups(page, search)
+        )
+        return response
+
+    def get_group_by_id(self, group_id: str) -> Optional[Group]:
+        """Get a specific group by its ID, prefetching the breeds it references."""
+        group = self._repository.get_group_by_id(group_id)
+        # Group pages link to the group's breeds, which are served from its details
+        self._prefetch_group_breeds(group, with_details=True)
+        return group
+
+    def get_group_details(self, group_id: str) -> Optional[Group]:
+        """Get complete details of a group, prefetching the breeds it references."""
+        self._record_request(("group_details", str(group_id)))
+        group = self._repository.get_group_details(group_id)
+        self._prefetch_group_breeds(group)
+        return group
+
+    def get_breed_in_group(self, group_id: str, breed_id: str) -> Optional[Breed]:
+        """Get a specific breed within a group."""
+        self._record_request(("group_details", str(group_id)), ("breed", str(breed_id)))
+        return self._repository.get_breed_in_group(group_id, breed_id)
+
+    def get_group_breeds(self, group_id: str, pagination: PaginationParams) -> Optional[PaginatedResponse[Breed]]:
+        """Get the breeds of a group, prefetching the next page."""
+        self._record_request(self._page_key("get_group_breeds", pagination, group_id), ("group_details", str(group_id)))
+        response = self._repository.get_group_breeds(group_id, pagination)
+        self._prefetch_next_page(
+            response, "get_group_breeds", pagination, group_id,
+            lambda page: self._repository.get_group_breeds(group_id, page)
+        )
+        return response
+
+    def get_breeds_by_ids(self, breed_ids: List[str]) -> Dict[str, Optional[Breed]]:
+        """Get several breeds by ID."""
+        self._record_request(*(("breed", str(breed_id)) for breed_id in breed_ids))
+        return self._repository.get_breeds_by_ids(breed_ids)
+
+    def get_groups_by_ids(self, group_ids: List[str]) -> Dict[str, Optional[Group]]:
+        """Get several groups by ID."""
+        return self._repository.get_groups_by_ids(group_ids)
+
+    def get_content_version(self) -> Optional[str]:
+        return self._repository.get_content_version()
+
+    def iter_breeds(self, search: Optional[SearchParams] = None) -> Iterator[Breed]:
+        # A crawl reads every page anyway; prefetching ahead of it would only duplicate calls
+        return self._repository.iter_breeds(search)
+
+    def iter_groups(self, search: Optional[SearchParams] = None) -> Iterator[Group]:
+        return self._repository.iter_groups(search)
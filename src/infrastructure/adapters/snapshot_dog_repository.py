@@ -0,0 +1,344 @@
+import bisect
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterator, List, Optional
+
+import numpy as np
+
+from src.application.ports.output.dog_repository import DogRepository
+from src.domain.entities.breed import Breed
+from src.domain.entities.fact import Fact
+from src.domain.entities.group import Group
+from src.domain.entities.pagination import CursorPage, CursorParams, PaginationParams, SearchParams, PaginatedResponse
+from src.infrastructure.search.breed_columns import BreedColumns, parse_breed_filters
+from src.infrastructure.search.catalog_index import CatalogSearchIndex
+from src.shared.exceptions.api_exception import APIException
+from src.shared.utils.rate_limiter import BACKGROUND, upstream_priority
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CatalogSnapshot:
+    """Immutable, fully-indexed copy of the upstream catalog."""
+    version: int
+    loaded_at: float
+    breeds: Dict[str, Breed] = field(default_factory=dict)
+    breed_list: List[Breed] = field(default_factory=list)
+    groups: Dict[str, Group] = field(default_factory=dict)
+    group_list: List[Group] = field(default_factory=list)
+    group_breed_ids: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    facts: List[Fact] = field(default_factory=list)
+    breed_positions: Dict[str, int] = field(default_factory=dict)
+    breed_columns: Optional[BreedColumns] = None
+    # Keyset order for cursor pagination; stable across refreshes because it only depends on IDs
+    breed_ids_sorted: List[str] = field(default_factory=list)
+    group_ids_sorted: List[str] = field(default_factory=list)
+
+
+class SnapshotDogRepository(DogRepository):
+    """
+    DogRepository that serves every read from an in-memory snapshot of the catalog.
+
+    The snapshot is crawled from the source repository on first use and can be
+    refreshed in the background; a new snapshot replaces the old one atomically,
+    and a failed refresh keeps serving the previous one. The facts endpoint
+    only returns random samples, so facts are drawn in batches of `page_size`
+    until a batch brings no new one, or `max_fact_batches` were drawn.
+    """
+
+    def __init__(
+        self,
+        source: DogRepository,
+        refresh_interval: float = 3600.0,
+        page_size: int = 100,
+        max_fact_batches: int = 10
+    ):
+        self._source = source
+        self._refresh_interval = refresh_interval
+        self._page_size = page_size
+        self._max_fact_batches = max_fact_batches
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._search_index = CatalogSearchIndex()
+
+    @property
+    def version(self) -> int:
+        """Version of the snapshot being served, 0 before the first load."""
+        snapshot = self._snapshot
+        return snapshot.version if snapshot else 0
+
+    def get_content_version(self) -> Optional[str]:
+        """Version of the served snapshot, loading the first one if needed."""
+        try:
+            return f"snapshot-{self._current().version}"
+        except APIException:
+            return None
+
+    def _crawl(self, fetch_page) -> List:
+        """Reads every page of a paginated source method."""
+        items = []
+        page = 1
+        while True:
+            response = fetch_page(PaginationParams(page=page, page_size=self._page_size))
+            items.extend(response.items)
+            if not response.items or not response.has_next:
+                return items
+            page += 1
+
+    def _crawl_facts(self, known: List[Fact]) -> List[Fact]:
+        """Adds random samples of facts to `known` until a sample brings nothing new."""
+        facts = {fact.id: fact for fact in known}
+        for _ in range(self._max_fact_batches):
+            before = len(facts)
+            for fact in self._source.get_facts(limit=self._page_size):
+                facts[fact.id] = fact
+            if len(facts) == before:
+                break
+        return list(facts.values())
+
+    def _build_snapshot(self, version: int, previous: Optional[CatalogSnapshot]) -> CatalogSnapshot:
+        breeds = self._crawl(self._source.get_breeds)
+        groups = self._crawl(self._source.get_groups)
+        # Accumulated across refreshes, since each crawl only sees samples
+        facts = self._crawl_facts(previous.facts if previous else [])
+        return self._index_catalog(version, breeds, groups, facts)
+
+    @staticmethod
+    def _index_catalog(version: int, breeds: List[Breed], groups: List[Group], facts: List[Fact]) -> CatalogSnapshot:
+        """Builds the lookup tables, columns and keyset orders of a snapshot over the given entities."""
+        return CatalogSnapshot(
+            version=version,
+            loaded_at=time.time(),
+            breeds={breed.id: breed for breed in breeds},
+            breed_list=breeds,
+            groups={group.id: group for group in groups},
+            group_list=groups,
+            group_breed_ids={
+                group.id: frozenset(ref.id for ref in group.relationships.breeds.get("data", []))
+                for group in groups
+            },
+            facts=facts,
+            breed_positions={breed.id: position for position, breed in enumerate(breeds)},
+            breed_columns=BreedColumns(breeds, {
+                reference.id: group.id
+                for group in groups
+                for reference in group.relationships.breeds.get("data", [])
+            }),
+            breed_ids_sorted=sorted(breed.id for breed in breeds),
+            group_ids_sorted=sorted(group.id for group in groups)
+        )
+
+    def refresh(self) -> CatalogSnapshot:
+        """Crawls the source and swaps in the new snapshot."""
+        with self._load_lock:
+            return self._load()
+
+    def _load(self) -> CatalogSnapshot:
+        """Builds the next snapshot version and publishes it; the caller holds the load lock."""
+        previous = self._snapshot
+        snapshot = self._build_snapshot((previous.version if previous else 0) + 1, previous)
+        # Search results are resolved against the published snapshot, so indexing first is safe
+        self._search_index.sync(snapshot.breed_list, snapshot.group_list)
+        self._snapshot = snapshot
+        logger.info(
+            "Catalog snapshot v%d loaded: %d breeds, %d groups, %d facts",
+            snapshot.version, len(snapshot.breeds), len(snapshot.groups), len(snapshot.facts)
+        )
+        return snapshot
+
+    def _current(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._load_lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            try:
+                return self._load()
+            except APIException:
+                raise
+            except Exception as e:
+                raise APIException(f"Catalog snapshot unavailable: {str(e)}", status_code=503)
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self._refresh_interval):
+            try:
+                with upstream_priority(BACKGROUND):
+                    self.refresh()
+            except Exception:
+                logger.warning("Catalog snapshot refresh failed; serving v%d", self.version, exc_info=True)
+
+    def is_stale(self) -> bool:
+        """Whether no snapshot is loaded yet or the served one is older than the refresh interval."""
+        snapshot = self._snapshot
+        return snapshot is None or time.time() - snapshot.loaded_at >= self._refresh_interval
+
+    def refresh_if_stale(self) -> bool:
+        """
+        Refreshes unless the served snapshot is younger than the refresh
+        interval, for callers that schedule refreshes themselves (e.g. a
+        pre-fork server); returns whether a new snapshot was published.
+        """
+        if not self.is_stale():
+            return False
+        self.refresh()
+        return True
+
+    def start_background_refresh(self) -> None:
+        """Starts the periodic refresh thread."""
+        if self._refresh_thread is not None:
+            return
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, name="catalog-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self) -> None:
+        self._stop.set()
+
+    def _paginate(self, items: List, pagination: PaginationParams) -> PaginatedResponse:
+        start_idx = (pagination.page - 1) * pagination.page_size
+        return PaginatedResponse.create(
+            items=items[start_idx:start_idx + pagination.page_size],
+            total=len(items),
+            params=pagination
+        )
+
+    @staticmethod
+    def _keyset_page(sorted_ids: List[str], lookup: Dict, cursor: CursorParams) -> CursorPage:
+        """Cuts the page after cursor.after from a sorted ID list with a binary search."""
+        start_idx = bisect.bisect_right(sorted_ids, cursor.after) if cursor.after is not None else 0
+        page_ids = sorted_ids[start_idx:start_idx + cursor.page_size]
+        has_more = start_idx + cursor.page_size < len(sorted_ids)
+        return CursorPage.create([lookup[item_id] for item_id in page_ids], cursor, has_more)
+
+    def _matching_breed_positions(
+        self,
+        snapshot: CatalogSnapshot,
+        search: Optional[SearchParams],
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None
+    ) -> Optional[np.ndarray]:
+        """Positions of the breeds matching the search and filters in result order, or None for the whole catalog."""
+        filters = parse_breed_filters(search.filters if search else None)
+        query = search.query if search else None
+        if not filters and not query and not sort_by:
+            return None
+
+        candidates = None
+        if query:
+            candidates = np.array([
+                snapshot.breed_positions[breed_id]
+                for breed_id in self._search_index.search_breeds(query)
+                if breed_id in snapshot.breed_positions
+            ], dtype=np.int64)
+
+        return snapshot.breed_columns.query(filters, sort_by, sort_order, candidates)
+
+    def get_breeds(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Breed]:
+        """Get all dog breeds with pagination and search."""
+        snapshot = self._current()
+        positions = self._matching_breed_positions(snapshot, search, pagination.sort_by, pagination.sort_order)
+        if positions is None:
+            return self._paginate(snapshot.breed_list, pagination)
+
+        start_idx = (pagination.page - 1) * pagination.page_size
+        return PaginatedResponse.create(
+            items=[snapshot.breed_list[position] for position in positions[start_idx:start_idx + pagination.page_size]],
+            total=len(positions),
+            params=pagination
+        )
+
+    def get_breed_by_id(self, breed_id: str) -> Optional[Breed]:
+        """Get a specific breed by its ID."""
+        return self._current().breeds.get(str(breed_id))
+
+    def get_facts(self, limit: Optional[int] = None) -> List[Fact]:
+        """Get interesting facts about dogs: all the collected ones, or a random `limit` of them."""
+        facts = self._current().facts
+        if limit:
+            return random.sample(facts, min(limit, len(facts)))
+        return list(facts)
+
+    def get_groups(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Group]:
+        """Get all breed groups with pagination and search."""
+        snapshot = self._current()
+        groups = snapshot.group_list
+        if search and search.query:
+            groups = [
+                snapshot.groups[group_id]
+                for group_id in self._search_index.search_groups(search.query)
+                if group_id in snapshot.groups
+            ]
+        return self._paginate(groups, pagination)
+
+    def get_group_by_id(self, group_id: str) -> Optional[Group]:
+        """Get a specific group by its ID."""
+        return self._current().groups.get(str(group_id))
+
+    def get_group_details(self, group_id: str) -> Optional[Group]:
+        """Get complete details of a group."""
+        return self.get_group_by_id(group_id)
+
+    def get_breed_in_group(self, group_id: str, breed_id: str) -> Optional[Breed]:
+        """Get a specific breed within a group."""
+        snapshot = self._current()
+        if str(breed_id) not in snapshot.group_breed_ids.get(str(group_id), frozenset()):
+            return None
+        return snapshot.breeds.get(str(breed_id))
+
+    def get_breeds_by_ids(self, breed_ids: List[str]) -> Dict[str, Optional[Breed]]:
+        """Get several breeds by ID."""
+        breeds = self._current().breeds
+        return {breed_id: breeds.get(str(breed_id)) for breed_id in breed_ids}
+
+    def get_groups_by_ids(self, group_ids: List[str]) -> Dict[str, Optional[Group]]:
+        """Get several groups by ID."""
+        groups = self._current().groups
+        return {group_id: groups.get(str(group_id)) for group_id in group_ids}
+
+    def get_group_breeds(self, group_id: str, pagination: PaginationParams) -> Optional[PaginatedResponse[Breed]]:
+        """Get the breeds of a group."""
+        snapshot = self._current()
+        group = snapshot.groups.get(str(group_id))
+        if not group:
+            return None
+
+        breeds = [
+            snapshot.breeds[reference.id]
+            for reference in group.relationships.breeds.get("data", [])
+            if reference.id in snapshot.breeds
+        ]
+        return self._paginate(breeds, pagination)
+
+    def iter_breeds(self, search: Optional[SearchParams] = None) -> Iterator[Breed]:
+        """Iterate over every breed of the snapshot current when iteration starts."""
+        snapshot = self._current()
+        positions = self._matching_breed_positions(snapshot, search)
+        if positions is None:
+            return iter(snapshot.breed_list)
+        return (snapshot.breed_list[position] for position in positions)
+
+    def get_breeds_after(self, cursor: CursorParams, search: Optional[SearchParams] = None) -> CursorPage[Breed]:
+        """Get the breeds whose ID follows cursor.after, in ID order."""
+        snapshot = self._current()
+        positions = self._matching_breed_positions(snapshot, search)
+        if positions is None:
+            return self._keyset_page(snapshot.breed_ids_sorted, snapshot.breeds, cursor)
+        matching_ids = sorted(snapshot.breed_list[position].id for position in positions)
+        return self._keyset_page(matching_ids, snapshot.breeds, cursor)
+
+    def get_groups_after(self, cursor: CursorParams, search: Optional[SearchParams] = None) -> CursorPage[Group]:
+        """Get the groups whose ID follows cursor.after, in ID order."""
+        snapshot = self._current()
+        group_ids = snapshot.group_ids_sorted
+        if search and search.query:
+            group_ids = sorted(
+                group_id for group_id in self._search_index.search_groups(search.query)
+                if group_id in snapshot.groups
+            )
+        return self._keyset_page(group_ids, snapshot.groups, cursor)
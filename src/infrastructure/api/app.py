@@ -1,20 +1,165 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+from typing import Any, Dict, Optional, Tuple
+
 from flask import Flask
 from flask_cors import CORS
 
+from src.application.ports.output.dog_repository import DogRepository
 from src.application.services.dog_service import DogService
+from src.application.services.fact_pool import FactPool
+from src.infrastructure.adapters.caching_dog_repository import CachingDogRepository
+from src.infrastructure.adapters.prefetching_dog_repository import PrefetchingDogRepository
+from src.infrastructure.adapters.snapshot_dog_repository import SnapshotDogRepository
+from src.infrastructure.api.compression import ResponseCompressor
 from src.infrastructure.api.controllers.dog_controller import DogController
+from src.infrastructure.api.metrics import RequestMetrics
+from src.infrastructure.api.profiling import RequestProfiler
+from src.infrastructure.api.server_timing import ServerTiming
 from src.infrastructure.api.routes.dog_routes import register_routes
 from src.infrastructure.external.dog_api.client import DogAPIClient
+from src.infrastructure.storage.response_store import PersistentResponseCache
+
+def _resilience_options() -> Dict[str, Any]:
+    """
+    Upstream call options: DOG_API_CALL_TIMEOUT is the deadline of a call,
+    retries included; DOG_API_HEDGE_PERCENTILE (e.g. 0.95) enables hedging.
+    """
+    hedge_percentile = os.environ.get("DOG_API_HEDGE_PERCENTILE", "").strip()
+    return {
+        "call_timeout": float(os.environ.get("DOG_API_CALL_TIMEOUT", 10)),
+        "hedge_percentile": float(hedge_percentile) if hedge_percentile else None,
+    }
+
+def _rate_limit_options(rate_share: float = 1.0) -> Dict[str, Any]:
+    """
+    Upstream request budget: DOG_API_RATE_LIMIT requests per second, with
+    bursts of DOG_API_RATE_BURST, of which this process gets `rate_share`.
+    """
+    rate_limit = float(os.environ.get("DOG_API_RATE_LIMIT", 20))
+    rate_burst = os.environ.get("DOG_API_RATE_BURST", "").strip()
+    return {
+        "rate_limit": rate_limit * rate_share,
+        # A share of the burst below one token would never grant a request
+        "rate_burst": max(1.0, (float(rate_burst) if rate_burst else rate_limit) * rate_share),
+    }
+
+def _response_cache(default_path: Optional[str] = None) -> Optional[PersistentResponseCache]:
+    """
+    Persistent response cache at DOG_API_RESPONSE_CACHE (a SQLite file path,
+    else `default_path`), capped at DOG_API_RESPONSE_CACHE_MAX_MB;
+    DOG_API_RESPONSE_CACHE_READ_ONLY=1 makes this worker only read what the
+    others stored.
+    """
+    path = os.environ.get("DOG_API_RESPONSE_CACHE", "").strip() or default_path
+    if not path:
+        return None
+    return PersistentResponseCache(
+        path,
+        max_bytes=int(float(os.environ.get("DOG_API_RESPONSE_CACHE_MAX_MB", 64)) * 1024 * 1024),
+        read_only=os.environ.get("DOG_API_RESPONSE_CACHE_READ_ONLY", "").strip().lower() in ("1", "true", "yes")
+    )
+
+def _fact_pool(client: DogAPIClient) -> Optional[FactPool]:
+    """
+    Pool of up to DOG_API_FACT_POOL_SIZE facts (default 500, 0 disables it)
+    that /facts samples from, refilled from the client once a fifth is left.
+    """
+    size = int(os.environ.get("DOG_API_FACT_POOL_SIZE", 500))
+    if size <= 0:
+        return None
+    return FactPool(client, capacity=size, low_water=max(1, size // 5), batch_size=min(size, 50))
+
+def _build_repository(
+    rate_share: float = 1.0,
+    background_refresh: bool = True,
+    default_response_cache: Optional[str] = None
+) -> Tuple[DogRepository, Optional[FactPool]]:
+    """
+    Builds the repository selected by DOG_API_REPOSITORY:
+    'cached' (default), 'snapshot' or 'direct', with a fact pool unless the
+    repository already holds the facts (snapshot). This process gets
+    `rate_share` of the upstream request budget. The cached repository
+    answers searches from a catalog snapshot that is refreshed as often as
+    its cached pages expire ('direct' passes them to the upstream), and
+    prefetches likely next requests on DOG_API_PREFETCH_WORKERS threads
+    (default 2, 0 disables it). Without `background_refresh` the caller
+    refreshes the snapshot itself.
+    """
+    mode = os.environ.get("DOG_API_REPOSITORY", "cached").lower()
+    client = DogAPIClient(
+        response_cache=_response_cache(default_response_cache),
+        **_rate_limit_options(rate_share),
+        **_resilience_options()
+    )
+    if mode == "direct":
+        return client, _fact_pool(client)
+    if mode == "snapshot":
+        repository = SnapshotDogRepository(
+            client,
+            refresh_interval=float(os.environ.get("DOG_API_SNAPSHOT_REFRESH", 3600))
+        )
+        if background_refresh:
+            repository.start_background_refresh()
+        return repository, None
+    repository = CachingDogRepository(
+        client,
+        # Only searched; facts come from the fact pool
+        catalog=SnapshotDogRepository(
+            client,
+            refresh_interval=CachingDogRepository.DEFAULT_TTLS["get_breeds"],
+            max_fact_batches=0
+        )
+    )
+    prefetch_workers = int(os.environ.get("DOG_API_PREFETCH_WORKERS", 2))
+    if prefetch_workers > 0:
+        repository = PrefetchingDogRepository(repository, max_workers=prefetch_workers)
+    # The pool refills from the client itself: the cache would hand it the same facts again
+    return repository, _fact_pool(client)
+
+def _register_async_stack(app: Flask) -> None:
+    """Wires the aiohttp-based client, service, controller and async views."""
+    # Imported here so the default sync stack does not require aiohttp/asgiref
+    from src.application.services.async_dog_service import AsyncDogService
+    from src.infrastructure.api.controllers.async_dog_controller import AsyncDogController
+    from src.infrastructure.api.routes.async_dog_routes import register_async_routes
+    from src.infrastructure.external.dog_api.async_client import AsyncDogAPIClient
+
+    dog_service = AsyncDogService(AsyncDogAPIClient(**_rate_limit_options(), **_resilience_options()))
+    register_async_routes(app, AsyncDogController(dog_service))
+
+def _enable_profiling(app: Flask) -> None:
+    """
+    Lets the client addresses in DOG_API_PROFILE_ALLOWLIST (comma-separated)
+    profile a request by sending the X-Profile header.
+    """
+    allowlist = [address.strip() for address in os.environ.get("DOG_API_PROFILE_ALLOWLIST", "").split(",") if address.strip()]
+    if allowlist:
+        app.wsgi_app = RequestProfiler(app.wsgi_app, allowlist)
 
-def create_app() -> Flask:
-    """Creates and configures the Flask application."""
+def create_app(dog_repository: Optional[DogRepository] = None, fact_pool: Optional[FactPool] = None) -> Flask:
+    """
+    Creates and configures the Flask application. `dog_repository` (and its
+    `fact_pool`) replaces the one selected by DOG_API_REPOSITORY, e.g. to
+    serve a synthetic catalog.
+    """
     app = Flask(__name__)
+    _enable_profiling(app)
     CORS(app, resources={r"/*": {"origins": ["http://localhost:3000"]}})
-    dog_repository = DogAPIClient()
-    dog_service = DogService(dog_repository)
+    RequestMetrics().init_app(app)
+    ServerTiming().init_app(app)
+    ResponseCompressor(
+        min_size=int(os.environ.get("DOG_API_COMPRESSION_MIN_SIZE", 1024)),
+        level=int(os.environ.get("DOG_API_COMPRESSION_LEVEL", 6))
+    ).init_app(app)
+    # An injected repository is synchronous, so it is always served by the sync stack
+    if dog_repository is None and os.environ.get("DOG_API_MODE", "sync").lower() == "async":
+        _register_async_stack(app)
+        return app
+    if dog_repository is None:
+        dog_repository, fact_pool = _build_repository()
+    dog_service = DogService(dog_repository, fact_pool)
     dog_controller = DogController(dog_service)
     register_routes(app, dog_controller)
     return app
@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+from flask import Flask, Response, request
+
+from src.infrastructure.api.conditional import ENCODING_ETAG_SUFFIXES
+from src.shared.utils.ttl_cache import TTLCache
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+_COMPRESSORS: Dict[str, Callable[[bytes, int], bytes]] = {
+    # mtime=0 keeps the gzip output deterministic for identical bodies
+    "gzip": lambda data, level: gzip.compress(data, compresslevel=level, mtime=0),
+    "deflate": lambda data, level: zlib.compress(data, level),
+}
+
+
+@dataclass(frozen=True)
+class CompressionStats:
+    compressed: int
+    cache_hits: int
+    skipped_small: int
+    bytes_in: int
+    bytes_out: int
+
+
+class ResponseCompressor:
+    """
+    gzip/deflate content negotiation for a Flask app.
+
+    Bodies smaller than `min_size` are sent as-is, since compressing them
+    costs more CPU than it saves on the wire. Responses carrying an ETag are
+    cacheable, so their compressed variants are kept in an LRU keyed by a
+    digest of the body and the encoding, and hot pages are compressed only
+    once. The key is never the ETag itself: a version-derived ETag can
+    outlive the exact bytes it was first sent with.
+    """
+
+    def __init__(self, min_size: int = 1024, level: int = 6, max_entries: int = 256, ttl: float = 3600.0):
+        self._min_size = min_size
+        self._level = level
+        self._ttl = ttl
+        self._cache: TTLCache[bytes] = TTLCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self._compressed = 0
+        self._cache_hits = 0
+        self._skipped_small = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def init_app(self, app: Flask) -> None:
+        app.after_request(self.compress_response)
+
+    @staticmethod
+    def _is_compressible(response: Response) -> bool:
+        return (
+            response.status_code == 200
+            and not response.direct_passthrough
+            and not response.is_streamed
+            and "Content-Encoding" not in response.headers
+            and (response.mimetype or "").startswith(COMPRESSIBLE_TYPES)
+        )
+
+    def _compressed_body(self, encoding: str, body: bytes, cacheable: bool) -> Tuple[bytes, bool]:
+        """Returns the encoded body and whether it came from the cache."""
+        key = (hashlib.sha1(body).digest(), encoding) if cacheable else None
+        if key is not None:
+            entry = self._cache.get(key)
+            if entry is not None:
+                return entry.value, True
+
+        compressed = _COMPRESSORS[encoding](body, self._level)
+        if key is not None:
+            self._cache.set(key, compressed, self._ttl)
+        return compressed, False
+
+    def compress_response(self, response: Response) -> Response:
+        """after_request hook that encodes the body with the best encoding the client accepts."""
+        if response.status_code == 304:
+            # The ETag of a 304 names an encoded variant, so caches must key it by encoding too
+            response.vary.add("Accept-Encoding")
+            return response
+        if not self._is_compressible(response):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = request.accept_encodings.best_match(tuple(_COMPRESSORS))
+        if encoding is None:
+            return response
+
+        body = response.get_data()
+        if len(body) < self._min_size:
+            with self._lock:
+                self._skipped_small += 1
+            return response
+
+        etag, weak = response.get_etag()
+        # Bodies without a validator (e.g. random /facts samples) would only churn the cache
+        compressed, cached = self._compressed_body(encoding, body, cacheable=bool(etag))
+        with self._lock:
+            self._compressed += 1
+            self._cache_hits += int(cached)
+            self._bytes_in += len(body)
+            self._bytes_out += len(compressed)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        if etag:
+            response.set_etag(etag + ENCODING_ETAG_SUFFIXES[encoding], weak)
+        return response
+
+    def stats(self) -> CompressionStats:
+        with self._lock:
+            return CompressionStats(
+                compressed=self._compressed,
+                cache_hits=self._cache_hits,
+                skipped_small=self._skipped_small,
+                bytes_in=self._bytes_in,
+                bytes_out=self._bytes_out
+            )
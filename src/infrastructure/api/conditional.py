@@ -0,0 +1,94 @@
+import hashlib
+import inspect
+from functools import wraps
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from flask import Response, make_response, request
+
+VersionProvider = Callable[[], Union[Optional[str], Awaitable[Optional[str]]]]
+
+# Suffix appended to the ETag of a content-encoded variant, so every representation keeps a distinct strong tag
+ENCODING_ETAG_SUFFIXES = {"gzip": "-gzip", "deflate": "-deflate"}
+
+
+def _etag_for(version: str) -> str:
+    """Derives a strong ETag from the content version and the normalized request."""
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.args.items(multi=True)))
+    digest = hashlib.sha1(f"{version}|{request.path}|{query}".encode("utf-8")).hexdigest()
+    return digest[:32]
+
+
+def _matching_tag(etag: str) -> Optional[str]:
+    """Returns the tag from If-None-Match that matches any encoding variant of `etag`, if any."""
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return None
+    for candidate in (etag, *(etag + suffix for suffix in ENCODING_ETAG_SUFFIXES.values())):
+        if if_none_match.contains_weak(candidate):
+            return candidate
+    return None
+
+
+def _not_modified(etag: str, cache_control: str) -> Response:
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def _finalize(rv: Any, etag: Optional[str], cache_control: str, hash_body: bool) -> Response:
+    """Adds validators to a 200 response; falls back to hashing the body when the version is unknown."""
+    response = make_response(rv)
+    if response.status_code != 200:
+        return response
+
+    if etag is None and not hash_body:
+        response.headers["Cache-Control"] = cache_control
+        return response
+    if etag is None:
+        etag = hashlib.sha1(response.get_data()).hexdigest()
+    matched = _matching_tag(etag)
+    if matched is not None:
+        return _not_modified(matched, cache_control)
+
+    response.headers["Cache-Control"] = cache_control
+    response.set_etag(etag)
+    return response
+
+
+def conditional(version_provider: VersionProvider, cache_control: str, hash_body: bool = True) -> Callable:
+    """
+    Decorator that answers If-None-Match before running the view.
+
+    When `version_provider` returns a content version, the ETag is derived
+    from it and the request path/query, and a matching If-None-Match gets a
+    304 without calling the view. Otherwise the ETag is a hash of the body.
+    Views whose body differs on every call pass `hash_body=False` and get
+    no validator at all: a version ETag would name bodies a client never
+    received, so only `cache_control` is set.
+    """
+    def decorator(view: Callable) -> Callable:
+        if inspect.iscoroutinefunction(view):
+            @wraps(view)
+            async def decorated_coroutine(*args: Any, **kwargs: Any) -> Response:
+                version = await version_provider() if hash_body else None
+                etag = _etag_for(version) if version is not None else None
+                matched = _matching_tag(etag) if etag is not None else None
+                if matched is not None:
+                    return _not_modified(matched, cache_control)
+                return _finalize(await view(*args, **kwargs), etag, cache_control, hash_body)
+
+            return decorated_coroutine
+
+        @wraps(view)
+        def decorated_function(*args: Any, **kwargs: Any) -> Response:
+            version = version_provider() if hash_body else None
+            etag = _etag_for(version) if version is not None else None
+            matched = _matching_tag(etag) if etag is not None else None
+            if matched is not None:
+                return _not_modified(matched, cache_control)
+            return _finalize(view(*args, **kwargs), etag, cache_control, hash_body)
+
+        return decorated_function
+
+    return decorator
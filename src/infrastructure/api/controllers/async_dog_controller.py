@@ -0,0 +1,221 @@
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from asgiref.sync import async_to_sync
+
+from src.application.services.async_dog_service import AsyncDogService
+from src.application.ports.output.dog_repository import CRAWL_PAGE_SIZE
+from src.domain.entities.breed import Breed
+from src.domain.entities.pagination import PaginatedResponse, PaginationParams, SearchParams
+from src.infrastructure.api.controllers.dog_controller import NDJSON_MIMETYPE, DogController
+from src.infrastructure.api.serializers import RawJSON, serializer
+from src.shared.exceptions.api_exception import APIException
+from src.shared.api_response import ApiResponse, StreamedBody
+from src.shared.utils.timing import timed
+
+
+class AsyncDogController(DogController):
+    """Async counterpart of DogController; shares its response helpers."""
+
+    def __init__(self, dog_service: AsyncDogService):
+        self._dog_service = dog_service
+
+    def _clamp_pagination(self, pagination: PaginationParams) -> None:
+        if pagination.page < 1:
+            pagination.page = 1
+        if pagination.page_size < 1:
+            pagination.page_size = 10
+        if pagination.page_size > 100:
+            pagination.page_size = 100
+
+    def _iter_pages(self, page: PaginatedResponse[Breed]) -> Iterator[Breed]:
+        """
+        Yields breeds page by page from the response iterator, which runs after
+        the view returned, so later pages are awaited through async_to_sync
+        """
+        get_page = async_to_sync(self._dog_service.get_all_breeds)
+        while True:
+            yield from page.items
+            if not page.items or not page.has_next:
+                return
+            page = get_page(PaginationParams(page=page.page + 1, page_size=page.page_size))
+
+    @timed("controller")
+    async def get_breeds(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> Tuple[Dict[str, Any], int]:
+        """Gets all dog breeds with pagination and search."""
+        try:
+            self._clamp_pagination(pagination)
+            self._validate_breed_query(search, pagination.sort_by)
+            breeds = await self._dog_service.get_all_breeds(pagination, search)
+            return self._handle_paginated_response(breeds, "breeds")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    async def get_breed(self, breed_id: str) -> Tuple[Dict[str, Any], int]:
+        """Gets a specific breed."""
+        try:
+            breed = await self._dog_service.get_breed_by_id(breed_id)
+            if not breed:
+                return ApiResponse.not_found("Breed not found")
+
+            return self._entity_response(breed, "Breed retrieved successfully")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    async def get_facts(self, limit: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+        """Gets interesting facts about dogs, `limit` of them if given."""
+        try:
+            facts = await self._dog_service.get_all_facts(limit)
+            if not facts:
+                return ApiResponse.not_found("No facts found")
+
+            return self._success("Facts retrieved successfully", data=RawJSON(serializer.encode_entities(facts)))
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    async def get_groups(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> Tuple[Dict[str, Any], int]:
+        """Gets all groups with pagination and search."""
+        try:
+            self._clamp_pagination(pagination)
+            groups = await self._dog_service.get_all_groups(pagination, search)
+            return self._handle_paginated_response(groups, "groups")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    async def get_group(self, group_id: str) -> Tuple[Dict[str, Any], int]:
+        """Gets a specific group."""
+        try:
+            group = await self._dog_service.get_group_by_id(group_id)
+            if not group:
+                return ApiResponse.not_found("Group not found")
+
+            return self._entity_response(group, "Group retrieved successfully")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    async def get_group_details(self, group_id: str) -> Tuple[Dict[str, Any], int]:
+        """Gets group relationships."""
+        try:
+            group = await self._dog_service.get_group_details(group_id)
+            if not group:
+                return ApiResponse.not_found("Group not found")
+
+            relationships = RawJSON(serializer.encode_entity(group.relationships)) if group.relationships else {}
+            return self._success("Group relationships retrieved successfully", data={"relationships": relationships})
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    async def get_breed_in_group(self, group_id: str, breed_id: str) -> Tuple[Dict[str, Any], int]:
+        """Gets a breed within a group."""
+        try:
+            breed = await self._dog_service.get_breed_in_group(group_id, breed_id)
+            if not breed:
+                return ApiResponse.not_found("Breed not found in the specified group")
+
+            return self._entity_response(breed, "Breed in group retrieved successfully")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    async def get_group_breeds(self, group_id: str, pagination: PaginationParams) -> Tuple[Dict[str, Any], int]:
+        """Gets the full breed records of a group."""
+        try:
+            self._clamp_pagination(pagination)
+            breeds = await self._dog_service.get_group_breeds(group_id, pagination)
+            if breeds is None:
+                return ApiResponse.not_found("Group not found")
+
+            return self._handle_paginated_response(breeds, "breeds")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    async def get_breeds_by_ids(self, breed_ids: List[str]) -> Tuple[Dict[str, Any], int]:
+        """Gets several breeds by ID."""
+        try:
+            if len(breed_ids) > self.MAX_BATCH_IDS:
+                return ApiResponse.bad_request(f"At most {self.MAX_BATCH_IDS} ids can be requested at once")
+
+            breeds = await self._dog_service.get_breeds_by_ids(breed_ids)
+            return self._handle_batch_response(breeds, "breeds")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    async def get_groups_by_ids(self, group_ids: List[str]) -> Tuple[Dict[str, Any], int]:
+        """Gets several groups by ID."""
+        try:
+            if len(group_ids) > self.MAX_BATCH_IDS:
+                return ApiResponse.bad_request(f"At most {self.MAX_BATCH_IDS} ids can be requested at once")
+
+            groups = await self._dog_service.get_groups_by_ids(group_ids)
+            return self._handle_batch_response(groups, "groups")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    async def get_content_version(self) -> Optional[str]:
+        """Gets the version of the content behind every route, if known."""
+        try:
+            return await self._dog_service.get_content_version()
+        except Exception:
+            return None
+
+    @timed("controller")
+    async def get_breeds_by_cursor(self, cursor: str, page_size: int, search: Optional[SearchParams] = None) -> Tuple[Dict[str, Any], int]:
+        """Gets a keyset page of breeds in ID order."""
+        try:
+            self._validate_breed_query(search)
+            breeds = await self._dog_service.get_breeds_after(self._cursor_params(cursor, page_size), search)
+            return self._handle_cursor_response(breeds, "breeds")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    async def get_groups_by_cursor(self, cursor: str, page_size: int, search: Optional[SearchParams] = None) -> Tuple[Dict[str, Any], int]:
+        """Gets a keyset page of groups in ID order."""
+        try:
+            groups = await self._dog_service.get_groups_after(self._cursor_params(cursor, page_size), search)
+            return self._handle_cursor_response(groups, "groups")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    async def export_breeds(self) -> Tuple[Any, int]:
+        """Streams every breed as NDJSON."""
+        try:
+            # Fetch the first page now so an unreachable catalog fails before the response starts
+            first_page = await self._dog_service.get_all_breeds(PaginationParams(page=1, page_size=CRAWL_PAGE_SIZE))
+            return StreamedBody(self._ndjson_chunks(self._iter_pages(first_page)), NDJSON_MIMETYPE), 200
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
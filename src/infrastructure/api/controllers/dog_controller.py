@@ -1,23 +1,47 @@
-from typing import Dict, Any, Optional, Tuple
+from itertools import chain
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from flask import Response, after_this_request, has_request_context
 
 from src.application.services.dog_service import DogService
 from src.domain.entities.breed import Breed
 from src.domain.entities.fact import Fact
 from src.domain.entities.group import Group
-from src.domain.entities.pagination import PaginationParams, SearchParams, PaginatedResponse
+from src.domain.entities.pagination import CursorPage, CursorParams, PaginationParams, SearchParams, PaginatedResponse
+from src.infrastructure.api.serializers import RawJSON, serializer
+from src.infrastructure.search.breed_columns import check_sort_field, parse_breed_filters
 from src.shared.exceptions.api_exception import APIException
-from src.shared.api_response import ApiResponse
+from src.shared.api_response import ApiResponse, EncodedJSON, StreamedBody
+from src.shared.utils.cursor import decode_cursor, encode_cursor
+from src.shared.utils.timing import timed
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
 
 
 class DogController:
+    MAX_BATCH_IDS = 100
+    EXPORT_CHUNK_SIZE = 100
+
     def __init__(self, dog_service: DogService):
         self._dog_service = dog_service
 
-    def _to_dict(self, obj: Any) -> Dict[str, Any]:
-        """Converts an entity to a dictionary"""
-        if hasattr(obj, '__dict__'):
-            return {k: v for k, v in obj.__dict__.items() if v is not None}
-        return obj
+    def _success(self, message: str, **members: Any) -> Tuple[EncodedJSON, int]:
+        """Builds a pre-encoded success envelope"""
+        return EncodedJSON(serializer.encode_envelope(message=message, status="success", **members)), 200
+
+    def _api_error(self, error: APIException) -> Tuple[Dict[str, Any], int]:
+        """Builds the error response of an APIException; its headers (e.g. Retry-After) are added to the response"""
+        headers = error.headers
+        if headers and has_request_context():
+            @after_this_request
+            def add_error_headers(response: Response) -> Response:
+                response.headers.update(headers)
+                return response
+        return ApiResponse.error(str(error), error.status_code)
+
+    def _entity_response(self, entity: Any, message: str) -> Tuple[EncodedJSON, int]:
+        """Builds the success envelope of a single entity"""
+        return self._success(message, data=RawJSON(serializer.encode_entity(entity)))
 
     def _extract_response_data(self, response: Any) -> Dict[str, Any]:
         """Extracts data from the external API response"""
@@ -32,23 +56,75 @@ class DogController:
     def _handle_paginated_response(self, response: PaginatedResponse, resource_name: str) -> Tuple[Dict[str, Any], int]:
         """Handles paginated response and validates if there is data"""
         if not response.items:
-            return ApiResponse.not_found(f"No {resource_name} found"), 404
+            return ApiResponse.not_found(f"No {resource_name} found")
         
 
-        return {
-            "data": [self._to_dict(item) for item in response.items],
-            "meta": {
+        return self._success(
+            f"{resource_name.capitalize()} retrieved successfully",
+            data=RawJSON(serializer.encode_entities(response.items)),
+            meta={
                 "total": response.total,
                 "page": response.page,
                 "page_size": response.page_size,
                 "total_pages": response.total_pages,
                 "has_next": response.has_next,
                 "has_previous": response.has_previous
-            },
-            "message": f"{resource_name.capitalize()} retrieved successfully",
-            "status": "success"
-        }, 200
+            }
+        )
+
+    def _handle_batch_response(self, results: Dict[str, Any], resource_name: str) -> Tuple[Dict[str, Any], int]:
+        """Handles a multi-get response, listing the IDs that were not found"""
+        found = [item for item in results.values() if item is not None]
+        not_found = [item_id for item_id, item in results.items() if item is None]
+        if not found:
+            return ApiResponse.not_found(f"No {resource_name} found")
+
+        return self._success(
+            f"{resource_name.capitalize()} retrieved successfully",
+            data=RawJSON(serializer.encode_entities(found)),
+            not_found=not_found,
+            meta={
+                "requested": len(results),
+                "found": len(found)
+            }
+        )
+
+    def _validate_breed_query(self, search: Optional[SearchParams], sort_by: Optional[str] = None) -> None:
+        """Rejects unknown filters, malformed filter values and unknown sort fields, whatever the repository"""
+        parse_breed_filters(search.filters if search else None)
+        check_sort_field(sort_by)
+
+    def _cursor_params(self, cursor: str, page_size: int) -> CursorParams:
+        """Decodes the opaque cursor and clamps the page size"""
+        return CursorParams(after=decode_cursor(cursor), page_size=min(max(page_size, 1), 100))
+
+    def _handle_cursor_response(self, response: CursorPage, resource_name: str) -> Tuple[Dict[str, Any], int]:
+        """Handles a keyset page, handing out the cursor of the next one"""
+        if not response.items:
+            return ApiResponse.not_found(f"No {resource_name} found")
+
+        return self._success(
+            f"{resource_name.capitalize()} retrieved successfully",
+            data=RawJSON(serializer.encode_entities(response.items)),
+            meta={
+                "page_size": response.page_size,
+                "has_next": response.has_next,
+                "next_cursor": encode_cursor(response.next_after) if response.has_next else None
+            }
+        )
+
+    def _ndjson_chunks(self, entities: Iterable[Any]) -> Iterator[bytes]:
+        """Encodes entities as NDJSON, yielding a chunk every EXPORT_CHUNK_SIZE lines"""
+        lines = []
+        for entity in entities:
+            lines.append(serializer.encode_entity(entity))
+            if len(lines) == self.EXPORT_CHUNK_SIZE:
+                yield ("\n".join(lines) + "\n").encode("ascii")
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("ascii")
 
+    @timed("controller")
     def get_breeds(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> Tuple[Dict[str, Any], int]:
         """Gets all dog breeds with pagination and search."""
         try:
@@ -60,47 +136,43 @@ class DogController:
             if pagination.page_size > 100:
                 pagination.page_size = 100
 
+            self._validate_breed_query(search, pagination.sort_by)
             breeds = self._dog_service.get_all_breeds(pagination, search)
             return self._handle_paginated_response(breeds, "breeds")
         except APIException as e:
-            return ApiResponse.error(str(e)), 400
+            return self._api_error(e)
         except Exception as e:
-            return ApiResponse.error("Internal server error"), 500
+            return ApiResponse.error("Internal server error", 500)
 
+    @timed("controller")
     def get_breed(self, breed_id: str) -> Tuple[Dict[str, Any], int]:
         """Gets a specific breed."""
         try:
             breed = self._dog_service.get_breed_by_id(breed_id)
             if not breed:
-                return ApiResponse.error("Breed not found"), 404
+                return ApiResponse.not_found("Breed not found")
             
-            return {
-                "data": self._to_dict(breed),
-                "message": "Breed retrieved successfully",
-                "status": "success"
-            }, 200
+            return self._entity_response(breed, "Breed retrieved successfully")
         except APIException as e:
-            return ApiResponse.error(str(e)), 400
+            return self._api_error(e)
         except Exception as e:
-            return ApiResponse.error("Internal server error"), 500
+            return ApiResponse.error("Internal server error", 500)
 
-    def get_facts(self) -> Tuple[Dict[str, Any], int]:
-        """Gets interesting facts about dogs."""
+    @timed("controller")
+    def get_facts(self, limit: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+        """Gets interesting facts about dogs, `limit` of them if given."""
         try:
-            facts = self._dog_service.get_all_facts()
+            facts = self._dog_service.get_all_facts(limit)
             if not facts:
-                return ApiResponse.not_found("No facts found"), 404
+                return ApiResponse.not_found("No facts found")
 
-            return {
-                "data": [self._to_dict(item) for item in facts],
-                "message": "Facts retrieved successfully",
-                "status": "success"
-            }, 200
+            return self._success("Facts retrieved successfully", data=RawJSON(serializer.encode_entities(facts)))
         except APIException as e:
-            return ApiResponse.error(str(e)), 400
+            return self._api_error(e)
         except Exception as e:
-            return ApiResponse.error("Internal server error"), 500
+            return ApiResponse.error("Internal server error", 500)
 
+    @timed("controller")
     def get_groups(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> Tuple[Dict[str, Any], int]:
         """Gets all groups with pagination and search."""
         try:
@@ -114,59 +186,142 @@ class DogController:
             groups = self._dog_service.get_all_groups(pagination, search)
             return self._handle_paginated_response(groups, "groups")
         except APIException as e:
-            return ApiResponse.error(str(e)), 400
+            return self._api_error(e)
         except Exception as e:
-            return ApiResponse.error("Internal server error"), 500
+            return ApiResponse.error("Internal server error", 500)
 
+    @timed("controller")
     def get_group(self, group_id: str) -> Tuple[Dict[str, Any], int]:
         """Gets a specific group."""
         try:
             group = self._dog_service.get_group_by_id(group_id)
             if not group:
-                return ApiResponse.error("Group not found"), 404
+                return ApiResponse.not_found("Group not found")
             
-            return {
-                "data": self._to_dict(group),
-                "message": "Group retrieved successfully",
-                "status": "success"
-            }, 200
+            return self._entity_response(group, "Group retrieved successfully")
         except APIException as e:
-            return ApiResponse.error(str(e)), 400
+            return self._api_error(e)
         except Exception as e:
-            return ApiResponse.error("Internal server error"), 500
+            return ApiResponse.error("Internal server error", 500)
 
+    @timed("controller")
     def get_group_details(self, group_id: str) -> Tuple[Dict[str, Any], int]:
         """Gets group relationships."""
         try:
             group = self._dog_service.get_group_details(group_id)
             if not group:
-                return ApiResponse.error("Group not found"), 404
+                return ApiResponse.not_found("Group not found")
             
-            return {
-                "data": {
-                    "relationships": self._to_dict(group.relationships) if group.relationships else {}
-                },
-                "message": "Group relationships retrieved successfully",
-                "status": "success"
-            }, 200
+            relationships = RawJSON(serializer.encode_entity(group.relationships)) if group.relationships else {}
+            return self._success("Group relationships retrieved successfully", data={"relationships": relationships})
         except APIException as e:
-            return ApiResponse.error(str(e)), 400
+            return self._api_error(e)
         except Exception as e:
-            return ApiResponse.error("Internal server error"), 500
+            return ApiResponse.error("Internal server error", 500)
 
+    @timed("controller")
     def get_breed_in_group(self, group_id: str, breed_id: str) -> Tuple[Dict[str, Any], int]:
         """Gets a breed within a group."""
         try:
             breed = self._dog_service.get_breed_in_group(group_id, breed_id)
             if not breed:
-                return ApiResponse.error("Breed not found in the specified group"), 404
+                return ApiResponse.not_found("Breed not found in the specified group")
             
-            return {
-                "data": self._to_dict(breed),
-                "message": "Breed in group retrieved successfully",
-                "status": "success"
-            }, 200
+            return self._entity_response(breed, "Breed in group retrieved successfully")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    def get_group_breeds(self, group_id: str, pagination: PaginationParams) -> Tuple[Dict[str, Any], int]:
+        """Gets the full breed records of a group."""
+        try:
+            if pagination.page < 1:
+                pagination.page = 1
+            if pagination.page_size < 1:
+                pagination.page_size = 10
+            if pagination.page_size > 100:
+                pagination.page_size = 100
+
+            breeds = self._dog_service.get_group_breeds(group_id, pagination)
+            if breeds is None:
+                return ApiResponse.not_found("Group not found")
+
+            return self._handle_paginated_response(breeds, "breeds")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    def get_breeds_by_ids(self, breed_ids: List[str]) -> Tuple[Dict[str, Any], int]:
+        """Gets several breeds by ID."""
+        try:
+            if len(breed_ids) > self.MAX_BATCH_IDS:
+                return ApiResponse.bad_request(f"At most {self.MAX_BATCH_IDS} ids can be requested at once")
+
+            breeds = self._dog_service.get_breeds_by_ids(breed_ids)
+            return self._handle_batch_response(breeds, "breeds")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    def get_groups_by_ids(self, group_ids: List[str]) -> Tuple[Dict[str, Any], int]:
+        """Gets several groups by ID."""
+        try:
+            if len(group_ids) > self.MAX_BATCH_IDS:
+                return ApiResponse.bad_request(f"At most {self.MAX_BATCH_IDS} ids can be requested at once")
+
+            groups = self._dog_service.get_groups_by_ids(group_ids)
+            return self._handle_batch_response(groups, "groups")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    def get_content_version(self) -> Optional[str]:
+        """Gets the version of the content behind every route, if known."""
+        try:
+            return self._dog_service.get_content_version()
+        except Exception:
+            return None
+
+    @timed("controller")
+    def get_breeds_by_cursor(self, cursor: str, page_size: int, search: Optional[SearchParams] = None) -> Tuple[Dict[str, Any], int]:
+        """Gets a keyset page of breeds in ID order."""
+        try:
+            self._validate_breed_query(search)
+            breeds = self._dog_service.get_breeds_after(self._cursor_params(cursor, page_size), search)
+            return self._handle_cursor_response(breeds, "breeds")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    @timed("controller")
+    def get_groups_by_cursor(self, cursor: str, page_size: int, search: Optional[SearchParams] = None) -> Tuple[Dict[str, Any], int]:
+        """Gets a keyset page of groups in ID order."""
+        try:
+            groups = self._dog_service.get_groups_after(self._cursor_params(cursor, page_size), search)
+            return self._handle_cursor_response(groups, "groups")
+        except APIException as e:
+            return self._api_error(e)
+        except Exception as e:
+            return ApiResponse.error("Internal server error", 500)
+
+    def export_breeds(self) -> Tuple[Any, int]:
+        """Streams every breed as NDJSON."""
+        try:
+            breeds = self._dog_service.iter_all_breeds()
+            # Pull the first breed now so an unreachable catalog fails before the response starts
+            first = next(breeds, None)
+            remaining = chain([first], breeds) if first is not None else iter(())
+            return StreamedBody(self._ndjson_chunks(remaining), NDJSON_MIMETYPE), 200
         except APIException as e:
-            return ApiResponse.error(str(e)), 400
+            return self._api_error(e)
         except Exception as e:
-            return ApiResponse.error("Internal server error"), 500 
\ No newline at end of file
+            return ApiResponse.error("Internal server error", 500)
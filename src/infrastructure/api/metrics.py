@@ -0,0 +1,48 @@
+import time
+
+from flask import Flask, Response, g, request
+
+from src.shared.utils.metrics import REGISTRY, MetricsRegistry
+
+# Label for requests that matched no route, so unknown paths cannot blow up the series count
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestMetrics:
+    """
+    Per-route request latency histograms for a Flask app, served with the
+    rest of the registry at `path` in the Prometheus text format.
+
+    The route label is the URL rule (e.g. /breeds/<breed_id>), not the raw
+    path. Streamed responses are timed up to their first byte.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, path: str = "/metrics"):
+        self._registry = registry
+        self._path = path
+        self._latency = registry.histogram(
+            "dogapi_http_request_duration_seconds",
+            "Time spent serving HTTP requests, by route, method and status",
+            ("route", "method", "status")
+        )
+
+    def init_app(self, app: Flask) -> None:
+        # Registered before the other after_request hooks so it runs last and times them too
+        app.before_request(self._start_timer)
+        app.after_request(self._record)
+        app.add_url_rule(self._path, "metrics", self.metrics_view, methods=["GET"])
+
+    @staticmethod
+    def _start_timer() -> None:
+        g.request_started = time.perf_counter()
+
+    def _record(self, response: Response) -> Response:
+        started = g.get("request_started")
+        if started is None or request.path == self._path:
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+        self._latency.labels(route, request.method, str(response.status_code)).observe(time.perf_counter() - started)
+        return response
+
+    def metrics_view(self) -> Response:
+        return Response(self._registry.render(), mimetype=None, content_type=MetricsRegistry.CONTENT_TYPE)
@@ -0,0 +1,98 @@
+import cProfile
+import json
+import pstats
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+from src.shared.api_response import ApiResponse
+
+PROFILE_HEADER = "X-Profile"
+SORT_KEYS = {"cumulative": 3, "tottime": 2}
+
+
+class RequestProfiler:
+    """
+    WSGI middleware that runs a single request under cProfile on demand.
+
+    A request is profiled only when it carries the X-Profile header and
+    comes from an address in `allowlist`; its response is then replaced by
+    the `top` heaviest frames, sorted by the header value ('cumulative', the
+    default, or 'tottime'). cProfile only sees the request thread, so time
+    in fan-out workers and the async I/O loop shows up as waiting. One
+    request is profiled at a time; concurrent ones are served unprofiled.
+    """
+
+    def __init__(self, wsgi_app: Callable, allowlist: Iterable[str], top: int = 25):
+        self._wsgi_app = wsgi_app
+        self._allowlist = frozenset(allowlist)
+        self._top = top
+        self._lock = threading.Lock()
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        header = environ.get("HTTP_" + PROFILE_HEADER.upper().replace("-", "_"))
+        if not header or environ.get("REMOTE_ADDR") not in self._allowlist:
+            return self._wsgi_app(environ, start_response)
+        if not self._lock.acquire(blocking=False):
+            return self._wsgi_app(environ, start_response)
+        try:
+            return self._profile(environ, start_response, header.strip().lower())
+        finally:
+            self._lock.release()
+
+    def _profile(self, environ: Dict[str, Any], start_response: Callable, sort: str) -> Iterable[bytes]:
+        sort = sort if sort in SORT_KEYS else "cumulative"
+        captured: Dict[str, Any] = {}
+
+        def capture_start_response(status: str, headers: List, exc_info: Any = None) -> Callable:
+            captured["status"] = status
+            return lambda data: None
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            app_iter = self._wsgi_app(environ, capture_start_response)
+            try:
+                size = sum(len(chunk) for chunk in app_iter)
+            finally:
+                if hasattr(app_iter, "close"):
+                    app_iter.close()
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+
+        response, status_code = ApiResponse.success(
+            data={
+                "response_status": captured.get("status"),
+                "response_bytes": size,
+                "elapsed_ms": round(elapsed * 1000, 3),
+                "sort": sort,
+                "frames": self._top_frames(profiler, sort),
+            },
+            message="Request profiled"
+        )
+        body = json.dumps(response).encode("utf-8")
+        start_response(f"{int(status_code)} OK", [
+            ("Content-Type", "application/json"),
+            ("Content-Length", str(len(body))),
+            ("Cache-Control", "no-store"),
+        ])
+        return [body]
+
+    def _top_frames(self, profiler: cProfile.Profile, sort: str) -> List[Dict[str, Any]]:
+        stats = pstats.Stats(profiler).stats
+        index = SORT_KEYS[sort]
+        heaviest = sorted(stats.items(), key=lambda item: item[1][index], reverse=True)[:self._top]
+        return [
+            {
+                "function": function,
+                "file": filename,
+                "line": line,
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "self_ms": round(self_time * 1000, 3),
+                "cumulative_ms": round(cumulative_time * 1000, 3),
+            }
+            for (filename, line, function), (primitive_calls, calls, self_time, cumulative_time, _) in heaviest
+        ]
@@ -0,0 +1,113 @@
+from flask import Flask, request
+from src.infrastructure.api.controllers.async_dog_controller import AsyncDogController
+from src.infrastructure.api.routes.dog_routes import (
+    BREED_FILTER_PARAMS, CACHE_CONTROL, _get_facts_limit, _get_id_list, _get_pagination_params, _get_search_params, _get_sort_params
+)
+from src.domain.entities.pagination import PaginationParams
+from src.infrastructure.api.conditional import conditional
+from src.shared.decorators import format_response
+
+def register_async_routes(app: Flask, controller: AsyncDogController) -> None:
+    """Registers the same routes as register_routes with async views."""
+
+    @app.route('/breeds', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['list'])
+    @format_response
+    async def get_breeds():
+        """Get all dog breeds with pagination and search, keyset pages by ?cursor=, or several breeds by ?ids="""
+        breed_ids = _get_id_list(request.args)
+        if breed_ids:
+            response, status_code = await controller.get_breeds_by_ids(breed_ids)
+            return response, status_code
+
+        if 'cursor' in request.args:
+            _, page_size = _get_pagination_params(request.args)
+            search_params = _get_search_params(request.args, BREED_FILTER_PARAMS)
+            response, status_code = await controller.get_breeds_by_cursor(request.args['cursor'], page_size, search_params)
+            return response, status_code
+
+        page, page_size = _get_pagination_params(request.args)
+        search_params = _get_search_params(request.args, BREED_FILTER_PARAMS)
+        sort_by, sort_order = _get_sort_params(request.args)
+        pagination = PaginationParams(page=page, page_size=page_size, sort_by=sort_by, sort_order=sort_order)
+        response, status_code = await controller.get_breeds(pagination, search_params)
+        return response, status_code
+
+    @app.route('/breeds/<breed_id>', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['entity'])
+    @format_response
+    async def get_breed(breed_id: str):
+        """Get a specific breed by ID"""
+        response, status_code = await controller.get_breed(breed_id)
+        return response, status_code
+
+    @app.route('/facts', methods=['GET'])
+    # Random facts: no ETag, since one tag would name every sample
+    @conditional(controller.get_content_version, CACHE_CONTROL['facts'], hash_body=False)
+    @format_response
+    async def get_facts():
+        """Get random dog facts, ?limit= of them"""
+        response, status_code = await controller.get_facts(_get_facts_limit(request.args))
+        return response, status_code
+
+    @app.route('/groups', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['list'])
+    @format_response
+    async def get_groups():
+        """Get all groups with pagination and search, keyset pages by ?cursor=, or several groups by ?ids="""
+        group_ids = _get_id_list(request.args)
+        if group_ids:
+            response, status_code = await controller.get_groups_by_ids(group_ids)
+            return response, status_code
+
+        if 'cursor' in request.args:
+            _, page_size = _get_pagination_params(request.args)
+            response, status_code = await controller.get_groups_by_cursor(request.args['cursor'], page_size, _get_search_params(request.args))
+            return response, status_code
+
+        page, page_size = _get_pagination_params(request.args)
+        search_params = _get_search_params(request.args)
+        pagination = PaginationParams(page=page, page_size=page_size)
+        response, status_code = await controller.get_groups(pagination, search_params)
+        return response, status_code
+
+    @app.route('/groups/<group_id>', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['entity'])
+    @format_response
+    async def get_group(group_id: str):
+        """Get a specific group by ID"""
+        response, status_code = await controller.get_group(group_id)
+        return response, status_code
+
+    @app.route('/group-details/<group_id>', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['entity'])
+    @format_response
+    async def get_group_details(group_id: str):
+        """Get group relationships"""
+        response, status_code = await controller.get_group_details(group_id)
+        return response, status_code
+
+    @app.route('/group-details/<group_id>/breed/<breed_id>', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['entity'])
+    @format_response
+    async def get_breed_in_group(group_id: str, breed_id: str):
+        """Get a breed within a group"""
+        response, status_code = await controller.get_breed_in_group(group_id, breed_id)
+        return response, status_code
+
+    @app.route('/group-details/<group_id>/breeds', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['list'])
+    @format_response
+    async def get_group_breeds(group_id: str):
+        """Get the full breed records of a group"""
+        page, page_size = _get_pagination_params(request.args)
+        pagination = PaginationParams(page=page, page_size=page_size)
+        response, status_code = await controller.get_group_breeds(group_id, pagination)
+        return response, status_code
+
+    @app.route('/export/breeds.ndjson', methods=['GET'])
+    @format_response
+    async def export_breeds():
+        """Stream every breed as newline-delimited JSON"""
+        response, status_code = await controller.export_breeds()
+        return response, status_code
@@ -1,8 +1,17 @@
-from flask import Flask
+from flask import Flask, request
 from src.infrastructure.api.controllers.dog_controller import DogController
 from src.domain.entities.pagination import PaginationParams, SearchParams
+from src.infrastructure.api.conditional import conditional
 from src.shared.decorators import format_response
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
+
+# Cache-Control sent with 200/304 responses; clients revalidate with the ETag once it expires
+CACHE_CONTROL = {
+    'list': 'public, max-age=60',
+    'entity': 'public, max-age=300',
+    # A new random sample on every call, so nothing may be reused or revalidated
+    'facts': 'no-store',
+}
 
 def _get_pagination_params(args: Dict[str, Any]) -> Tuple[int, int]:
     """
@@ -24,27 +33,83 @@ def _get_pagination_params(args: Dict[str, Any]) -> Tuple[int, int]:
     except (ValueError, TypeError):
         return 1, 10
 
-def _get_search_params(args: Dict[str, Any]) -> Optional[SearchParams]:
+BREED_FILTER_PARAMS = (
+    'life_span_min', 'life_span_max',
+    'male_weight_min', 'male_weight_max',
+    'female_weight_min', 'female_weight_max',
+    'hypoallergenic', 'group'
+)
+
+def _get_search_params(args: Dict[str, Any], filter_names: Tuple[str, ...] = ()) -> Optional[SearchParams]:
     """
     Gets and validates search parameters safely.
-    Returns None if there is no search or the parameter is empty.
+    Only the parameters listed in filter_names are collected as filters.
+    Returns None if there is no search and no filter.
     """
     search = args.get('search', '').strip()
-    return SearchParams(query=search) if search else None
+    filters = {name: args.get(name).strip() for name in filter_names if args.get(name, '').strip()}
+    if not search and not filters:
+        return None
+    return SearchParams(query=search or None, filters=filters or None)
+
+def _get_sort_params(args: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Gets the sort field and order.
+    sort_by is 'name' or a range column named like its filter, e.g. 'life_span_min'.
+    Returns (sort_by, sort_order) with the order defaulting to 'asc'.
+    """
+    sort_by = args.get('sort_by', '').strip() or None
+    sort_order = args.get('sort_order', 'asc').strip().lower()
+    return sort_by, 'desc' if sort_order == 'desc' else 'asc'
+
+MAX_FACTS = 100
+
+def _get_facts_limit(args: Dict[str, Any]) -> Optional[int]:
+    """
+    Gets the number of facts to return, clamped to 1..MAX_FACTS.
+    Returns None if the parameter is absent or not a number.
+    """
+    try:
+        limit = int(args.get('limit', ''))
+    except (ValueError, TypeError):
+        return None
+    return min(max(limit, 1), MAX_FACTS)
+
+def _get_id_list(args: Dict[str, Any]) -> Optional[List[str]]:
+    """
+    Gets the comma-separated 'ids' parameter.
+    Returns None if the parameter is absent or has no IDs.
+    """
+    ids = [item.strip() for item in args.get('ids', '').split(',') if item.strip()]
+    return ids or None
 
 def register_routes(app: Flask, controller: DogController) -> None:
     
     @app.route('/breeds', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['list'])
     @format_response
-    def get_breeds(page: int = 1, per_page: int = 5, search: str = ''):
-        """Get all dog breeds with pagination and search"""
-        page, page_size = _get_pagination_params({'page': page, 'per_page': per_page})
-        search_params = _get_search_params({'search': search})
-        pagination = PaginationParams(page=page, page_size=page_size)
+    def get_breeds():
+        """Get all dog breeds with pagination and search, keyset pages by ?cursor=, or several breeds by ?ids="""
+        breed_ids = _get_id_list(request.args)
+        if breed_ids:
+            response, status_code = controller.get_breeds_by_ids(breed_ids)
+            return response, status_code
+
+        if 'cursor' in request.args:
+            _, page_size = _get_pagination_params(request.args)
+            search_params = _get_search_params(request.args, BREED_FILTER_PARAMS)
+            response, status_code = controller.get_breeds_by_cursor(request.args['cursor'], page_size, search_params)
+            return response, status_code
+
+        page, page_size = _get_pagination_params(request.args)
+        search_params = _get_search_params(request.args, BREED_FILTER_PARAMS)
+        sort_by, sort_order = _get_sort_params(request.args)
+        pagination = PaginationParams(page=page, page_size=page_size, sort_by=sort_by, sort_order=sort_order)
         response, status_code = controller.get_breeds(pagination, search_params)
         return response, status_code
 
     @app.route('/breeds/<breed_id>', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['entity'])
     @format_response
     def get_breed(breed_id: str):
         """Get a specific breed by ID"""
@@ -52,23 +117,37 @@ def register_routes(app: Flask, controller: DogController) -> None:
         return response, status_code
 
     @app.route('/facts', methods=['GET'])
+    # Random facts: no ETag, since one tag would name every sample
+    @conditional(controller.get_content_version, CACHE_CONTROL['facts'], hash_body=False)
     @format_response
     def get_facts():
-        """Get dog facts"""
-        response, status_code = controller.get_facts()
+        """Get random dog facts, ?limit= of them"""
+        response, status_code = controller.get_facts(_get_facts_limit(request.args))
         return response, status_code
 
     @app.route('/groups', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['list'])
     @format_response
-    def get_groups(page: int = 1, per_page: int = 5, search: str = ''):
-        """Get all groups with pagination and search"""
-        page, page_size = _get_pagination_params({'page': page, 'per_page': per_page})
-        search_params = _get_search_params({'search': search})
+    def get_groups():
+        """Get all groups with pagination and search, keyset pages by ?cursor=, or several groups by ?ids="""
+        group_ids = _get_id_list(request.args)
+        if group_ids:
+            response, status_code = controller.get_groups_by_ids(group_ids)
+            return response, status_code
+
+        if 'cursor' in request.args:
+            _, page_size = _get_pagination_params(request.args)
+            response, status_code = controller.get_groups_by_cursor(request.args['cursor'], page_size, _get_search_params(request.args))
+            return response, status_code
+
+        page, page_size = _get_pagination_params(request.args)
+        search_params = _get_search_params(request.args)
         pagination = PaginationParams(page=page, page_size=page_size)
         response, status_code = controller.get_groups(pagination, search_params)
         return response, status_code
 
     @app.route('/groups/<group_id>', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['entity'])
     @format_response
     def get_group(group_id: str):
         """Get a specific group by ID"""
@@ -76,6 +155,7 @@ def register_routes(app: Flask, controller: DogController) -> None:
         return response, status_code
 
     @app.route('/group-details/<group_id>', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['entity'])
     @format_response
     def get_group_details(group_id: str):
         """Get group relationships"""
@@ -83,8 +163,26 @@ def register_routes(app: Flask, controller: DogController) -> None:
         return response, status_code
 
     @app.route('/group-details/<group_id>/breed/<breed_id>', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['entity'])
     @format_response
     def get_breed_in_group(group_id: str, breed_id: str):
         """Get a breed within a group"""
         response, status_code = controller.get_breed_in_group(group_id, breed_id)
-        return response, status_code 
\ No newline at end of file
+        return response, status_code
+
+    @app.route('/group-details/<group_id>/breeds', methods=['GET'])
+    @conditional(controller.get_content_version, CACHE_CONTROL['list'])
+    @format_response
+    def get_group_breeds(group_id: str):
+        """Get the full breed records of a group"""
+        page, page_size = _get_pagination_params(request.args)
+        pagination = PaginationParams(page=page, page_size=page_size)
+        response, status_code = controller.get_group_breeds(group_id, pagination)
+        return response, status_code
+
+    @app.route('/export/breeds.ndjson', methods=['GET'])
+    @format_response
+    def export_breeds():
+        """Stream every breed as newline-delimited JSON"""
+        response, status_code = controller.export_breeds()
+        return response, status_code
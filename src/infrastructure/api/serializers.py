@@ -0,0 +1,194 @@
+import json
+import threading
+import weakref
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from src.infrastructure.external.dog_api.mappers import LazyBreed, LazyGroup
+from src.shared.utils.timing import timed
+
+_encode_scalar = json.JSONEncoder(ensure_ascii=True, separators=(",", ":")).encode
+
+
+class RawJSON:
+    """Already-encoded JSON fragment that is emitted verbatim."""
+    __slots__ = ("fragment",)
+
+    def __init__(self, fragment: str):
+        self.fragment = fragment
+
+
+class _IdentityMemo:
+    """
+    Memo of encoded fragments keyed by object identity.
+
+    Entities are treated as immutable once built, so identity doubles as
+    the content version; entries are dropped when their entity is collected.
+    """
+
+    def __init__(self):
+        self._fragments: Dict[int, Tuple[weakref.ref, str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, obj: Any) -> Optional[str]:
+        cached = self._fragments.get(id(obj))
+        if cached is not None and cached[0]() is obj:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        return None
+
+    def put(self, obj: Any, fragment: str) -> None:
+        key = id(obj)
+        try:
+            ref = weakref.ref(obj, lambda _, key=key: self._discard(key))
+        except TypeError:
+            return
+        with self._lock:
+            self._fragments[key] = (ref, fragment)
+
+    def _discard(self, key: int) -> None:
+        with self._lock:
+            cached = self._fragments.get(key)
+            if cached is not None and cached[0]() is None:
+                del self._fragments[key]
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+
+class JSONSerializer:
+    """
+    Encodes entities with one compiled encoder per dataclass type.
+
+    Output matches Flask's JSON provider (sorted keys, compact separators,
+    ASCII-escaped), with None fields dropped at the top level of an entity
+    as the controllers always did. Top-level entity fragments are memoized,
+    so list and paginated envelopes are assembled by joining cached strings.
+    Lazy upstream views are encoded straight from their JSON:API resource,
+    byte for byte as their built entity would be, without building it.
+    """
+
+    def __init__(self):
+        self._encoders: Dict[Tuple[type, bool], Callable[[Any], str]] = {}
+        self._memo = _IdentityMemo()
+        self._passthrough: Dict[type, Callable[[Any], str]] = {
+            LazyBreed: self._encode_lazy_breed,
+            LazyGroup: self._encode_lazy_group,
+        }
+
+    def _compile(self, cls: type, drop_none: bool) -> Callable[[Any], str]:
+        names = sorted(field.name for field in fields(cls))
+        prefixes = [_encode_scalar(name) + ":" for name in names]
+        encode_value = self.encode_value
+
+        if drop_none:
+            def encode(obj: Any) -> str:
+                parts = []
+                for name, prefix in zip(names, prefixes):
+                    value = getattr(obj, name)
+                    if value is not None:
+                        parts.append(prefix + encode_value(value))
+                return "{" + ",".join(parts) + "}"
+        else:
+            def encode(obj: Any) -> str:
+                return "{" + ",".join(
+                    prefix + encode_value(getattr(obj, name))
+                    for name, prefix in zip(names, prefixes)
+                ) + "}"
+
+        encode.__name__ = f"encode_{cls.__name__}"
+        return encode
+
+    def _encoder(self, cls: type, drop_none: bool) -> Callable[[Any], str]:
+        key = (cls, drop_none)
+        encoder = self._encoders.get(key)
+        if encoder is None:
+            encoder = self._encoders[key] = self._compile(cls, drop_none)
+        return encoder
+
+    def _encode_range(self, value: Optional[Dict[str, Any]]) -> str:
+        """Encodes a LifeSpan/WeightRange from its JSON object; a falsy one was never built."""
+        if not value:
+            return "null"
+        return '{"max":' + self.encode_value(value["max"]) + ',"min":' + self.encode_value(value["min"]) + "}"
+
+    def _encode_lazy_breed(self, breed: LazyBreed) -> str:
+        """Encodes a breed view as the Breed encoder would, reading its resource (see mappers.LazyBreed)."""
+        resource = breed.resource
+        attributes = resource["attributes"]
+        parts = [
+            '"attributes":{"description":' + self.encode_value(attributes.get("description"))
+            + ',"female_weight":' + self._encode_range(attributes.get("female_weight"))
+            + ',"hypoallergenic":' + self.encode_value(attributes.get("hypoallergenic", False))
+            + ',"life":' + self._encode_range(attributes.get("life"))
+            + ',"male_weight":' + self._encode_range(attributes.get("male_weight"))
+            + ',"name":' + self.encode_value(attributes["name"]) + "}",
+            '"id":' + self.encode_value(breed.id),
+        ]
+        if breed.document_links is not None:
+            parts.append('"links":{"self":' + self.encode_value(breed.document_links["self"]) + "}")
+        relationships = resource.get("relationships")
+        if relationships and "group" in relationships:
+            parts.append('"relationships":{"group":{"id":' + self.encode_value(relationships["group"]["data"]["id"]) + ',"type":"group"}}')
+        parts.append('"type":"breed"')
+        return "{" + ",".join(parts) + "}"
+
+    def _encode_lazy_group(self, group: LazyGroup) -> str:
+        """Encodes a group view as the Group encoder would, reading its resource (see mappers.LazyGroup)."""
+        resource = group.resource
+        references = resource.get("relationships", {}).get("breeds", {}).get("data", [])
+        return (
+            '{"attributes":{"name":' + self.encode_value(resource.get("attributes", {})["name"])
+            + '},"id":' + self.encode_value(group.id)
+            + ',"relationships":{"breeds":{"data":['
+            + ",".join('{"id":' + self.encode_value(str(reference["id"])) + ',"type":"breed"}' for reference in references)
+            + ']}},"type":"group"}'
+        )
+
+    def encode_value(self, value: Any) -> str:
+        """Encodes a nested value; nested dataclasses keep their None fields."""
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return _encode_scalar(value)
+        if isinstance(value, RawJSON):
+            return value.fragment
+        if is_dataclass(value):
+            return self._encoder(type(value), False)(value)
+        if isinstance(value, dict):
+            return "{" + ",".join(
+                _encode_scalar(str(key)) + ":" + self.encode_value(value[key])
+                for key in sorted(value)
+            ) + "}"
+        if isinstance(value, (list, tuple)):
+            return "[" + ",".join(self.encode_value(item) for item in value) + "]"
+        return _encode_scalar(value)
+
+    @timed("serialize")
+    def encode_entity(self, entity: Any) -> str:
+        """Encodes a top-level entity, reusing its memoized fragment."""
+        return self._encode_entity(entity)
+
+    def _encode_entity(self, entity: Any) -> str:
+        fragment = self._memo.get(entity)
+        if fragment is None:
+            encode = self._passthrough.get(type(entity)) or self._encoder(type(entity), True)
+            fragment = encode(entity)
+            self._memo.put(entity, fragment)
+        return fragment
+
+    @timed("serialize")
+    def encode_entities(self, entities: Iterable[Any]) -> str:
+        return "[" + ",".join(self._encode_entity(entity) for entity in entities) + "]"
+
+    @timed("serialize")
+    def encode_envelope(self, **members: Any) -> bytes:
+        """Encodes a response envelope; RawJSON members are spliced in verbatim."""
+        return (self.encode_value(members) + "\n").encode("ascii")
+
+    def memo_stats(self) -> Dict[str, int]:
+        return {"entries": len(self._memo), "hits": self._memo.hits, "misses": self._memo.misses}
+
+
+serializer = JSONSerializer()
@@ -0,0 +1,320 @@
+"""
+Pre-forking production server.
+
+Usage:
+    python -m src.infrastructure.api.server [--bind 0.0.0.0:5000] [--workers N]
+
+The master process builds the app once, warms it (a snapshot repository
+crawls its catalog) and forks one worker per core, all accepting on one
+listening socket. Workers share what the master built copy-on-write, and
+fetched upstream responses through a SQLite cache on /dev/shm
+(DOG_API_RESPONSE_CACHE overrides the path); each worker gets an equal
+share of the upstream rate budget.
+
+Each worker records its own metrics and publishes them to a directory on
+/dev/shm (DOG_API_METRICS_DIR overrides the path) every second; whichever
+worker answers GET /metrics sums the counters and histograms of all of
+them, including workers that have exited, and reports gauges per worker
+with a `worker` label. Series from other workers can lag by up to a second.
+
+SIGHUP reloads gracefully: the master refreshes a stale snapshot, forks a
+new generation of workers and lets the old one finish its requests. A
+snapshot older than DOG_API_SNAPSHOT_REFRESH seconds triggers the same
+reload; while refreshing it fails, the master retries with exponential
+backoff, from 5 seconds up to 5 minutes. SIGTERM or SIGINT drains every worker and exits.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import tempfile
+import time
+from typing import Dict, Optional, Set
+
+from flask import Flask
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from src.application.ports.output.dog_repository import DogRepository
+from src.infrastructure.adapters.snapshot_dog_repository import SnapshotDogRepository
+from src.infrastructure.api.app import _build_repository, create_app
+from src.shared.utils.metrics import REGISTRY, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of signals, dead workers and snapshot age
+POLL_INTERVAL = 0.5
+# Seconds before retrying a failed snapshot refresh, doubled after each failure up to the maximum
+REFRESH_RETRY_INITIAL = 5.0
+REFRESH_RETRY_MAX = 300.0
+# Held back while forking, so a new worker never runs the master's handlers
+_CONTROL_SIGNALS = {signal.SIGTERM, signal.SIGINT, signal.SIGHUP}
+
+
+class _WorkerRequestHandler(WSGIRequestHandler):
+    # Idle keep-alive connections are closed after this long, so a draining worker is not held open by them
+    timeout = 5.0
+
+
+class PreforkServer:
+    """
+    Master process that forks `workers` processes serving `app` on one
+    socket, replaces workers that die, and reloads them without dropping
+    requests. Workers that outlive `graceful_timeout` while draining are
+    killed. A shared `metrics` registry gets the samples of exited workers
+    folded in.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        host: str = "0.0.0.0",
+        port: int = 5000,
+        workers: int = 1,
+        repository: Optional[DogRepository] = None,
+        graceful_timeout: float = 30.0,
+        backlog: int = 128,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        if workers < 1:
+            raise ValueError("PreforkServer: 'workers' must be at least 1")
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self._repository = repository
+        self._backlog = backlog
+        self._metrics = metrics
+        self._socket: Optional[socket.socket] = None
+        self._master_pid = os.getpid()
+        # Worker pid -> the time it was told to stop, None while it serves the current generation
+        self._children: Dict[int, Optional[float]] = {}
+        self._stopping = False
+        self._reload_requested = False
+        self._refresh_retry_delay = REFRESH_RETRY_INITIAL
+        self._refresh_retry_at = 0.0
+
+    def _listen(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self._backlog)
+        # Every worker polls this socket; the ones that lose the race for a connection must not block in accept()
+        sock.setblocking(False)
+        sock.set_inheritable(True)
+        self.port = sock.getsockname()[1]
+        return sock
+
+    def _refresh_snapshot(self, force: bool = False) -> bool:
+        """
+        Refreshes a stale snapshot in the master; returns whether workers
+        should be reloaded. After a failure, further attempts back off
+        exponentially unless `force`d (e.g. by SIGHUP).
+        """
+        if not isinstance(self._repository, SnapshotDogRepository):
+            return False
+        now = time.monotonic()
+        if not force and now < self._refresh_retry_at:
+            return False
+        try:
+            refreshed = self._repository.refresh_if_stale()
+        except Exception:
+            logger.warning(
+                "Catalog snapshot refresh failed; workers keep the current one, retrying in %.0fs",
+                self._refresh_retry_delay,
+                exc_info=True
+            )
+            self._refresh_retry_at = now + self._refresh_retry_delay
+            self._refresh_retry_delay = min(self._refresh_retry_delay * 2, REFRESH_RETRY_MAX)
+            return False
+        self._refresh_retry_delay = REFRESH_RETRY_INITIAL
+        self._refresh_retry_at = 0.0
+        return refreshed
+
+    def _serving(self) -> Set[int]:
+        return {pid for pid, retired_at in self._children.items() if retired_at is None}
+
+    def _spawn(self, count: int) -> None:
+        # Objects built so far move out of the collector's reach, so workers touching them don't copy their pages
+        gc.collect()
+        gc.freeze()
+        signal.pthread_sigmask(signal.SIG_BLOCK, _CONTROL_SIGNALS)
+        try:
+            for _ in range(count):
+                pid = os.fork()
+                if pid == 0:
+                    self._run_worker()
+                self._children[pid] = None
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, _CONTROL_SIGNALS)
+            # The master keeps collecting, e.g. the snapshots a refresh replaces
+            gc.unfreeze()
+
+    def _run_worker(self) -> None:
+        """Serves requests in a forked worker until told to stop; never returns."""
+        status = 0
+        try:
+            stopping = []
+            signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+            # Ctrl+C and reloads are the master's to handle
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, _CONTROL_SIGNALS)
+
+            server = make_server(
+                self.host,
+                self.port,
+                self.app,
+                threaded=True,
+                request_handler=_WorkerRequestHandler,
+                fd=self._socket.fileno()
+            )
+            # server_close() then waits for the requests in progress
+            server.daemon_threads = False
+            server.block_on_close = True
+            server.timeout = POLL_INTERVAL
+            while not stopping and os.getppid() == self._master_pid:
+                server.handle_request()
+            server.server_close()
+            if self._metrics is not None:
+                # Its final counts, for the master to fold in once it exits
+                self._metrics.publish()
+        except BaseException:
+            logger.exception("Worker %d failed", os.getpid())
+            status = 1
+        finally:
+            # Skips the master's atexit handlers and buffered output, which are not this process's
+            os._exit(status)
+
+    def _retire(self, pids: Set[int]) -> None:
+        now = time.monotonic()
+        for pid in pids:
+            self._children[pid] = now
+            self._signal(pid, signal.SIGTERM)
+
+    def _signal(self, pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self) -> None:
+        """Collects exited workers and replaces the ones that stopped while serving."""
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._children.clear()
+                return
+            if pid == 0:
+                break
+            if self._metrics is not None:
+                self._metrics.retire(pid)
+            # None: it was serving the current generation, not draining
+            if self._children.pop(pid, False) is None and not self._stopping:
+                logger.warning("Worker %d exited unexpectedly (status %d); replacing it", pid, status)
+                self._spawn(1)
+
+        deadline = time.monotonic() - self.graceful_timeout
+        for pid, retired_at in self._children.items():
+            if retired_at is not None and retired_at < deadline:
+                logger.warning("Worker %d did not drain within %.0fs; killing it", pid, self.graceful_timeout)
+                self._signal(pid, signal.SIGKILL)
+
+    def _reload(self) -> None:
+        """Forks a new generation of workers, then drains the previous one."""
+        previous = self._serving()
+        self._spawn(self.workers)
+        self._retire(previous)
+        logger.info("Reloaded %d workers", self.workers)
+
+    def _on_reload(self, signum, frame) -> None:
+        self._reload_requested = True
+
+    def _on_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def run(self) -> None:
+        """Binds, warms up, forks the workers and supervises them until SIGTERM/SIGINT."""
+        self._socket = self._listen()
+        self._refresh_snapshot()
+        signal.signal(signal.SIGHUP, self._on_reload)
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+
+        self._spawn(self.workers)
+        logger.info("Serving on %s:%d with %d workers", self.host, self.port, self.workers)
+        try:
+            while not self._stopping:
+                time.sleep(POLL_INTERVAL)
+                if self._metrics is not None:
+                    # What the master records, e.g. snapshot refreshes, counts too
+                    self._metrics.publish()
+                self._reap()
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self._refresh_snapshot(force=True)
+                    self._reload()
+                elif self._refresh_snapshot():
+                    self._reload()
+        finally:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        self._stopping = True
+        self._retire(self._serving())
+        while self._children:
+            time.sleep(POLL_INTERVAL / 5)
+            self._reap()
+        self._socket.close()
+        logger.info("Stopped")
+
+
+def _shared_cache_path(port: int) -> str:
+    """Response cache file on tmpfs when the host has one, so it lives in shared memory."""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"dogapi-responses-{port}.sqlite3")
+
+
+def _shared_metrics_dir(port: int) -> str:
+    """Directory the workers publish their metrics to, on tmpfs when the host has one."""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.environ.get("DOG_API_METRICS_DIR", "").strip() or os.path.join(directory, f"dogapi-metrics-{port}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bind", default=os.environ.get("DOG_API_BIND", "0.0.0.0:5000"), help="host:port")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("DOG_API_WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--graceful-timeout", type=float, default=30.0, help="seconds a stopping worker may take to drain")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(process)d %(levelname)s %(name)s: %(message)s")
+
+    host, _, port = args.bind.rpartition(":")
+    if os.environ.get("DOG_API_MODE", "sync").lower() == "async":
+        # The async stack's event loop thread cannot be carried across a fork
+        logger.warning("DOG_API_MODE=async is not supported by the pre-fork server; serving the sync stack")
+
+    dog_repository, fact_pool = _build_repository(
+        rate_share=1 / args.workers,
+        background_refresh=False,
+        default_response_cache=_shared_cache_path(int(port))
+    )
+    REGISTRY.share(_shared_metrics_dir(int(port)))
+    PreforkServer(
+        create_app(dog_repository, fact_pool),
+        host=host.strip("[]") or "0.0.0.0",
+        port=int(port),
+        workers=args.workers,
+        repository=dog_repository,
+        graceful_timeout=args.graceful_timeout,
+        metrics=REGISTRY
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+from flask import Flask, Response, g
+
+from src.shared.utils.timing import start_timings, stop_timings
+
+# Spans reported in Server-Timing, in order; 'route' is the time outside all other spans
+SERVER_TIMING_SPANS = ("route", "controller", "service", "upstream", "parse", "serialize")
+
+
+class ServerTiming:
+    """
+    Adds a Server-Timing header splitting each request into the spans
+    opened by the controllers, services and upstream clients.
+
+    Each span reports its self time, so nested spans are not counted twice;
+    'total' is the wall time from before_request to the header being set.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        app.before_request(self._start)
+        app.after_request(self._add_header)
+        app.teardown_request(self._stop)
+
+    @staticmethod
+    def _start() -> None:
+        g.request_timings = start_timings("route")
+
+    @staticmethod
+    def _add_header(response: Response) -> Response:
+        timings = g.pop("request_timings", None)
+        if timings is None:
+            return response
+        totals = timings.finish()
+        entries = [f"{name};dur={totals[name] * 1000:.3f}" for name in SERVER_TIMING_SPANS if name in totals]
+        entries.append(f"total;dur={totals['total'] * 1000:.3f}")
+        response.headers["Server-Timing"] = ", ".join(entries)
+        return response
+
+    @staticmethod
+    def _stop(error: BaseException = None) -> None:
+        stop_timings()
@@ -0,0 +1,165 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from src.application.ports.output.async_dog_repository import AsyncDogRepository
+from src.domain.entities.breed import Breed
+from src.domain.entities.fact import Fact
+from src.domain.entities.group import Group
+from src.domain.entities.pagination import PaginationParams, SearchParams, PaginatedResponse
+from src.infrastructure.adapters.external_api_base import ExternalAPIBase
+from src.infrastructure.external.dog_api.instrumentation import PARSE_LATENCY, instrument_resilience
+from src.infrastructure.external.dog_api.mappers import parse_fact, parse_resource, total_from_meta
+from src.infrastructure.external.dog_api.resilience import BreakerStats, CircuitBreaker, ResilienceStats, ResilientCaller, RetryPolicy
+from src.shared.exceptions.api_exception import APIException
+from src.shared.utils.rate_limiter import PriorityTokenBucket, RateLimiterStats
+from src.shared.utils.timing import span
+
+
+class AsyncDogAPIClient(ExternalAPIBase[Any], AsyncDogRepository):
+    BASE_URL = "https://dogapi.dog/api/v2"
+
+    def __init__(
+        self,
+        pool_size: int = 100,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+        fan_out_limit: int = 16,
+        call_timeout: float = 10.0,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge_percentile: Optional[float] = None,
+        rate_limit: Optional[float] = 20.0,
+        rate_burst: Optional[float] = None
+    ):
+        super().__init__(
+            self.BASE_URL,
+            pool_size=pool_size,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            resilience=ResilientCaller(
+                breaker=breaker or CircuitBreaker(name="dogapi"),
+                retry=retry,
+                timeout=call_timeout,
+                hedge_percentile=hedge_percentile,
+                limiter=PriorityTokenBucket(rate_limit, rate_burst) if rate_limit else None
+            )
+        )
+        self._fan_out_limit = fan_out_limit
+        instrument_resilience(self._resilience)
+
+    def breaker_stats(self) -> BreakerStats:
+        """Returns the upstream circuit breaker state and its transition counters."""
+        return self._resilience.breaker.stats()
+
+    def resilience_stats(self) -> ResilienceStats:
+        """Returns the retry, hedging and deadline counters of upstream calls."""
+        return self._resilience.stats()
+
+    def rate_limiter_stats(self) -> Optional[RateLimiterStats]:
+        """Returns the upstream request budget counters, or None when no budget is enforced."""
+        return self._limiter.stats() if self._limiter else None
+
+    def _parse_response(self, data: Dict[str, Any]) -> Any:
+        """Converts a JSON:API resource into a Breed, Group or Fact."""
+        started = time.perf_counter()
+        with span("parse"):
+            entity = parse_resource(data)
+        PARSE_LATENCY.labels(type(entity).__name__.lower()).observe(time.perf_counter() - started)
+        return entity
+
+    def _build_pagination_params(self, params: PaginationParams) -> Dict[str, Any]:
+        return {"page[number]": params.page, "page[size]": params.page_size}
+
+    def _build_search_params(self, params: SearchParams) -> Dict[str, Any]:
+        return {"filter[search]": params.query} if params.query else {}
+
+    def _extract_items(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return data.get("data", [])
+
+    def _extract_total(self, data: Dict[str, Any], items: List[Any]) -> int:
+        return total_from_meta(data.get("meta") or {}, len(items))
+
+    async def get_breeds(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Breed]:
+        """Get all dog breeds with pagination and search; filters and sorting need the sync cached or snapshot stack."""
+        if (search and search.filters) or pagination.sort_by:
+            raise APIException("Breed filters and sorting are not available with DOG_API_MODE=async")
+        return await self.get_all("breeds", pagination, search)
+
+    async def get_breed_by_id(self, breed_id: str) -> Optional[Breed]:
+        """Get a specific breed by its ID."""
+        return await self.get_by_id("breeds", breed_id)
+
+    async def get_facts(self, limit: Optional[int] = None) -> List[Fact]:
+        """Get interesting facts about dogs."""
+        data = await self.get_json("facts", {"limit": limit} if limit else None)
+        with span("parse"):
+            return [parse_fact(fact) for fact in (data or {}).get("data", [])]
+
+    async def get_groups(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Group]:
+        """Get all breed groups with pagination and search."""
+        return await self.get_all("groups", pagination, search)
+
+    async def get_group_by_id(self, group_id: str) -> Optional[Group]:
+        """Get a specific group by its ID."""
+        return await self.get_by_id("groups", group_id)
+
+    async def get_group_details(self, group_id: str) -> Optional[Group]:
+        """Get complete details of a group."""
+        return await self.get_group_by_id(group_id)
+
+    async def get_breed_in_group(self, group_id: str, breed_id: str) -> Optional[Breed]:
+        """Get a specific breed within a group, fetching the group and the breed concurrently."""
+        group, breed = await asyncio.gather(
+            self.get_group_details(group_id),
+            self.get_breed_by_id(breed_id)
+        )
+        if not group or not group.relationships or not group.relationships.breeds:
+            return None
+
+        breed_ids = [reference.id for reference in group.relationships.breeds.get("data", [])]
+        if str(breed_id) not in breed_ids:
+            return None
+
+        return breed
+
+    async def get_group_breeds(self, group_id: str, pagination: PaginationParams) -> Optional[PaginatedResponse[Breed]]:
+        """Get the breeds of a group, resolving the requested page concurrently."""
+        group = await self.get_group_details(group_id)
+        if not group:
+            return None
+
+        references = group.relationships.breeds.get("data", []) if group.relationships else []
+        start_idx = (pagination.page - 1) * pagination.page_size
+        page_references = references[start_idx:start_idx + pagination.page_size]
+
+        semaphore = asyncio.Semaphore(self._fan_out_limit)
+
+        async def fetch(reference_id: str) -> Optional[Breed]:
+            async with semaphore:
+                return await self.get_breed_by_id(reference_id)
+
+        breeds = await asyncio.gather(*(fetch(reference.id) for reference in page_references))
+        return PaginatedResponse.create(
+            items=[breed for breed in breeds if breed],
+            total=len(references),
+            params=pagination
+        )
+
+    async def _get_many(self, fetch, ids: List[str]) -> Dict[str, Any]:
+        semaphore = asyncio.Semaphore(self._fan_out_limit)
+
+        async def fetch_one(item_id: str) -> Any:
+            async with semaphore:
+                return await fetch(item_id)
+
+        results = await asyncio.gather(*(fetch_one(item_id) for item_id in ids))
+        return dict(zip(ids, results))
+
+    async def get_breeds_by_ids(self, breed_ids: List[str]) -> Dict[str, Optional[Breed]]:
+        """Get several breeds by ID concurrently."""
+        return await self._get_many(self.get_breed_by_id, breed_ids)
+
+    async def get_groups_by_ids(self, group_ids: List[str]) -> Dict[str, Optional[Group]]:
+        """Get several groups by ID concurrently."""
+        return await self._get_many(self.get_group_by_id, group_ids)
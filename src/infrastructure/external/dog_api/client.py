@@ -1,28 +1,128 @@
+import http.client
 import json
-import urllib.error
+import logging
+import time
 import urllib.parse
-import urllib.request
 from typing import Dict, List, Optional, Any
 
 from src.application.ports.output.dog_repository import DogRepository
-from src.domain.entities.breed import Breed, BreedAttributes, LifeSpan, WeightRange, BreedRelationships, GroupRelationship, BreedLinks
-from src.domain.entities.fact import Fact, FactAttributes
-from src.domain.entities.group import Group, GroupAttributes, GroupRelationships, BreedReference
+from src.domain.entities.breed import Breed
+from src.domain.entities.fact import Fact
+from src.domain.entities.group import Group
 from src.domain.entities.pagination import PaginationParams, SearchParams, PaginatedResponse
-from src.shared.exceptions.api_exception import APIException
+from src.infrastructure.external.dog_api.http_pool import HTTPConnectionPool, HTTPResult, PoolExhausted, PoolStats
+from src.infrastructure.external.dog_api.instrumentation import (
+    PARSE_LATENCY, UPSTREAM_LATENCY, instrument_resilience, upstream_endpoint, upstream_outcome
+)
+from src.infrastructure.external.dog_api.mappers import parse_breed, parse_fact, parse_group, total_from_meta
+from src.infrastructure.external.dog_api.resilience import BreakerStats, CircuitBreaker, ResilienceStats, ResilientCaller, RetryPolicy
+from src.infrastructure.storage.response_store import PersistentResponseCache, ResponseStoreStats
+from src.shared.exceptions.api_exception import APIException, UpstreamError, UpstreamTimeout, UpstreamUnavailable
+from src.shared.utils.fan_out import FanOut
+from src.shared.utils.rate_limiter import (
+    DEFAULT, INTERACTIVE, PriorityTokenBucket, RateLimiterStats, current_priority
+)
+from src.shared.utils.single_flight import SingleFlight, SingleFlightStats
+from src.shared.utils.timing import span
 
+logger = logging.getLogger(__name__)
 
 class DogAPIClient(DogRepository):
     BASE_URL = "https://dogapi.dog/api/v2"
 
-    def __init__(self):
+    # Seconds a persisted response stays fresh, by endpoint; endpoints not listed are not persisted
+    DEFAULT_RESPONSE_TTLS: Dict[str, float] = {
+        "breeds": 3600.0,
+        "breeds/{id}": 3600.0,
+        "groups": 3600.0,
+        "groups/{id}": 3600.0,
+        "facts": 60.0,
+    }
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+        fan_out_workers: int = 8,
+        call_timeout: float = 10.0,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge_percentile: Optional[float] = None,
+        rate_limit: Optional[float] = 20.0,
+        rate_burst: Optional[float] = None,
+        response_cache: Optional[PersistentResponseCache] = None,
+        response_ttls: Optional[Dict[str, float]] = None,
+        stale_if_error_ttl: float = 86400.0
+    ):
         self._headers = {
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Connection": "keep-alive"
         }
+        self._pool = HTTPConnectionPool(
+            self.BASE_URL,
+            max_size=pool_size,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout
+        )
+        # Upstream request budget; every attempt, retries and hedges included, takes a token
+        self._limiter = PriorityTokenBucket(rate_limit, rate_burst) if rate_limit else None
+        self._resilience = ResilientCaller(
+            breaker=breaker or CircuitBreaker(name="dogapi"),
+            retry=retry,
+            timeout=call_timeout,
+            hedge_percentile=hedge_percentile,
+            hedge_workers=pool_size,
+            limiter=self._limiter
+        )
+        instrument_resilience(self._resilience)
+        # Raw GET responses persisted across restarts and shared with the other workers
+        self._response_cache = response_cache
+        self._response_ttls = {**self.DEFAULT_RESPONSE_TTLS, **(response_ttls or {})}
+        self._stale_if_error_ttl = stale_if_error_ttl
+        self._in_flight = SingleFlight()
+        self._fan_out = FanOut(max_workers=fan_out_workers, name="dog-api-fan-out")
+
+    def pool_stats(self) -> PoolStats:
+        """Returns the upstream connection pool counters."""
+        return self._pool.stats()
+
+    def close(self) -> None:
+        """Closes the idle upstream connections."""
+        self._pool.close()
+
+    def coalescing_stats(self) -> SingleFlightStats:
+        """Returns how many upstream calls were executed and how many were collapsed into them."""
+        return self._in_flight.stats()
+
+    def breaker_stats(self) -> BreakerStats:
+        """Returns the upstream circuit breaker state and its transition counters."""
+        return self._resilience.breaker.stats()
 
-    def _make_request(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None, params: Optional[Dict] = None) -> Any:
-        """Makes an HTTP request to the API."""
-        url = f"{self.BASE_URL}/{endpoint}"
+    def resilience_stats(self) -> ResilienceStats:
+        """Returns the retry, hedging and deadline counters of upstream calls."""
+        return self._resilience.stats()
+
+    def rate_limiter_stats(self) -> Optional[RateLimiterStats]:
+        """Returns the upstream request budget counters, or None when no budget is enforced."""
+        return self._limiter.stats() if self._limiter else None
+
+    def response_cache_stats(self) -> Optional[ResponseStoreStats]:
+        """Returns the persistent response cache counters, or None when responses are not persisted."""
+        return self._response_cache.stats() if self._response_cache else None
+
+    def _make_request(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        priority: int = DEFAULT
+    ) -> Any:
+        """Makes an HTTP request to the API; `priority` applies unless the caller set one (e.g. background refresh)."""
+        priority = current_priority(priority)
+        path = endpoint
         
         api_params = {}
         if params:
@@ -35,114 +135,117 @@ class DogAPIClient(DogRepository):
         
         if api_params:
             query_string = urllib.parse.urlencode(api_params)
-            url = f"{url}?{query_string}"
-        
-        req = urllib.request.Request(
-            url,
-            method=method,
-            headers=self._headers,
-            data=json.dumps(data).encode() if data else None
-        )
+            path = f"{path}?{query_string}"
+
+        with span("upstream"):
+            if method == "GET" and not data:
+                # Concurrent identical GETs share one upstream round trip; keyed on priority too, so
+                # an interactive caller never joins a background call still queued for its token
+                return self._in_flight.do((method, path, priority), lambda: self._get(path, priority))
+            return self._decode(self._send_request(method, path, data, priority).body)
+
+    def _get(self, path: str, priority: int) -> Any:
+        """GETs `path`, answering from the persistent response cache while its copy is fresh."""
+        ttl = self._response_ttls.get(upstream_endpoint(path)) if self._response_cache else None
+        if not ttl:
+            return self._decode(self._send_request("GET", path, priority=priority).body)
 
+        stored = self._response_cache.get(path)
+        if stored is not None and stored.is_fresh(self._response_cache.now()):
+            return self._decode(stored.body)
         try:
-            with urllib.request.urlopen(req) as response:
-                return json.loads(response.read().decode())
-        except urllib.error.HTTPError as e:
-            raise APIException(f"API Error: {e.code} - {e.reason}")
-        except urllib.error.URLError as e:
-            raise APIException(f"Connection Error: {str(e)}")
-        except json.JSONDecodeError as e:
-            raise APIException(f"Error decoding response: {str(e)}")
+            response = self._send_request("GET", path, priority=priority)
+        except UpstreamError as e:
+            if (
+                stored is None
+                or e.upstream_status == 404
+                or self._response_cache.now() >= stored.expires_at + self._stale_if_error_ttl
+            ):
+                raise
+            logger.info("Upstream failing (%s); serving persisted response for %s", e, path)
+            return self._decode(stored.body)
+        self._response_cache.put(path, response.body, ttl)
+        return self._decode(response.body)
 
-    def _parse_breed(self, data: Dict) -> Breed:
-        """Converts API data into a Breed entity."""
-        breed_data = data.get("data", data)
-        
-        attributes = BreedAttributes(
-            name=breed_data["attributes"]["name"],
-            description=breed_data["attributes"].get("description"),
-            life=LifeSpan(
-                min=breed_data["attributes"]["life"]["min"],
-                max=breed_data["attributes"]["life"]["max"]
-            ) if breed_data["attributes"].get("life") else None,
-            male_weight=WeightRange(
-                min=breed_data["attributes"]["male_weight"]["min"],
-                max=breed_data["attributes"]["male_weight"]["max"]
-            ) if breed_data["attributes"].get("male_weight") else None,
-            female_weight=WeightRange(
-                min=breed_data["attributes"]["female_weight"]["min"],
-                max=breed_data["attributes"]["female_weight"]["max"]
-            ) if breed_data["attributes"].get("female_weight") else None,
-            hypoallergenic=breed_data["attributes"].get("hypoallergenic", False),
-           
-        )
+    def _attempt_request(self, method: str, path: str, body: Optional[bytes], time_left: float) -> HTTPResult:
+        """Sends one attempt over the connection pool, mapping failures to upstream errors."""
+        try:
+            response = self._pool.request(
+                method,
+                path,
+                headers=self._headers,
+                body=body,
+                timeout=time_left,
+                read_timeout=time_left
+            )
+        except PoolExhausted as e:
+            # Every pooled connection stayed busy; not a sign of upstream trouble
+            raise UpstreamUnavailable(f"No upstream connection available: {str(e)}", retryable=False)
+        except TimeoutError:
+            raise UpstreamTimeout("Upstream timed out")
+        except (OSError, http.client.HTTPException) as e:
+            raise UpstreamError(f"Connection Error: {str(e)}")
+
+        if response.status == 429 and self._limiter is not None:
+            self._limiter.pause(self._retry_after_seconds(response))
+        if response.status >= 400:
+            raise UpstreamError(
+                f"API Error: {response.status} - {response.reason}",
+                upstream_status=response.status,
+                retryable=response.status >= 500 or response.status == 429
+            )
+        return response
+
+    @staticmethod
+    def _retry_after_seconds(response: HTTPResult, default: float = 1.0) -> float:
+        try:
+            return float(response.headers.get("retry-after", default))
+        except ValueError:
+            return default
 
-        relationships = None
-        if "relationships" in breed_data and "group" in breed_data["relationships"]:
-            group_data = breed_data["relationships"]["group"]["data"]
-            relationships = BreedRelationships(
-                group=GroupRelationship(id=group_data["id"])
+    def _send_request(self, method: str, path: str, data: Optional[Dict] = None, priority: int = DEFAULT) -> HTTPResult:
+        """Sends the request through the resilience layer."""
+        body = json.dumps(data).encode() if data else None
+        started = time.perf_counter()
+        try:
+            response = self._resilience.call(
+                lambda time_left: self._attempt_request(method, path, body, time_left),
+                idempotent=method in ("GET", "HEAD"),
+                priority=priority
             )
+        except Exception as e:
+            UPSTREAM_LATENCY.labels(upstream_endpoint(path), upstream_outcome(e)).observe(time.perf_counter() - started)
+            raise
+        UPSTREAM_LATENCY.labels(upstream_endpoint(path), str(response.status)).observe(time.perf_counter() - started)
+        return response
 
-        links = None
-        if "links" in data:
-            links = BreedLinks(self=data["links"]["self"])
+    @staticmethod
+    def _decode(body: bytes) -> Any:
+        try:
+            return json.loads(body.decode())
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise UpstreamError(f"Error decoding response: {str(e)}", retryable=False)
 
-        return Breed(
-            id=breed_data["id"],
-            attributes=attributes,
-            relationships=relationships,
-            links=links
-        )
+    def _parse_breed(self, data: Dict) -> Breed:
+        """Converts API data into a Breed entity."""
+        started = time.perf_counter()
+        with span("parse"):
+            breed = parse_breed(data)
+        PARSE_LATENCY.labels("breed").observe(time.perf_counter() - started)
+        return breed
 
     def _parse_group(self, data: Dict) -> Group:
         """Converts API data into a Group entity."""
-        group_data = data.get("data", data)
-        attributes = group_data.get("attributes", {})
-        relationships = group_data.get("relationships", {})
-        
-        return Group(
-            id=str(group_data["id"]),
-            attributes=GroupAttributes(
-                name=attributes["name"]
-            ),
-            relationships=GroupRelationships(
-                breeds={
-                    "data": [
-                        BreedReference(id=str(breed["id"]))
-                        for breed in relationships.get("breeds", {}).get("data", [])
-                    ]
-                }
-            )
-        )
+        started = time.perf_counter()
+        with span("parse"):
+            group = parse_group(data)
+        PARSE_LATENCY.labels("group").observe(time.perf_counter() - started)
+        return group
 
     def _parse_fact(self, data: Dict) -> Fact:
         """Converts API data into a Fact entity."""
-        fact_data = data.get("data", data)
-        attributes = fact_data.get("attributes", {})
-        
-        return Fact(
-            id=str(fact_data["id"]),
-            type=fact_data["type"],
-            attributes=FactAttributes(
-                body=attributes["body"]
-            )
-        )
-
-    def _filter_items(self, items: List[Any], search: Optional[SearchParams]) -> List[Any]:
-        """Filters items according to search parameters."""
-        if not search or not search.query:
-            return items
-        
-        query = search.query.lower()
-        return [
-            item for item in items
-            if any(
-                str(value).lower().find(query) != -1
-                for value in item.__dict__.values()
-                if value is not None
-            )
-        ]
+        with span("parse"):
+            return parse_fact(data)
 
     def _paginate_items(self, items: List[Any], pagination: PaginationParams) -> PaginatedResponse[Any]:
         """Paginates items according to pagination parameters."""
@@ -157,7 +260,15 @@ class DogAPIClient(DogRepository):
         )
 
     def get_breeds(self, pagination: PaginationParams, search: Optional[SearchParams] = None) -> PaginatedResponse[Breed]:
-        """Get all dog breeds with pagination and search."""
+        """
+        Get all dog breeds with pagination and search. The search is the
+        upstream's filter[search]; CachingDogRepository and
+        SnapshotDogRepository rank searches with their own index instead,
+        and are the ones that can filter and sort.
+        """
+        if (search and search.filters) or pagination.sort_by:
+            # The upstream has neither
+            raise APIException("Breed filters and sorting require DOG_API_REPOSITORY=cached or snapshot")
         params = {
             "page": pagination.page,
             "page_size": pagination.page_size
@@ -175,7 +286,7 @@ class DogAPIClient(DogRepository):
         if meta:
             return PaginatedResponse.create(
                 items=breeds,
-                total=meta.get("total", len(breeds)),
+                total=total_from_meta(meta, len(breeds)),
                 params=pagination
             )
 
@@ -184,16 +295,16 @@ class DogAPIClient(DogRepository):
     def get_breed_by_id(self, breed_id: str) -> Optional[Breed]:
         """Get a specific breed by its ID."""
         try:
-            response = self._make_request(f"breeds/{breed_id}")
+            response = self._make_request(f"breeds/{breed_id}", priority=INTERACTIVE)
             return self._parse_breed(response)
-        except APIException as e:
-            if "404" in str(e):
+        except UpstreamError as e:
+            if e.upstream_status == 404:
                 return None
             raise
 
-    def get_facts(self) -> List[Fact]:
+    def get_facts(self, limit: Optional[int] = None) -> List[Fact]:
         """Get interesting facts about dogs."""
-        response = self._make_request("facts")
+        response = self._make_request("facts", params={"limit": limit} if limit else None)
         facts_data = response.get("data", [])
         return [self._parse_fact(fact) for fact in facts_data]
 
@@ -216,7 +327,7 @@ class DogAPIClient(DogRepository):
         if meta:
             return PaginatedResponse.create(
                 items=groups,
-                total=meta.get("total", len(groups)),
+                total=total_from_meta(meta, len(groups)),
                 params=pagination
             )
         
@@ -225,10 +336,10 @@ class DogAPIClient(DogRepository):
     def get_group_by_id(self, group_id: str) -> Optional[Group]:
         """Get a specific group by its ID."""
         try:
-            response = self._make_request(f"groups/{group_id}")
+            response = self._make_request(f"groups/{group_id}", priority=INTERACTIVE)
             return self._parse_group(response)
-        except APIException as e:
-            if "404" in str(e):
+        except UpstreamError as e:
+            if e.upstream_status == 404:
                 return None
             raise
 
@@ -237,13 +348,43 @@ class DogAPIClient(DogRepository):
         return self.get_group_by_id(group_id)
 
     def get_breed_in_group(self, group_id: str, breed_id: str) -> Optional[Breed]:
-        """Get a specific breed within a group."""
-        group = self.get_group_details(group_id)
+        """Get a specific breed within a group, fetching the group and the breed concurrently."""
+        group_future = self._fan_out.submit(self.get_group_details, group_id)
+        breed_future = self._fan_out.submit(self.get_breed_by_id, breed_id)
+
+        group = group_future.result()
         if not group or not group.relationships or not group.relationships.breeds:
+            breed_future.cancel()
             return None
-            
+
         breed_ids = [breed.id for breed in group.relationships.breeds.get("data", [])]
         if str(breed_id) not in breed_ids:
+            breed_future.cancel()
             return None
-            
-        return self.get_breed_by_id(breed_id) 
\ No newline at end of file
+
+        return breed_future.result()
+
+    def get_group_breeds(self, group_id: str, pagination: PaginationParams) -> Optional[PaginatedResponse[Breed]]:
+        """Get the breeds of a group, resolving the requested page concurrently."""
+        group = self.get_group_details(group_id)
+        if not group:
+            return None
+
+        references = group.relationships.breeds.get("data", []) if group.relationships else []
+        start_idx = (pagination.page - 1) * pagination.page_size
+        page_references = references[start_idx:start_idx + pagination.page_size]
+
+        breeds = self._fan_out.map(lambda reference: self.get_breed_by_id(reference.id), page_references)
+        return PaginatedResponse.create(
+            items=[breed for breed in breeds if breed],
+            total=len(references),
+            params=pagination
+        )
+
+    def get_breeds_by_ids(self, breed_ids: List[str]) -> Dict[str, Optional[Breed]]:
+        """Get several breeds by ID concurrently."""
+        return dict(zip(breed_ids, self._fan_out.map(self.get_breed_by_id, breed_ids)))
+
+    def get_groups_by_ids(self, group_ids: List[str]) -> Dict[str, Optional[Group]]:
+        """Get several groups by ID concurrently."""
+        return dict(zip(group_ids, self._fan_out.map(self.get_group_by_id, group_ids)))
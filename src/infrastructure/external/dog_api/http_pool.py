@@ -0,0 +1,216 @@
+import http.client
+import queue
+import threading
+import urllib.parse
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from src.shared.utils.forking import reinit_after_fork
+
+
+@dataclass
+class PoolStats:
+    opened: int = 0
+    reused: int = 0
+    closed: int = 0
+    idle: int = 0
+    in_use: int = 0
+    max_size: int = 0
+
+
+class PoolExhausted(TimeoutError):
+    """No pooled connection became free in time."""
+
+
+@dataclass
+class HTTPResult:
+    status: int
+    reason: str
+    body: bytes
+    headers: Dict[str, str]
+
+
+class HTTPConnectionPool:
+    """Thread-safe pool of persistent HTTP/1.1 connections to a single host."""
+
+    # Errors that mean a reused keep-alive connection was closed by the server
+    _STALE_ERRORS = (
+        http.client.RemoteDisconnected,
+        http.client.BadStatusLine,
+        ConnectionResetError,
+        BrokenPipeError,
+    )
+
+    def __init__(
+        self,
+        base_url: str,
+        max_size: int = 10,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0
+    ):
+        parsed = urllib.parse.urlsplit(base_url)
+        if parsed.scheme not in ("http", "https"):
+            raise ValueError(f"HTTPConnectionPool: unsupported scheme '{parsed.scheme}'")
+        if max_size < 1:
+            raise ValueError("HTTPConnectionPool: 'max_size' must be at least 1")
+
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.max_size = max_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._stats = PoolStats(max_size=max_size)
+        reinit_after_fork(self, "_after_fork")
+
+    def _after_fork(self) -> None:
+        """Gives a forked child its own connections; the inherited ones stay open in the parent."""
+        inherited, self._idle = self._idle, queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._stats = PoolStats(max_size=self.max_size)
+        while True:
+            try:
+                # Only closes this process's descriptor; the parent's keep-alive connection is untouched
+                inherited.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        """Opens a new connection using the connect timeout, then switches to the read timeout."""
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(self.host, self.port, timeout=self.connect_timeout)
+        connection.connect()
+        connection.sock.settimeout(self.read_timeout)
+        with self._lock:
+            self._stats.opened += 1
+        return connection
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """Takes an idle connection if there is one, otherwise opens a new one."""
+        try:
+            connection = self._idle.get_nowait()
+            return connection, True
+        except queue.Empty:
+            return self._new_connection(), False
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        self._idle.put(connection)
+
+    def _discard(self, connection: http.client.HTTPConnection) -> None:
+        connection.close()
+        with self._lock:
+            self._stats.closed += 1
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None
+    ) -> HTTPResult:
+        """
+        Sends a request over a pooled connection and reads the whole response.
+
+        Blocks for up to `timeout` (default: connect timeout) waiting for a free slot
+        when all `max_size` connections are in use. `read_timeout` overrides the
+        pool's socket read timeout for this request.
+        """
+        wait = self.connect_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=wait):
+            raise PoolExhausted("HTTPConnectionPool: no connection available")
+
+        with self._lock:
+            self._stats.in_use += 1
+        try:
+            return self._send(method, f"{self.base_path}/{path.lstrip('/')}", headers or {}, body, read_timeout)
+        finally:
+            with self._lock:
+                self._stats.in_use -= 1
+            self._slots.release()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[bytes],
+        read_timeout: Optional[float] = None
+    ) -> HTTPResult:
+        connection, reused = self._acquire()
+        try:
+            response, data = self._roundtrip(connection, method, url, headers, body, read_timeout)
+        except self._STALE_ERRORS:
+            self._discard(connection)
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry once on a fresh one
+            connection, reused = self._new_connection(), False
+            try:
+                response, data = self._roundtrip(connection, method, url, headers, body, read_timeout)
+            except BaseException:
+                self._discard(connection)
+                raise
+        except BaseException:
+            self._discard(connection)
+            raise
+
+        if reused:
+            with self._lock:
+                self._stats.reused += 1
+
+        if response.will_close:
+            self._discard(connection)
+        else:
+            self._release(connection)
+
+        return HTTPResult(
+            status=response.status,
+            reason=response.reason,
+            body=data,
+            headers={k.lower(): v for k, v in response.getheaders()}
+        )
+
+    def _roundtrip(
+        self,
+        connection: http.client.HTTPConnection,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[bytes],
+        read_timeout: Optional[float] = None
+    ) -> Tuple[http.client.HTTPResponse, bytes]:
+        if connection.sock is not None:
+            connection.sock.settimeout(self.read_timeout if read_timeout is None else min(read_timeout, self.read_timeout))
+        connection.request(method, url, body=body, headers=headers)
+        response = connection.getresponse()
+        # The body must be fully read before the connection can be reused
+        return response, response.read()
+
+    def stats(self) -> PoolStats:
+        """Returns a snapshot of the pool counters."""
+        with self._lock:
+            return PoolStats(
+                opened=self._stats.opened,
+                reused=self._stats.reused,
+                closed=self._stats.closed,
+                idle=self._idle.qsize(),
+                in_use=self._stats.in_use,
+                max_size=self.max_size
+            )
+
+    def close(self) -> None:
+        """Closes every idle connection."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
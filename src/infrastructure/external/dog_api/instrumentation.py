@@ -0,0 +1,80 @@
+from typing import Dict
+
+from src.infrastructure.external.dog_api.resilience import CLOSED, HALF_OPEN, OPEN, ResilientCaller
+from src.shared.exceptions.api_exception import UpstreamError, UpstreamTimeout, UpstreamUnavailable
+from src.shared.utils.metrics import REGISTRY
+
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "dogapi_upstream_request_duration_seconds",
+    "Time spent on upstream calls, retries included, by endpoint and outcome",
+    ("endpoint", "status")
+)
+PARSE_LATENCY = REGISTRY.histogram(
+    "dogapi_upstream_parse_duration_seconds",
+    "Time spent mapping upstream JSON to entities, by entity",
+    ("entity",),
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)
+)
+BREAKER_TRANSITIONS = REGISTRY.counter(
+    "dogapi_upstream_breaker_transitions_total",
+    "Circuit breaker state changes, by breaker and states",
+    ("breaker", "from", "to")
+)
+BREAKER_STATE = REGISTRY.gauge(
+    "dogapi_upstream_breaker_state",
+    "Current circuit breaker state: 0 closed, 1 half-open, 2 open",
+    ("breaker",)
+)
+BREAKER_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+# One counter per ResilienceStats field
+RESILIENCE_COUNTERS = {
+    name: REGISTRY.counter(f"dogapi_upstream_{name}_total", documentation, ("breaker",))
+    for name, documentation in (
+        ("calls", "Upstream calls, each made of one or more attempts"),
+        ("attempts", "Upstream attempts, retries and hedges included"),
+        ("retries", "Upstream attempts retried after a retryable failure"),
+        ("hedged", "Upstream attempts that got a hedged duplicate"),
+        ("hedge_wins", "Hedged duplicates that answered first"),
+        ("deadline_exceeded", "Upstream calls that ran out of time"),
+    )
+}
+
+
+def upstream_endpoint(path: str) -> str:
+    """Collapses a request path to its endpoint template, e.g. 'breeds/abc?x=1' -> 'breeds/{id}'."""
+    resource, _, rest = path.split("?", 1)[0].strip("/").partition("/")
+    if not rest:
+        return resource
+    return "/".join([resource] + ["{id}" if index % 2 == 0 else part for index, part in enumerate(rest.split("/"))])
+
+
+def upstream_outcome(error: BaseException) -> str:
+    """Status label of a failed upstream call: the upstream status if it answered, else the failure kind."""
+    if isinstance(error, UpstreamError) and error.upstream_status is not None:
+        return str(error.upstream_status)
+    if isinstance(error, UpstreamTimeout):
+        return "timeout"
+    if isinstance(error, UpstreamUnavailable):
+        return "unavailable"
+    return "error"
+
+
+def _record_transition(breaker: str, old_state: str, new_state: str) -> None:
+    BREAKER_TRANSITIONS.labels(breaker, old_state, new_state).inc()
+    BREAKER_STATE.labels(breaker).set(BREAKER_STATE_VALUES[new_state])
+
+
+def _record_counts(breaker: str, increments: Dict[str, int]) -> None:
+    for name, value in increments.items():
+        RESILIENCE_COUNTERS[name].labels(breaker).inc(value)
+
+
+def instrument_resilience(resilience: ResilientCaller) -> None:
+    """Exports the breaker state changes and the retry, hedging and deadline counters of `resilience` to the registry."""
+    breaker = resilience.breaker
+    BREAKER_STATE.labels(breaker.name).set(BREAKER_STATE_VALUES[breaker.state])
+    # Series start at zero rather than appearing with the first event
+    for counter in RESILIENCE_COUNTERS.values():
+        counter.labels(breaker.name)
+    breaker.add_listener(_record_transition)
+    resilience.add_listener(_record_counts)
@@ -0,0 +1,176 @@
+from typing import Any, Dict, Optional
+
+from src.domain.entities.breed import Breed, BreedAttributes, LifeSpan, WeightRange, BreedRelationships, GroupRelationship, BreedLinks
+from src.domain.entities.fact import Fact, FactAttributes
+from src.domain.entities.group import Group, GroupAttributes, GroupRelationships, BreedReference
+
+
+def breed_attributes(attributes: Dict) -> BreedAttributes:
+    """Builds the attributes of a breed from its JSON:API attributes."""
+    return BreedAttributes(
+        name=attributes["name"],
+        description=attributes.get("description"),
+        life=LifeSpan(
+            min=attributes["life"]["min"],
+            max=attributes["life"]["max"]
+        ) if attributes.get("life") else None,
+        male_weight=WeightRange(
+            min=attributes["male_weight"]["min"],
+            max=attributes["male_weight"]["max"]
+        ) if attributes.get("male_weight") else None,
+        female_weight=WeightRange(
+            min=attributes["female_weight"]["min"],
+            max=attributes["female_weight"]["max"]
+        ) if attributes.get("female_weight") else None,
+        hypoallergenic=attributes.get("hypoallergenic", False),
+    )
+
+
+def breed_relationships(breed_data: Dict) -> Optional[BreedRelationships]:
+    """Builds the relationships of a breed resource, None if it has no group."""
+    if "relationships" in breed_data and "group" in breed_data["relationships"]:
+        group_data = breed_data["relationships"]["group"]["data"]
+        return BreedRelationships(group=GroupRelationship(id=group_data["id"]))
+    return None
+
+
+def group_relationships(group_data: Dict) -> GroupRelationships:
+    """Builds the breed references of a group resource."""
+    relationships = group_data.get("relationships", {})
+    return GroupRelationships(
+        breeds={
+            "data": [
+                BreedReference(id=str(breed["id"]))
+                for breed in relationships.get("breeds", {}).get("data", [])
+            ]
+        }
+    )
+
+
+_UNSET: Any = object()
+# Ranges checked when a breed is wrapped, so invalid data still fails while parsing
+_RANGE_ATTRIBUTES = ("life", "male_weight", "female_weight")
+
+
+class LazyBreed(Breed):
+    """
+    Breed over a decoded JSON:API resource.
+
+    The id is read up front; attributes, relationships and links are built
+    on first access. The serializer re-emits unchanged views straight from
+    `resource`, so entities that are only served are never built at all.
+    Like every entity, a view is treated as immutable.
+    """
+    __slots__ = ("resource", "document_links", "_attributes", "_relationships", "_links")
+
+    def __init__(self, data: Dict):
+        breed_data = data.get("data", data)
+        self.id = breed_data["id"]
+        self.type = "breed"
+        self.breed_group = None
+        self.image_url = None
+        self.resource = breed_data
+        self.document_links = data.get("links")
+        self._attributes = self._relationships = self._links = _UNSET
+        attributes = breed_data["attributes"]
+        for name in _RANGE_ATTRIBUTES:
+            value = attributes.get(name)
+            if value and value["min"] > value["max"]:
+                # Raises the LifeSpan/WeightRange validation error
+                self._attributes = breed_attributes(attributes)
+
+    @property
+    def attributes(self) -> BreedAttributes:
+        if self._attributes is _UNSET:
+            self._attributes = breed_attributes(self.resource["attributes"])
+        return self._attributes
+
+    @property
+    def relationships(self) -> Optional[BreedRelationships]:
+        if self._relationships is _UNSET:
+            self._relationships = breed_relationships(self.resource)
+        return self._relationships
+
+    @property
+    def links(self) -> Optional[BreedLinks]:
+        if self._links is _UNSET:
+            self._links = BreedLinks(self=self.document_links["self"]) if self.document_links is not None else None
+        return self._links
+
+    def __eq__(self, other: object) -> bool:
+        # Compares the resources rather than building both entities
+        if isinstance(other, LazyBreed):
+            return self.resource == other.resource and self.document_links == other.document_links
+        return NotImplemented
+
+
+class LazyGroup(Group):
+    """
+    Group over a decoded JSON:API resource; its name and breed references
+    are built on first access, see LazyBreed.
+    """
+    __slots__ = ("resource", "_attributes", "_relationships")
+
+    def __init__(self, data: Dict):
+        group_data = data.get("data", data)
+        self.id = str(group_data["id"])
+        self.type = "group"
+        self.resource = group_data
+        self._attributes = self._relationships = _UNSET
+
+    @property
+    def attributes(self) -> GroupAttributes:
+        if self._attributes is _UNSET:
+            self._attributes = GroupAttributes(name=self.resource.get("attributes", {})["name"])
+        return self._attributes
+
+    @property
+    def relationships(self) -> GroupRelationships:
+        if self._relationships is _UNSET:
+            self._relationships = group_relationships(self.resource)
+        return self._relationships
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyGroup):
+            return self.resource == other.resource
+        return NotImplemented
+
+
+def parse_breed(data: Dict) -> Breed:
+    """Converts API data into a Breed entity."""
+    return LazyBreed(data)
+
+
+def parse_group(data: Dict) -> Group:
+    """Converts API data into a Group entity."""
+    return LazyGroup(data)
+
+
+def parse_fact(data: Dict) -> Fact:
+    """Converts API data into a Fact entity."""
+    fact_data = data.get("data", data)
+    attributes = fact_data.get("attributes", {})
+
+    return Fact(
+        id=str(fact_data["id"]),
+        type=fact_data["type"],
+        attributes=FactAttributes(
+            body=attributes["body"]
+        )
+    )
+
+
+def total_from_meta(meta: Dict, default: int) -> int:
+    """Reads the record count from the JSON:API meta block."""
+    pagination = meta.get("pagination") or {}
+    return int(pagination.get("records", meta.get("total", default)))
+
+
+def parse_resource(data: Dict) -> Any:
+    """Converts a JSON:API resource into the entity matching its type."""
+    resource_type = data.get("data", data).get("type")
+    if resource_type == "group":
+        return parse_group(data)
+    if resource_type == "fact":
+        return parse_fact(data)
+    return parse_breed(data)
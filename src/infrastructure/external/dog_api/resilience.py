@@ -0,0 +1,482 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from src.shared.exceptions.api_exception import UpstreamError, UpstreamTimeout, UpstreamUnavailable
+from src.shared.utils.fan_out import FanOut
+from src.shared.utils.rate_limiter import DEFAULT, PriorityTokenBucket, RateLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class Deadline:
+    """Point in time by which a call, retries included, must be done."""
+    __slots__ = ("expires_at", "_clock")
+
+    def __init__(self, timeout: float, clock=time.monotonic):
+        self._clock = clock
+        self.expires_at = clock() + timeout
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+
+    def backoff(self, retry: int) -> float:
+        """Full-jitter exponential delay before retry number `retry` (1-based)."""
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies."""
+
+    def __init__(self, window: int = 512, min_samples: int = 20):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        """Returns the latency at `quantile`, or None until enough samples were recorded."""
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return None
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(quantile * len(samples)))]
+
+
+@dataclass
+class BreakerStats:
+    name: str
+    state: str
+    consecutive_failures: int
+    rejected: int
+    transitions: Dict[str, int] = field(default_factory=dict)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after `failure_threshold` failures in a row and rejects calls for
+    `recovery_timeout` seconds, then lets `half_open_max_calls` probes through:
+    a successful probe closes it again, a failed one reopens it.
+    """
+
+    def __init__(
+        self,
+        name: str = "upstream",
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock=time.monotonic
+    ):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._rejected = 0
+        self._transitions: Dict[str, int] = {}
+        self._listeners: List[Callable[[str, str, str], None]] = []
+
+    def add_listener(self, listener: Callable[[str, str, str], None]) -> None:
+        """Registers `listener(name, old_state, new_state)`, called on every state change."""
+        self._listeners.append(listener)
+
+    def _transition(self, state: str) -> Callable[[], None]:
+        """Changes state under the lock; returns the notification to run once it is released."""
+        old_state, self._state = self._state, state
+        key = f"{old_state}->{state}"
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        if state == OPEN:
+            self._opened_at = self._clock()
+        self._probes = 0
+
+        def notify() -> None:
+            log = logger.warning if state == OPEN else logger.info
+            log("Circuit breaker %s: %s -> %s", self.name, old_state, state)
+            for listener in self._listeners:
+                listener(self.name, old_state, state)
+        return notify
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe through; 0 when it is not open."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self._recovery_timeout - self._clock())
+
+    def allow(self) -> bool:
+        """Whether a call may go to the upstream now."""
+        notify = None
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self._recovery_timeout:
+                notify = self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN and self._probes < self._half_open_max_calls:
+                self._probes += 1
+                allowed = True
+            else:
+                allowed = self._state == CLOSED
+            if not allowed:
+                self._rejected += 1
+        if notify:
+            notify()
+        return allowed
+
+    def release(self) -> None:
+        """Gives back the probe slot of an attempt that ended without a verdict on the upstream's health."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        notify = None
+        with self._lock:
+            self._consecutive_failures = 0
+            if self._state == HALF_OPEN:
+                notify = self._transition(CLOSED)
+        if notify:
+            notify()
+
+    def record_failure(self) -> None:
+        notify = None
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._consecutive_failures >= self._failure_threshold
+            ):
+                notify = self._transition(OPEN)
+        if notify:
+            notify()
+
+    def stats(self) -> BreakerStats:
+        with self._lock:
+            return BreakerStats(
+                name=self.name,
+                state=self._state,
+                consecutive_failures=self._consecutive_failures,
+                rejected=self._rejected,
+                transitions=dict(self._transitions)
+            )
+
+
+@dataclass
+class ResilienceStats:
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    deadline_exceeded: int = 0
+
+
+class ResilientCaller:
+    """
+    Runs upstream attempts under a deadline, retries and a circuit breaker.
+
+    Each call gets `timeout` seconds overall; an attempt receives the time
+    left and must not outlive it. Retryable failures of idempotent calls are
+    retried with jittered backoff while the deadline allows. With
+    `hedge_percentile` set, an idempotent attempt still running after that
+    latency percentile gets a second, hedged attempt and the first success wins.
+    Every attempt takes a `limiter` token, at the call's priority, before
+    the breaker lets it through.
+    """
+
+    def __init__(
+        self,
+        breaker: Optional[CircuitBreaker] = None,
+        retry: Optional[RetryPolicy] = None,
+        timeout: float = 10.0,
+        hedge_percentile: Optional[float] = None,
+        min_hedge_delay: float = 0.05,
+        hedge_workers: int = 16,
+        limiter: Optional[PriorityTokenBucket] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.breaker = breaker or CircuitBreaker()
+        self._retry = retry or RetryPolicy()
+        self._timeout = timeout
+        self._hedge_percentile = hedge_percentile
+        self._min_hedge_delay = min_hedge_delay
+        self._latencies = LatencyTracker()
+        self._hedge_pool = FanOut(max_workers=hedge_workers, name="upstream-hedge") if hedge_percentile else None
+        self.limiter = limiter
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._stats = ResilienceStats()
+        self._listeners: List[Callable[[str, Dict[str, int]], None]] = []
+
+    def add_listener(self, listener: Callable[[str, Dict[str, int]], None]) -> None:
+        """Registers `listener(breaker_name, increments)`, called with every update of the ResilienceStats counters."""
+        self._listeners.append(listener)
+
+    def _count(self, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self._stats, name, getattr(self._stats, name) + value)
+        for listener in self._listeners:
+            listener(self.breaker.name, increments)
+
+    def _hedge_delay(self, deadline: Deadline) -> Optional[float]:
+        if not self._hedge_percentile:
+            return None
+        latency = self._latencies.percentile(self._hedge_percentile)
+        if latency is None:
+            return None
+        delay = max(latency, self._min_hedge_delay)
+        return delay if delay < deadline.remaining() else None
+
+    def _circuit_open(self) -> UpstreamUnavailable:
+        return UpstreamUnavailable(
+            "Upstream circuit open; failing fast",
+            retry_after=self.breaker.retry_after(),
+            retryable=False
+        )
+
+    def _remaining(self, deadline: Deadline) -> float:
+        """Checks the deadline, and that an open breaker is not cooling down, before waiting for a token."""
+        remaining = deadline.remaining()
+        if remaining <= 0.0:
+            self._count(deadline_exceeded=1)
+            raise UpstreamTimeout("Upstream deadline exceeded")
+        if self.breaker.retry_after() > 0.0:
+            raise self._circuit_open()
+        return remaining
+
+    @staticmethod
+    def _budget_exhausted(error: RateLimitExceeded) -> UpstreamUnavailable:
+        return UpstreamUnavailable("Upstream request budget exhausted", retry_after=error.retry_after, retryable=False)
+
+    def _admit(self, remaining: float) -> float:
+        """Asks the breaker, once the token is taken; returns the time the attempt may take."""
+        if remaining <= 0.0:
+            self._count(deadline_exceeded=1)
+            raise UpstreamTimeout("Upstream deadline exceeded")
+        if not self.breaker.allow():
+            raise self._circuit_open()
+        self._count(attempts=1)
+        return remaining
+
+    def _before_attempt(self, deadline: Deadline, priority: int) -> float:
+        """Checks the deadline, takes a token and checks the breaker; returns the time the attempt may take."""
+        remaining = self._remaining(deadline)
+        if self.limiter is not None:
+            try:
+                remaining -= self.limiter.acquire(priority, timeout=remaining)
+            except RateLimitExceeded as e:
+                raise self._budget_exhausted(e)
+        return self._admit(remaining)
+
+    async def _before_attempt_async(self, deadline: Deadline, priority: int) -> float:
+        remaining = self._remaining(deadline)
+        if self.limiter is not None:
+            try:
+                remaining -= await self.limiter.acquire_async(priority, timeout=remaining)
+            except RateLimitExceeded as e:
+                raise self._budget_exhausted(e)
+        return self._admit(remaining)
+
+    def _after_failure(self, error: UpstreamError) -> None:
+        """Reports a failed attempt to the breaker."""
+        if error.retryable:
+            self.breaker.record_failure()
+        elif error.upstream_status is not None:
+            # The upstream answered, so it is healthy even if the answer was an error
+            self.breaker.record_success()
+        else:
+            # Failed on our side (e.g. no pooled connection): says nothing about the upstream
+            self.breaker.release()
+
+    def _retry_delay(self, error: UpstreamError, retry: int, attempts: int, deadline: Deadline) -> Optional[float]:
+        """Returns how long to wait before the next attempt, or None to give up."""
+        if not error.retryable or retry >= attempts:
+            return None
+        delay = self._retry.backoff(retry)
+        if delay >= deadline.remaining():
+            return None
+        self._count(retries=1)
+        return delay
+
+    def _timed(self, attempt: Callable[[float], T], deadline: Deadline, priority: int) -> T:
+        remaining = self._before_attempt(deadline, priority)
+        started = time.monotonic()
+        try:
+            result = attempt(remaining)
+        except UpstreamError as e:
+            self._after_failure(e)
+            raise
+        except BaseException:
+            # A half-open breaker would otherwise wait forever for this probe's verdict
+            self.breaker.release()
+            raise
+        self._latencies.record(time.monotonic() - started)
+        self.breaker.record_success()
+        return result
+
+    def _attempt(self, attempt: Callable[[float], T], deadline: Deadline, idempotent: bool, priority: int) -> T:
+        hedge_delay = self._hedge_delay(deadline) if idempotent else None
+        if hedge_delay is None:
+            return self._timed(attempt, deadline, priority)
+
+        primary = self._hedge_pool.submit(self._timed, attempt, deadline, priority)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        self._count(hedged=1)
+        hedge = self._hedge_pool.submit(self._timed, attempt, deadline, priority)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                try:
+                    result = future.result()
+                except UpstreamError as e:
+                    error = e
+                    continue
+                if future is hedge:
+                    self._count(hedge_wins=1)
+                # The slower attempt keeps running in the background and its result is dropped
+                return result
+        if error is not None:
+            raise error
+        self._count(deadline_exceeded=1)
+        raise UpstreamTimeout("Upstream deadline exceeded")
+
+    def call(self, attempt: Callable[[float], T], idempotent: bool = True, priority: int = DEFAULT) -> T:
+        """Runs `attempt(time_left)` until it succeeds, fails permanently or the deadline passes."""
+        self._count(calls=1)
+        deadline = Deadline(self._timeout)
+        attempts = self._retry.max_attempts if idempotent else 1
+        retry = 0
+        while True:
+            try:
+                return self._attempt(attempt, deadline, idempotent, priority)
+            except UpstreamError as e:
+                retry += 1
+                delay = self._retry_delay(e, retry, attempts, deadline)
+                if delay is None:
+                    raise
+                self._sleep(delay)
+
+    async def _timed_async(self, attempt: Callable[[float], Awaitable[T]], deadline: Deadline, priority: int) -> T:
+        remaining = await self._before_attempt_async(deadline, priority)
+        started = time.monotonic()
+        try:
+            result = await attempt(remaining)
+        except UpstreamError as e:
+            self._after_failure(e)
+            raise
+        except BaseException:
+            # Includes a losing hedge being cancelled
+            self.breaker.release()
+            raise
+        self._latencies.record(time.monotonic() - started)
+        self.breaker.record_success()
+        return result
+
+    async def _attempt_async(
+        self,
+        attempt: Callable[[float], Awaitable[T]],
+        deadline: Deadline,
+        idempotent: bool,
+        priority: int
+    ) -> T:
+        hedge_delay = self._hedge_delay(deadline) if idempotent else None
+        if hedge_delay is None:
+            return await self._timed_async(attempt, deadline, priority)
+
+        primary = asyncio.ensure_future(self._timed_async(attempt, deadline, priority))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        self._count(hedged=1)
+        hedge = asyncio.ensure_future(self._timed_async(attempt, deadline, priority))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=deadline.remaining(), return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    try:
+                        result = task.result()
+                    except UpstreamError as e:
+                        error = e
+                        continue
+                    if task is hedge:
+                        self._count(hedge_wins=1)
+                    return result
+        finally:
+            for task in pending:
+                task.cancel()
+        if error is not None:
+            raise error
+        self._count(deadline_exceeded=1)
+        raise UpstreamTimeout("Upstream deadline exceeded")
+
+    async def call_async(
+        self,
+        attempt: Callable[[float], Awaitable[T]],
+        idempotent: bool = True,
+        priority: int = DEFAULT
+    ) -> T:
+        """Async counterpart of call(); losing hedged attempts are cancelled."""
+        self._count(calls=1)
+        deadline = Deadline(self._timeout)
+        attempts = self._retry.max_attempts if idempotent else 1
+        retry = 0
+        while True:
+            try:
+                return await self._attempt_async(attempt, deadline, idempotent, priority)
+            except UpstreamError as e:
+                retry += 1
+                delay = self._retry_delay(e, retry, attempts, deadline)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+    def stats(self) -> ResilienceStats:
+        with self._lock:
+            return ResilienceStats(**vars(self._stats))
@@ -0,0 +1,161 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.domain.entities.breed import Breed
+from src.shared.exceptions.api_exception import APIException
+
+# Each range quantity has '<name>_min' and '<name>_max' columns, named like the filters on them
+RANGE_FILTERS = {
+    "life_span": ("life_span_min", "life_span_max"),
+    "male_weight": ("male_weight_min", "male_weight_max"),
+    "female_weight": ("female_weight_min", "female_weight_max"),
+}
+
+NUMERIC_COLUMNS = tuple(column for columns in RANGE_FILTERS.values() for column in columns)
+
+SORTABLE_COLUMNS = NUMERIC_COLUMNS + ("name",)
+
+_TRUE_VALUES = {"1", "true", "yes"}
+_FALSE_VALUES = {"0", "false", "no"}
+
+
+def _to_float(name: str, value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise APIException(f"Invalid value for filter '{name}': {value!r}")
+
+
+def check_sort_field(sort_by: Optional[str]) -> None:
+    """Rejects a sort field that breeds cannot be ordered by."""
+    if sort_by and sort_by not in SORTABLE_COLUMNS:
+        raise APIException(f"Cannot sort_by '{sort_by}'; expected one of: {', '.join(SORTABLE_COLUMNS)}")
+
+
+def parse_breed_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Validates raw filter values and converts them to typed values.
+
+    Supported keys: '<range>_min'/'<range>_max' for life_span, male_weight and
+    female_weight (the same names sort_by accepts), 'hypoallergenic' and 'group'.
+    """
+    parsed: Dict[str, Any] = {}
+    for key, value in (filters or {}).items():
+        if key == "hypoallergenic":
+            if isinstance(value, bool):
+                parsed[key] = value
+            elif str(value).lower() in _TRUE_VALUES:
+                parsed[key] = True
+            elif str(value).lower() in _FALSE_VALUES:
+                parsed[key] = False
+            else:
+                raise APIException(f"Invalid value for filter 'hypoallergenic': {value!r}")
+        elif key == "group":
+            parsed[key] = str(value)
+        elif key.rsplit("_", 1)[0] in RANGE_FILTERS and key.rsplit("_", 1)[-1] in ("min", "max"):
+            parsed[key] = _to_float(key, value)
+        else:
+            expected = ", ".join(NUMERIC_COLUMNS + ("hypoallergenic", "group"))
+            raise APIException(f"Unknown filter '{key}'; expected one of: {expected}")
+    return parsed
+
+
+class BreedColumns:
+    """
+    Column-oriented NumPy view of the breed catalog.
+
+    Filters are evaluated as boolean masks and sorting as a single argsort,
+    so a filter+sort+page query never loops over Breed objects in Python.
+    Missing numeric values are NaN and never match a range filter.
+    """
+
+    def __init__(self, breeds: Sequence[Breed], group_ids: Optional[Dict[str, str]] = None):
+        count = len(breeds)
+        group_ids = group_ids or {}
+
+        self.breed_ids: List[str] = [breed.id for breed in breeds]
+        self.numeric: Dict[str, np.ndarray] = {name: np.full(count, np.nan) for name in NUMERIC_COLUMNS}
+        self.hypoallergenic = np.zeros(count, dtype=bool)
+
+        group_codes: Dict[str, int] = {}
+        self.group = np.full(count, -1, dtype=np.int32)
+
+        for position, breed in enumerate(breeds):
+            attributes = breed.attributes
+            for range_name, value in (
+                ("life_span", attributes.life),
+                ("male_weight", attributes.male_weight),
+                ("female_weight", attributes.female_weight)
+            ):
+                if value is not None:
+                    min_column, max_column = RANGE_FILTERS[range_name]
+                    self.numeric[min_column][position] = value.min
+                    self.numeric[max_column][position] = value.max
+            self.hypoallergenic[position] = bool(attributes.hypoallergenic)
+
+            group_id = breed.relationships.group.id if breed.relationships and breed.relationships.group else group_ids.get(breed.id)
+            if group_id is not None:
+                self.group[position] = group_codes.setdefault(group_id, len(group_codes))
+
+        self._group_codes = group_codes
+        names = np.array([breed.attributes.name.lower() for breed in breeds], dtype=object)
+        # Rank of each breed by name, so name sorting is a numeric argsort as well
+        self.name_rank = np.empty(count, dtype=np.int64)
+        self.name_rank[np.argsort(names, kind="stable")] = np.arange(count)
+
+    def __len__(self) -> int:
+        return len(self.breed_ids)
+
+    def mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Returns the boolean mask of breeds matching every parsed filter."""
+        mask = np.ones(len(self), dtype=bool)
+        for key, value in filters.items():
+            if key == "hypoallergenic":
+                mask &= self.hypoallergenic == value
+            elif key == "group":
+                code = self._group_codes.get(value)
+                if code is None:
+                    return np.zeros(len(self), dtype=bool)
+                mask &= self.group == code
+            else:
+                range_name, bound = key.rsplit("_", 1)
+                min_column, max_column = RANGE_FILTERS[range_name]
+                # A breed matches when its [min, max] range overlaps the requested bound
+                if bound == "min":
+                    mask &= self.numeric[max_column] >= value
+                else:
+                    mask &= self.numeric[min_column] <= value
+        return mask
+
+    def sort_key(self, sort_by: str) -> np.ndarray:
+        check_sort_field(sort_by)
+        if sort_by == "name":
+            return self.name_rank
+        return self.numeric[sort_by]
+
+    def query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        candidates: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Returns the positions of the matching breeds in result order.
+
+        `candidates` restricts and orders the input (e.g. ranked search hits);
+        without `sort_by` that order is kept.
+        """
+        positions = np.arange(len(self)) if candidates is None else candidates
+        if filters:
+            positions = positions[self.mask(filters)[positions]]
+
+        if sort_by:
+            keys = self.sort_key(sort_by)[positions]
+            descending = (sort_order or "asc").lower() == "desc"
+            if descending:
+                keys = -keys
+            # NaN sorts last in both directions
+            positions = positions[np.argsort(keys, kind="stable")]
+        return positions
@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional
+
+from src.domain.entities.breed import Breed
+from src.domain.entities.group import Group
+from src.infrastructure.search.search_index import SearchIndex
+
+
+class CatalogSearchIndex:
+    """Search indexes over breed names, descriptions and group names, kept in sync with the catalog."""
+
+    BREED_FIELDS = {"name": 3.0, "group": 2.0, "description": 1.0}
+    GROUP_FIELDS = {"name": 1.0}
+
+    def __init__(self):
+        self._breeds = SearchIndex(self.BREED_FIELDS)
+        self._groups = SearchIndex(self.GROUP_FIELDS)
+        self._breed_fields: Dict[str, Dict[str, Optional[str]]] = {}
+        self._group_fields: Dict[str, Dict[str, Optional[str]]] = {}
+
+    @staticmethod
+    def _group_names_by_breed(groups: List[Group]) -> Dict[str, str]:
+        names = {}
+        for group in groups:
+            for reference in group.relationships.breeds.get("data", []):
+                names[reference.id] = group.attributes.name
+        return names
+
+    @staticmethod
+    def breed_fields(breed: Breed, group_name: Optional[str] = None) -> Dict[str, Optional[str]]:
+        return {
+            "name": breed.attributes.name,
+            "group": group_name,
+            "description": breed.attributes.description,
+        }
+
+    @staticmethod
+    def _sync_index(
+        index: SearchIndex,
+        indexed: Dict[str, Dict[str, Optional[str]]],
+        documents: Dict[str, Dict[str, Optional[str]]],
+        order: List[str]
+    ) -> int:
+        """Applies only the differences between the indexed and the new documents."""
+        changes = 0
+        for doc_id in [doc_id for doc_id in indexed if doc_id not in documents]:
+            index.remove(doc_id)
+            del indexed[doc_id]
+            changes += 1
+        for doc_id, fields in documents.items():
+            if indexed.get(doc_id) != fields:
+                index.upsert(doc_id, fields)
+                indexed[doc_id] = fields
+                changes += 1
+        index.reorder(order)
+        return changes
+
+    def sync(self, breeds: List[Breed], groups: List[Group]) -> int:
+        """Brings both indexes up to date with the catalog; returns the number of changed documents."""
+        group_names = {group.id: group.attributes.name for group in groups}
+        member_group_names = self._group_names_by_breed(groups)
+
+        breed_documents = {}
+        for breed in breeds:
+            group_id = breed.relationships.group.id if breed.relationships and breed.relationships.group else None
+            group_name = group_names.get(group_id) or member_group_names.get(breed.id)
+            breed_documents[breed.id] = self.breed_fields(breed, group_name)
+
+        group_documents = {group.id: {"name": group.attributes.name} for group in groups}
+
+        return (
+            self._sync_index(self._breeds, self._breed_fields, breed_documents, [breed.id for breed in breeds])
+            + self._sync_index(self._groups, self._group_fields, group_documents, [group.id for group in groups])
+        )
+
+    def search_breeds(self, query: str) -> List[str]:
+        return self._breeds.search(query)
+
+    def search_groups(self, query: str) -> List[str]:
+        return self._groups.search(query)
@@ -0,0 +1,144 @@
+import bisect
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Splits text into lowercase alphanumeric tokens."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """
+    In-memory inverted index with weighted fields, prefix matching and ranking.
+
+    Every query token must match (exactly or as a prefix) in at least one field.
+    Documents are scored with a TF-IDF style sum over the matched tokens, where
+    exact matches outweigh prefix matches and each field has its own weight.
+    Documents can be added, replaced and removed incrementally.
+    """
+
+    PREFIX_BOOST = 0.6
+    MIN_PREFIX_LENGTH = 1
+
+    def __init__(self, field_weights: Dict[str, float]):
+        self._field_weights = field_weights
+        self._postings: Dict[str, Dict[Hashable, float]] = defaultdict(dict)
+        self._vocabulary: List[str] = []
+        self._documents: Dict[Hashable, List[str]] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._next_order = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._documents
+
+    def _weighted_terms(self, fields: Dict[str, Optional[str]]) -> Dict[str, float]:
+        terms: Dict[str, float] = defaultdict(float)
+        for field_name, text in fields.items():
+            weight = self._field_weights.get(field_name, 1.0)
+            for token in tokenize(text):
+                terms[token] += weight
+        return terms
+
+    def _add_token(self, token: str) -> None:
+        position = bisect.bisect_left(self._vocabulary, token)
+        if position == len(self._vocabulary) or self._vocabulary[position] != token:
+            self._vocabulary.insert(position, token)
+
+    def _drop_token(self, token: str) -> None:
+        position = bisect.bisect_left(self._vocabulary, token)
+        if position < len(self._vocabulary) and self._vocabulary[position] == token:
+            del self._vocabulary[position]
+
+    def upsert(self, doc_id: Hashable, fields: Dict[str, Optional[str]]) -> None:
+        """Indexes a document, replacing any previous version of it."""
+        with self._lock:
+            order = self._order.get(doc_id)
+            self._remove(doc_id)
+            terms = self._weighted_terms(fields)
+            for token, weight in terms.items():
+                postings = self._postings[token]
+                if not postings:
+                    self._add_token(token)
+                postings[doc_id] = weight
+            self._documents[doc_id] = list(terms)
+            if order is None:
+                order = self._next_order
+                self._next_order += 1
+            self._order[doc_id] = order
+
+    def remove(self, doc_id: Hashable) -> None:
+        """Removes a document from the index."""
+        with self._lock:
+            self._remove(doc_id)
+            self._order.pop(doc_id, None)
+
+    def _remove(self, doc_id: Hashable) -> None:
+        for token in self._documents.pop(doc_id, []):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[token]
+                self._drop_token(token)
+
+    def reorder(self, doc_ids: Iterable[Hashable]) -> None:
+        """Sets the tie-break order of equally ranked documents."""
+        with self._lock:
+            for position, doc_id in enumerate(doc_ids):
+                if doc_id in self._documents:
+                    self._order[doc_id] = position
+            self._next_order = max(self._order.values(), default=-1) + 1
+
+    def _expand(self, query_token: str) -> List[Tuple[str, float]]:
+        """Returns the indexed tokens matching a query token with their boosts."""
+        matches = []
+        if query_token in self._postings:
+            matches.append((query_token, 1.0))
+        if len(query_token) < self.MIN_PREFIX_LENGTH:
+            return matches
+        position = bisect.bisect_right(self._vocabulary, query_token)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(query_token):
+            token = self._vocabulary[position]
+            matches.append((token, self.PREFIX_BOOST * len(query_token) / len(token)))
+            position += 1
+        return matches
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Hashable]:
+        """Returns the IDs of the matching documents, best match first."""
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            total_documents = len(self._documents) or 1
+            scores: Optional[Dict[Hashable, float]] = None
+            for query_token in query_tokens:
+                token_scores: Dict[Hashable, float] = defaultdict(float)
+                for token, boost in self._expand(query_token):
+                    postings = self._postings[token]
+                    idf = math.log(1 + total_documents / len(postings))
+                    for doc_id, weight in postings.items():
+                        token_scores[doc_id] += weight * idf * boost
+
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {doc_id: score + token_scores[doc_id] for doc_id, score in scores.items() if doc_id in token_scores}
+                if not scores:
+                    return []
+
+            ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], self._order.get(doc_id, 0)))
+        return ranked[:limit] if limit is not None else ranked
@@ -0,0 +1,164 @@
+import math
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.domain.entities.breed import Breed, BreedAttributes, LifeSpan, WeightRange, BreedRelationships, GroupRelationship, BreedLinks
+from src.domain.entities.group import Group, GroupAttributes, GroupRelationships, BreedReference
+
+_NAN = float("nan")
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+class BreedTable:
+    """
+    Array-backed store of breeds.
+
+    Numeric attributes live in typed arrays and strings are interned, so a
+    breed costs a few machine words instead of a tree of entity objects.
+    Breed entities are built on demand by view()/get().
+    """
+
+    _RANGES = ("life", "male_weight", "female_weight")
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._descriptions: List[Optional[str]] = []
+        self._group_ids: List[Optional[str]] = []
+        self._links: List[Optional[str]] = []
+        self._hypoallergenic = array("b")
+        self._bounds = {name: (array("d"), array("d")) for name in self._RANGES}
+
+    @classmethod
+    def from_breeds(cls, breeds: Iterable[Breed]) -> "BreedTable":
+        table = cls()
+        for breed in breeds:
+            table.append(breed)
+        return table
+
+    def append(self, breed: Breed) -> int:
+        """Adds a breed and returns its position."""
+        attributes = breed.attributes
+        position = len(self._ids)
+        self._ids.append(_intern(breed.id))
+        self._positions[breed.id] = position
+        self._names.append(_intern(attributes.name))
+        self._descriptions.append(attributes.description)
+        group = breed.relationships.group if breed.relationships else None
+        self._group_ids.append(_intern(group.id) if group else None)
+        self._links.append(breed.links.self if breed.links else None)
+        self._hypoallergenic.append(1 if attributes.hypoallergenic else 0)
+        for name in self._RANGES:
+            value = getattr(attributes, name)
+            lower, upper = self._bounds[name]
+            lower.append(value.min if value is not None else _NAN)
+            upper.append(value.max if value is not None else _NAN)
+        return position
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, breed_id: str) -> bool:
+        return breed_id in self._positions
+
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    def _range(self, name: str, position: int, range_class):
+        lower, upper = self._bounds[name]
+        if math.isnan(lower[position]):
+            return None
+        if range_class is LifeSpan:
+            return LifeSpan(min=int(lower[position]), max=int(upper[position]))
+        return WeightRange(min=lower[position], max=upper[position])
+
+    def view(self, position: int) -> Breed:
+        """Builds the Breed entity stored at `position`."""
+        group_id = self._group_ids[position]
+        link = self._links[position]
+        return Breed(
+            id=self._ids[position],
+            attributes=BreedAttributes(
+                name=self._names[position],
+                description=self._descriptions[position],
+                life=self._range("life", position, LifeSpan),
+                male_weight=self._range("male_weight", position, WeightRange),
+                female_weight=self._range("female_weight", position, WeightRange),
+                hypoallergenic=bool(self._hypoallergenic[position])
+            ),
+            relationships=BreedRelationships(group=GroupRelationship(id=group_id)) if group_id else None,
+            links=BreedLinks(self=link) if link else None
+        )
+
+    def get(self, breed_id: str) -> Optional[Breed]:
+        position = self._positions.get(breed_id)
+        return self.view(position) if position is not None else None
+
+    def __iter__(self) -> Iterator[Breed]:
+        for position in range(len(self._ids)):
+            yield self.view(position)
+
+
+class GroupTable:
+    """
+    Array-backed store of groups.
+
+    Breed memberships are kept as one flat list of interned breed IDs indexed
+    by an offsets array instead of a list of BreedReference objects per group.
+    """
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._member_ids: List[str] = []
+        self._offsets = array("l", [0])
+
+    @classmethod
+    def from_groups(cls, groups: Iterable[Group]) -> "GroupTable":
+        table = cls()
+        for group in groups:
+            table.append(group)
+        return table
+
+    def append(self, group: Group) -> int:
+        """Adds a group and returns its position."""
+        position = len(self._ids)
+        self._ids.append(_intern(group.id))
+        self._positions[group.id] = position
+        self._names.append(_intern(group.attributes.name))
+        self._member_ids.extend(_intern(reference.id) for reference in group.relationships.breeds.get("data", []))
+        self._offsets.append(len(self._member_ids))
+        return position
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, group_id: str) -> bool:
+        return group_id in self._positions
+
+    def breed_ids(self, position: int) -> List[str]:
+        return self._member_ids[self._offsets[position]:self._offsets[position + 1]]
+
+    def view(self, position: int) -> Group:
+        """Builds the Group entity stored at `position`."""
+        return Group(
+            id=self._ids[position],
+            attributes=GroupAttributes(name=self._names[position]),
+            relationships=GroupRelationships(
+                breeds={"data": [BreedReference(id=breed_id) for breed_id in self.breed_ids(position)]}
+            )
+        )
+
+    def get(self, group_id: str) -> Optional[Group]:
+        position = self._positions.get(group_id)
+        return self.view(position) if position is not None else None
+
+    def __iter__(self) -> Iterator[Group]:
+        for position in range(len(self._ids)):
+            yield self.view(position)
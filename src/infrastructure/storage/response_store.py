@@ -0,0 +1,169 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS responses ("
+    " key TEXT PRIMARY KEY,"
+    " body BLOB NOT NULL,"
+    " fetched_at REAL NOT NULL,"
+    " expires_at REAL NOT NULL,"
+    " size INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS responses_fetched_at ON responses (fetched_at)",
+)
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    body: bytes
+    fetched_at: float
+    expires_at: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+
+@dataclass
+class ResponseStoreStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+
+class PersistentResponseCache:
+    """
+    SQLite file of raw upstream response bodies, shared by worker processes
+    and kept across restarts.
+
+    Entries are read one key at a time when first requested, so a new worker
+    starts warm without loading the file up front. The WAL journal lets other
+    processes keep reading while one writes; a `read_only` cache opens the
+    file with mode=ro and never writes to it. Reads go through a memory map
+    of the file, so processes on one host share its pages; on tmpfs
+    (/dev/shm) the cache is a shared-memory segment. Once the stored bodies
+    exceed `max_bytes`, expired entries are evicted first, then the oldest
+    fetched.
+    Storage errors are logged and treated as misses, never raised.
+    """
+
+    # Writes between two checks of the total size
+    EVICTION_CHECK_INTERVAL = 32
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, read_only: bool = False, busy_timeout: float = 1.0, clock=time.time):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.read_only = read_only
+        self._busy_timeout = busy_timeout
+        # Maps the whole file, with room for it to overshoot max_bytes between eviction checks
+        self._mmap_size = int(max_bytes * 2)
+        # Wall clock: timestamps are compared across processes and restarts
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+        self._stats = ResponseStoreStats()
+        if not read_only:
+            self._connection()
+
+    def now(self) -> float:
+        return self._clock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=self._busy_timeout)
+            connection.execute(f"PRAGMA mmap_size={self._mmap_size}")
+            return connection
+        connection = sqlite3.connect(self.path, timeout=self._busy_timeout)
+        connection.execute(f"PRAGMA mmap_size={self._mmap_size}")
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            connection.execute(statement)
+        connection.commit()
+        return connection
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns this thread's connection, opening it on first use and again in a forked child."""
+        connection = getattr(self._local, "connection", None)
+        # SQLite connections must not be used across a fork
+        if connection is None or self._local.pid != os.getpid():
+            connection = self._local.connection = self._connect()
+            self._local.pid = os.getpid()
+        return connection
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self._stats, name, getattr(self._stats, name) + delta)
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        """Returns the stored response for `key`, expired or not, or None."""
+        try:
+            row = self._connection().execute(
+                "SELECT body, fetched_at, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            # A read-only worker can start before any writer has created the file
+            self._local.connection = None
+            self._count(misses=1, errors=1)
+            logger.debug("Response store read of %s failed: %s", key, e)
+            return None
+        if row is None:
+            self._count(misses=1)
+            return None
+        self._count(hits=1)
+        return StoredResponse(body=bytes(row[0]), fetched_at=row[1], expires_at=row[2])
+
+    def put(self, key: str, body: bytes, ttl: float) -> None:
+        """Stores `body` under `key` for `ttl` seconds; a no-op on a read-only cache."""
+        if self.read_only or len(body) > self.max_bytes:
+            return
+        now = self._clock()
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, body, fetched_at, expires_at, size) VALUES (?, ?, ?, ?, ?)",
+                    (key, sqlite3.Binary(body), now, now + ttl, len(body))
+                )
+            self._count(writes=1)
+            with self._lock:
+                self._writes_since_check += 1
+                check = self._writes_since_check >= self.EVICTION_CHECK_INTERVAL
+                if check:
+                    self._writes_since_check = 0
+            if check:
+                self._evict(connection, now)
+        except sqlite3.Error as e:
+            self._count(errors=1)
+            logger.warning("Response store write of %s failed: %s", key, e)
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        """Deletes entries until the stored bodies fit in 90% of max_bytes."""
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * 0.9)
+        victims = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM responses ORDER BY expires_at >= ?, fetched_at", (now,)
+        ):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        with connection:
+            connection.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._count(evictions=len(victims))
+
+    def stats(self) -> ResponseStoreStats:
+        with self._lock:
+            return ResponseStoreStats(**vars(self._stats))
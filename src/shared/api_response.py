@@ -1,7 +1,24 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 from dataclasses import dataclass
 from http import HTTPStatus
 
+class EncodedJSON:
+    """Response body that was already serialized to JSON bytes."""
+    __slots__ = ("body",)
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+
+class StreamedBody:
+    """Response body produced chunk by chunk while it is being sent."""
+    __slots__ = ("chunks", "mimetype")
+
+    def __init__(self, chunks: Iterable[bytes], mimetype: str):
+        self.chunks = chunks
+        self.mimetype = mimetype
+
+
 @dataclass
 class ApiResponse:
     """Class to handle standardized API responses."""
@@ -11,7 +28,7 @@ class ApiResponse:
         data: Any = None,
         message: str = "Success",
         status_code: int = HTTPStatus.OK
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], int]:
         """
         Generates a standardized success response.
         
@@ -21,7 +38,7 @@ class ApiResponse:
             status_code: HTTP status code (default: 200)
             
         Returns:
-            Dict with standardized response structure
+            Tuple of the standardized response structure and the status code
         """
         return {
             "status": "success",
@@ -34,7 +51,7 @@ class ApiResponse:
         message: str,
         status_code: int = HTTPStatus.BAD_REQUEST,
         errors: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], int]:
         """
         Generates a standardized error response.
         
@@ -44,7 +61,7 @@ class ApiResponse:
             errors: Additional error details (optional)
             
         Returns:
-            Dict with standardized error response structure
+            Tuple of the standardized error response structure and the status code
         """
         response = {
             "status": "error",
@@ -60,35 +77,35 @@ class ApiResponse:
     def created(
         data: Any = None,
         message: str = "Resource created successfully"
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], int]:
         """Response for successful creation (201)"""
         return ApiResponse.success(data, message, HTTPStatus.CREATED)
 
     @staticmethod
     def no_content(
         message: str = "No content available"
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], int]:
         """Response for no content (204)"""
         return ApiResponse.success(None, message, HTTPStatus.NO_CONTENT)
 
     @staticmethod
     def not_found(
         message: str = "Resource not found"
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], int]:
         """Response for resource not found (404)"""
         return ApiResponse.error(message, HTTPStatus.NOT_FOUND)
 
     @staticmethod
     def unauthorized(
         message: str = "Unauthorized access"
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], int]:
         """Response for unauthorized access (401)"""
         return ApiResponse.error(message, HTTPStatus.UNAUTHORIZED)
 
     @staticmethod
     def forbidden(
         message: str = "Forbidden access"
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], int]:
         """Response for forbidden access (403)"""
         return ApiResponse.error(message, HTTPStatus.FORBIDDEN)
 
@@ -96,7 +113,7 @@ class ApiResponse:
     def bad_request(
         message: str = "Bad request",
         errors: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], int]:
         """Response for bad request (400)"""
         return ApiResponse.error(message, HTTPStatus.BAD_REQUEST, errors)
 
@@ -104,6 +121,6 @@ class ApiResponse:
     def validation_error(
         errors: Dict[str, Any],
         message: str = "Validation error"
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], int]:
         """Response for validation errors (422)"""
         return ApiResponse.error(message, HTTPStatus.UNPROCESSABLE_ENTITY, errors) 
\ No newline at end of file
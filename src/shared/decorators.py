@@ -1,22 +1,38 @@
+import inspect
 from functools import wraps
 from typing import Callable, Any, Dict
-from .api_response import ApiResponse
+from .api_response import ApiResponse, EncodedJSON, StreamedBody
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+def _format_result(result: Any) -> Any:
+    if isinstance(result, tuple) and len(result) == 2:
+        response, status_code = result
+        if isinstance(response, EncodedJSON):
+            return response.body, status_code, JSON_HEADERS
+        if isinstance(response, StreamedBody):
+            return response.chunks, status_code, {'Content-Type': response.mimetype}
+        if isinstance(response, dict) and 'status' in response:
+            return response, status_code
+
+    if isinstance(result, dict) and 'status' in result:
+        return result, 200
+
+    return ApiResponse.success(data=result)
 
 def format_response(f: Callable) -> Callable:
     """
     Decorator that automatically formats API responses
     """
+    if inspect.iscoroutinefunction(f):
+        @wraps(f)
+        async def decorated_coroutine(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+            return _format_result(await f(*args, **kwargs))
+
+        return decorated_coroutine
+
     @wraps(f)
     def decorated_function(*args: Any, **kwargs: Any) -> Dict[str, Any]:
-        result = f(*args, **kwargs)
-        if isinstance(result, tuple) and len(result) == 2:
-            response, status_code = result
-            if isinstance(response, dict) and 'status' in response:
-                return response, status_code
-    
-        if isinstance(result, dict) and 'status' in result:
-            return result, 200
-            
-        return ApiResponse.success(data=result)
+        return _format_result(f(*args, **kwargs))
         
     return decorated_function 
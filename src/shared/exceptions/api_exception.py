@@ -1,3 +1,57 @@
+import math
+from typing import Dict, Optional
+
+
 class APIException(Exception):
     """Custom exception for API errors."""
-    pass 
\ No newline at end of file
+    status_code = 400
+
+    def __init__(self, message: str = "", status_code: Optional[int] = None):
+        super().__init__(message)
+        if status_code is not None:
+            self.status_code = status_code
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Extra HTTP headers to send with the error response."""
+        return {}
+
+
+class UpstreamError(APIException):
+    """
+    The upstream API failed or answered with an error status.
+
+    `retryable` marks transient failures (connection errors, timeouts, 5xx,
+    429) that may succeed on another attempt and count against the upstream's
+    health; `upstream_status` is the status the upstream answered with, if any.
+    """
+    status_code = 502
+
+    def __init__(self, message: str = "", upstream_status: Optional[int] = None, retryable: bool = True):
+        super().__init__(message)
+        self.upstream_status = upstream_status
+        self.retryable = retryable
+
+
+class UpstreamTimeout(UpstreamError):
+    """The upstream did not answer within the call deadline."""
+    status_code = 504
+
+
+class UpstreamUnavailable(UpstreamError):
+    """
+    The upstream is not being called: its circuit is open, no connection is
+    free or its request budget is spent. `retry_after` is the number of
+    seconds after which a call is expected to be let through, if known.
+    """
+    status_code = 503
+
+    def __init__(self, message: str = "", retry_after: Optional[float] = None, **kwargs):
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        if self.retry_after is None:
+            return {}
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
@@ -0,0 +1,84 @@
+import base64
+import binascii
+import heapq
+import json
+from typing import Any, Generic, List, Optional, Set, Tuple, TypeVar
+
+from src.shared.exceptions.api_exception import APIException
+
+T = TypeVar("T")
+
+CURSOR_VERSION = 1
+
+
+def encode_cursor(after: str) -> str:
+    """Encodes the last ID of a page as an opaque, URL-safe cursor."""
+    payload = json.dumps({"v": CURSOR_VERSION, "after": after}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str) -> Optional[str]:
+    """Decodes a cursor from encode_cursor; an empty token starts from the beginning."""
+    token = (token or "").strip()
+    if not token:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError):
+        raise APIException("Invalid cursor")
+    if not isinstance(payload, dict) or payload.get("v") != CURSOR_VERSION or not isinstance(payload.get("after"), str):
+        raise APIException("Invalid cursor")
+    return payload["after"]
+
+
+class KeysetWindow(Generic[T]):
+    """
+    Collects the first `page_size` items whose ID sorts after `after`.
+
+    Items can arrive in any order; only page_size + 1 of them are kept, so
+    a keyset page can be cut from a crawl without materializing the catalog.
+    """
+
+    def __init__(self, after: Optional[str], page_size: int):
+        self._after = after
+        self._limit = page_size + 1
+        self._page_size = page_size
+        # Max-heap on ID holding the smallest IDs seen so far, so the root is the one to evict
+        self._heap: List[Tuple[Any, int, T]] = []
+        self._ids: Set[str] = set()
+        self._seen = 0
+
+    def offer(self, item: T) -> None:
+        item_id = item.id
+        # A crawl over shifting pages can yield the same item twice
+        if (self._after is not None and item_id <= self._after) or item_id in self._ids:
+            return
+        self._seen += 1
+        entry = (_Inverted(item_id), self._seen, item)
+        if len(self._heap) < self._limit:
+            heapq.heappush(self._heap, entry)
+        elif item_id < self._heap[0][0].value:
+            evicted = heapq.heapreplace(self._heap, entry)
+            self._ids.discard(evicted[0].value)
+        else:
+            return
+        self._ids.add(item_id)
+
+    def result(self) -> Tuple[List[T], bool]:
+        """Returns the page in ID order and whether more items follow it."""
+        items = [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[0].value)]
+        return items[:self._page_size], len(items) > self._page_size
+
+
+class _Inverted:
+    """Wraps a key so heapq's min-heap orders it descending."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: str):
+        self.value = value
+
+    def __lt__(self, other: "_Inverted") -> bool:
+        return self.value > other.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Inverted) and self.value == other.value
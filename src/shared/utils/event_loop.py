@@ -0,0 +1,46 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Optional
+
+
+class EventLoopThread:
+    """
+    Runs an asyncio event loop in a daemon thread.
+
+    Flask executes each async view in its own short-lived loop, so long-lived
+    async resources (like an aiohttp session) live on this loop instead and
+    coroutines are dispatched to it from whichever loop is awaiting them.
+    """
+
+    def __init__(self, name: str = "async-io"):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def _is_current(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    async def run(self, coro: Awaitable[Any]) -> Any:
+        """Awaits `coro` on this loop from any other running loop."""
+        if self._is_current():
+            return await coro
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return await asyncio.wrap_future(future)
+
+    def run_sync(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Blocks the calling thread until `coro` completes on this loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,44 @@
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, TypeVar
+
+from src.shared.utils.forking import reinit_after_fork
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class FanOut:
+    """
+    Bounded worker pool for running independent blocking calls concurrently.
+
+    Only leaf calls should be fanned out: a task that fans out into the same
+    pool again can starve it. Tasks run in a copy of the submitter's context,
+    so context variables such as the upstream priority and the request
+    timings carry over to the workers.
+    """
+
+    def __init__(self, max_workers: int = 8, name: str = "fan-out"):
+        self.max_workers = max_workers
+        self._name = name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        reinit_after_fork(self, "_after_fork")
+
+    def _after_fork(self) -> None:
+        # The executor's worker threads did not survive the fork
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self._name)
+
+    def submit(self, fn: Callable[..., R], *args: Any) -> "Future[R]":
+        return self._executor.submit(contextvars.copy_context().run, fn, *args)
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """Applies `fn` to every item concurrently; results keep the input order."""
+        items = list(items)
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        context = contextvars.copy_context()
+        # Each task needs its own copy: a Context cannot be entered by two threads at once
+        return list(self._executor.map(lambda item: context.copy().run(fn, item), items))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
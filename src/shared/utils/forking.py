@@ -0,0 +1,23 @@
+import os
+import weakref
+from typing import Any
+
+
+def reinit_after_fork(obj: Any, method: str) -> None:
+    """
+    Calls `obj.<method>()` in every child process forked while `obj` is alive.
+
+    Only the forking thread survives a fork, so objects built in a pre-fork
+    parent use this to drop state a child cannot share: pooled sockets,
+    worker threads, random generator state. A no-op where fork is unavailable.
+    """
+    if not hasattr(os, "register_at_fork"):
+        return
+    ref = weakref.ref(obj)
+
+    def reinit() -> None:
+        target = ref()
+        if target is not None:
+            getattr(target, method)()
+
+    os.register_at_fork(after_in_child=reinit)
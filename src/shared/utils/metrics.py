@@ -0,0 +1,422 @@
+import json
+import logging
+import math
+import os
+import secrets
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from src.shared.utils.forking import reinit_after_fork
+
+logger = logging.getLogger(__name__)
+
+# Seconds; spans a cache hit through a slow upstream round trip
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+# JSON form of a metric and its samples, as published for the other processes
+Description = Dict[str, Any]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _render(name: str, description: Description) -> List[str]:
+    """Prometheus text lines of a described metric; its series are (label values, sample) pairs."""
+    lines = [f"# HELP {name} {_escape(description['documentation'])}", f"# TYPE {name} {description['type']}"]
+    labelnames = tuple(description["labelnames"])
+    series: Iterable[Tuple[Sequence[str], Any]] = description["series"]
+    if description["type"] != "histogram":
+        for values, value in series:
+            lines.append(f"{name}{_format_labels(labelnames, values)} {_format_value(value)}")
+        return lines
+
+    bounds = tuple(description["buckets"]) + (math.inf,)
+    for values, (counts, total) in series:
+        values = tuple(values)
+        cumulative = 0
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            labels = _format_labels(labelnames + ("le",), values + (_format_value(bound),))
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _format_labels(labelnames, values)
+        lines.append(f"{name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{name}_count{labels} {cumulative}")
+    return lines
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # One slot per bucket plus the +Inf overflow; made cumulative only when rendered
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+    def reset(self) -> None:
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+
+class Histogram:
+    """
+    Distribution of observed values over fixed buckets, one series per label combination.
+
+    Observing is a bisect plus one short lock, so it is cheap enough for
+    every request; cumulative bucket counts are only computed on render.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._children: Dict[LabelValues, _HistogramChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> _HistogramChild:
+        """Returns the series for the given label values, creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, _HistogramChild(self.buckets))
+        return child
+
+    def describe(self) -> Description:
+        with self._lock:
+            series = sorted(self._children.items())
+        return {
+            "type": "histogram",
+            "documentation": self.documentation,
+            "labelnames": list(self.labelnames),
+            "buckets": list(self.buckets),
+            "series": [[list(values), list(child.snapshot())] for values, child in series],
+        }
+
+    def reset(self) -> None:
+        """Zeroes every series in place, so children held by callers keep recording."""
+        self._lock = threading.Lock()
+        for child in self._children.values():
+            child.reset()
+
+    def render(self) -> List[str]:
+        return _render(self.name, self.describe())
+
+
+class _ValueChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def get(self) -> float:
+        with self._lock:
+            return self._value
+
+    def reset(self, value: float = 0.0) -> None:
+        self._value = value
+        self._lock = threading.Lock()
+
+
+class _ValueMetric:
+    """A single value per label combination; Counter and Gauge differ only in their type and usage."""
+
+    TYPE = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, _ValueChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> _ValueChild:
+        """Returns the series for the given label values, creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, _ValueChild())
+        return child
+
+    def describe(self) -> Description:
+        with self._lock:
+            series = sorted(self._children.items())
+        return {
+            "type": self.TYPE,
+            "documentation": self.documentation,
+            "labelnames": list(self.labelnames),
+            "series": [[list(values), child.get()] for values, child in series],
+        }
+
+    def reset(self) -> None:
+        """Zeroes every series in place, so children held by callers keep recording."""
+        self._lock = threading.Lock()
+        for child in self._children.values():
+            child.reset()
+
+    def render(self) -> List[str]:
+        return _render(self.name, self.describe())
+
+
+class Counter(_ValueMetric):
+    """Monotonically increasing count, one series per label combination; only inc() it."""
+
+    TYPE = "counter"
+
+
+class Gauge(_ValueMetric):
+    """Value that goes up and down, one series per label combination."""
+
+    TYPE = "gauge"
+
+    def reset(self) -> None:
+        """Keeps every value: a gauge is current state (e.g. a breaker's), inherited along with what it describes."""
+        self._lock = threading.Lock()
+        for child in self._children.values():
+            # Not get(): its lock may have been held by a thread that did not survive the fork
+            child.reset(child._value)
+
+
+Metric = Union[Histogram, Counter, Gauge]
+# Series keyed by their label values while the samples of several processes are summed
+Merged = Dict[str, Dict[str, Any]]
+
+
+def _merge(into: Merged, described: Dict[str, Description], worker: Optional[str]) -> None:
+    """
+    Adds the samples of one process to `into`: counters and histograms are
+    summed, gauges keep one series per `worker` (dropped when it is None).
+    """
+    for name, description in described.items():
+        series = description["series"]
+        labelnames = list(description["labelnames"])
+        if description["type"] == "gauge":
+            if worker is None:
+                continue
+            series = [[values + [worker], value] for values, value in series]
+            labelnames.append("worker")
+        merged = into.setdefault(name, dict(description, labelnames=labelnames, series={}))
+        for values, value in series:
+            key = tuple(values)
+            previous = merged["series"].get(key)
+            if previous is None:
+                merged["series"][key] = value
+            elif description["type"] == "histogram":
+                merged["series"][key] = [[a + b for a, b in zip(previous[0], value[0])], previous[1] + value[1]]
+            else:
+                merged["series"][key] = previous + value
+
+
+def _described(merged: Merged) -> Dict[str, Description]:
+    """Turns merged series back into sorted (label values, sample) pairs."""
+    return {
+        name: dict(description, series=[[list(values), value] for values, value in sorted(description["series"].items())])
+        for name, description in merged.items()
+    }
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # Gone with its retired process, or never written
+        return None
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    # Readers only ever see a complete file
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+
+class MetricsRegistry:
+    """
+    Holds the metrics of the process and renders them in the Prometheus text format.
+
+    Pre-forked workers each record into their own copy; after share() every
+    process publishes its samples to a shared directory and render() sums
+    them, so any worker answers a scrape for all of them.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+    RETIRED = "retired.json"
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+        self._directory: Optional[str] = None
+        self._publish_interval = 1.0
+        self._published_as = ""
+
+    def _register(self, name: str, labelnames: Sequence[str], kind: type, create: Callable[[], Metric]) -> Metric:
+        """Returns the metric `name`, registering it with `create` on first use."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = create()
+        if type(metric) is not kind or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} is already registered as a {type(metric).__name__} with labels {metric.labelnames}")
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Returns the histogram `name`, registering it on first use."""
+        return self._register(name, labelnames, Histogram, lambda: Histogram(name, documentation, labelnames, buckets))
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Returns the counter `name`, registering it on first use."""
+        return self._register(name, labelnames, Counter, lambda: Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Returns the gauge `name`, registering it on first use."""
+        return self._register(name, labelnames, Gauge, lambda: Gauge(name, documentation, labelnames))
+
+    def collect(self) -> Dict[str, Description]:
+        """Samples of every metric of this process, JSON-serialisable and keyed by metric name."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.describe() for metric in metrics}
+
+    def share(self, directory: str, publish_interval: float = 1.0) -> None:
+        """
+        Sums the metrics of this process and every process forked from it
+        on render(). Called in the pre-fork master: it empties `directory`
+        of a previous run, forked processes start their counters and
+        histograms from zero (gauges keep their state) and publish
+        their samples there every `publish_interval` seconds, and the
+        master folds those of exited processes in with retire().
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        self._directory = directory
+        self._publish_interval = publish_interval
+        self._published_as = self._publish_name()
+        reinit_after_fork(self, "_after_fork")
+
+    @staticmethod
+    def _publish_name() -> str:
+        # The token keeps a recycled pid from reusing a retired process's file
+        return f"{os.getpid()}-{secrets.token_hex(4)}.json"
+
+    def _after_fork(self) -> None:
+        """A forked process counts only its own work; the parent publishes what it recorded."""
+        self._lock = threading.Lock()
+        for metric in self._metrics.values():
+            metric.reset()
+        self._published_as = self._publish_name()
+        threading.Thread(target=self._publish_periodically, name="metrics-publish", daemon=True).start()
+
+    def _publish_periodically(self) -> None:
+        while True:
+            time.sleep(self._publish_interval)
+            try:
+                self.publish()
+            except OSError:
+                logger.warning("Publishing metrics to %s failed", self._directory, exc_info=True)
+
+    def publish(self) -> None:
+        """Writes this process's samples for the others to render; a no-op unless shared."""
+        if self._directory is not None:
+            _write_json(os.path.join(self._directory, self._published_as), {"pid": os.getpid(), "metrics": self.collect()})
+
+    def retire(self, pid: int) -> None:
+        """
+        Folds the counters and histograms that the exited process `pid`
+        published into the retired totals, so sums never go backwards, and
+        drops its gauges.
+        """
+        if self._directory is None:
+            return
+        path = os.path.join(self._directory, self.RETIRED)
+        retired = _read_json(path) or {"files": [], "metrics": {}}
+        names = [name for name in os.listdir(self._directory) if name.startswith(f"{pid}-") and name.endswith(".json")]
+        merged: Merged = {}
+        _merge(merged, retired["metrics"], None)
+        for name in names:
+            published = _read_json(os.path.join(self._directory, name))
+            if published is not None:
+                _merge(merged, published["metrics"], None)
+        # Listed until their removal is visible, so a concurrent render never counts them twice
+        files = [name for name in retired["files"] if os.path.exists(os.path.join(self._directory, name))] + names
+        _write_json(path, {"files": files, "metrics": _described(merged)})
+        for name in names:
+            os.remove(os.path.join(self._directory, name))
+
+    def _collect_shared(self) -> Dict[str, Description]:
+        """Live samples of this process plus those the other processes published."""
+        merged: Merged = {}
+        published = []
+        for name in os.listdir(self._directory):
+            if name.endswith(".json") and name not in (self.RETIRED, self._published_as):
+                data = _read_json(os.path.join(self._directory, name))
+                if data is not None:
+                    published.append((name, data))
+        # Read after the published files: a file retired meanwhile is listed here and skipped
+        retired = _read_json(os.path.join(self._directory, self.RETIRED)) or {"files": [], "metrics": {}}
+        _merge(merged, retired["metrics"], None)
+        for name, data in published:
+            if name not in retired["files"]:
+                _merge(merged, data["metrics"], str(data["pid"]))
+        _merge(merged, self.collect(), str(os.getpid()))
+        return _described(merged)
+
+    def render(self) -> str:
+        described = self.collect() if self._directory is None else self._collect_shared()
+        lines: List[str] = []
+        for name in sorted(described):
+            lines.extend(_render(name, described[name]))
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry that the API and the upstream clients record into
+REGISTRY = MetricsRegistry()
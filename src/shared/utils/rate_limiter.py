@@ -0,0 +1,172 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+INTERACTIVE = 0
+DEFAULT = 1
+BACKGROUND = 2
+
+_priority: ContextVar[Optional[int]] = ContextVar("upstream_priority", default=None)
+
+
+@contextmanager
+def upstream_priority(level: int) -> Iterator[None]:
+    """Runs the block with `level` as the priority of the upstream calls it makes."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority(default: int = DEFAULT) -> int:
+    """Priority set by the innermost upstream_priority block, or `default` outside any."""
+    level = _priority.get()
+    return default if level is None else level
+
+
+class RateLimitExceeded(Exception):
+    """No token can be granted before the caller's timeout."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"rate limit exceeded; retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class RateLimiterStats:
+    rate: float
+    burst: float
+    tokens: float
+    waiting: int
+    granted: int
+    rejected: int
+
+
+class PriorityTokenBucket:
+    """
+    Token bucket whose waiters are served strictly by priority, then arrival.
+
+    Tokens refill at `rate` per second up to `burst`. A caller that would
+    have to wait longer than its timeout, given the callers ahead of it, is
+    rejected right away instead of queueing until it times out.
+    """
+
+    ASYNC_POLL_INTERVAL = 0.05
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("PriorityTokenBucket: 'rate' must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated_at = clock()
+        self._paused_until = 0.0
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._granted = 0
+        self._rejected = 0
+
+    def _refill(self, now: float) -> None:
+        start = max(self._updated_at, self._paused_until)
+        if now > start:
+            self._tokens = min(self.burst, self._tokens + (now - start) * self.rate)
+        self._updated_at = max(now, self._updated_at)
+
+    def _expected_wait(self, ticket: Tuple[int, int], now: float) -> float:
+        """Time until a token is left for `ticket` once everyone ahead of it was served."""
+        ahead = sum(1 for waiter in self._waiters if waiter < ticket)
+        deficit = ahead + 1 - self._tokens
+        return max(0.0, self._paused_until - now) + max(0.0, deficit / self.rate)
+
+    def _enqueue(self, priority: int) -> Tuple[int, int]:
+        with self._cond:
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, ticket)
+            return ticket
+
+    def _dequeue(self, ticket: Tuple[int, int]) -> None:
+        with self._cond:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+            self._cond.notify_all()
+
+    def _take_or_wait(self, ticket: Tuple[int, int], deadline: float) -> Optional[float]:
+        """Takes a token if it is `ticket`'s turn (None), else returns how long to wait; caller holds the lock."""
+        now = self._clock()
+        self._refill(now)
+        if self._waiters[0] == ticket and self._tokens >= 1.0 and now >= self._paused_until:
+            self._tokens -= 1.0
+            self._granted += 1
+            return None
+
+        wait = self._expected_wait(ticket, now)
+        if now + wait > deadline:
+            self._rejected += 1
+            raise RateLimitExceeded(max(wait, 1.0 / self.rate))
+        return max(min(wait, deadline - now), 0.001)
+
+    def acquire(self, priority: int = DEFAULT, timeout: float = 0.0) -> float:
+        """
+        Takes one token, waiting up to `timeout` seconds for it.
+
+        Returns the time spent waiting; raises RateLimitExceeded with the
+        expected wait when the token cannot be had within the timeout.
+        """
+        started = self._clock()
+        deadline = started + timeout
+        ticket = self._enqueue(priority)
+        try:
+            with self._cond:
+                while True:
+                    wait = self._take_or_wait(ticket, deadline)
+                    if wait is None:
+                        return self._clock() - started
+                    # Woken early when a waiter ahead leaves; otherwise re-check once a token is due
+                    self._cond.wait(wait)
+        finally:
+            self._dequeue(ticket)
+
+    async def acquire_async(self, priority: int = DEFAULT, timeout: float = 0.0) -> float:
+        """acquire() for coroutines: sleeps on the event loop instead of blocking its thread."""
+        started = self._clock()
+        deadline = started + timeout
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._take_or_wait(ticket, deadline)
+                if wait is None:
+                    return self._clock() - started
+                # notify_all cannot wake a coroutine, so re-check at least every ASYNC_POLL_INTERVAL
+                await asyncio.sleep(min(wait, self.ASYNC_POLL_INTERVAL))
+        finally:
+            self._dequeue(ticket)
+
+    def pause(self, seconds: float) -> None:
+        """Stops granting tokens for `seconds`, e.g. after the upstream answered 429."""
+        with self._cond:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._paused_until = max(self._paused_until, now + seconds)
+
+    def stats(self) -> RateLimiterStats:
+        with self._cond:
+            self._refill(self._clock())
+            return RateLimiterStats(
+                rate=self.rate,
+                burst=self.burst,
+                tokens=self._tokens,
+                waiting=len(self._waiters),
+                granted=self._granted,
+                rejected=self._rejected
+            )
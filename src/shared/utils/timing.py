@@ -0,0 +1,100 @@
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class _Span:
+    __slots__ = ("name", "child_time")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.child_time = 0.0
+
+
+class RequestTimings:
+    """
+    Self time of the spans opened while serving one request, by span name.
+
+    A span's time excludes the spans nested in it, so the totals split the
+    request instead of overlapping. Spans running in parallel threads each
+    count in full, so parallel upstream calls add up.
+    """
+
+    def __init__(self, root: str):
+        self._root = _Span(root)
+        self._totals: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def _close(self, span: _Span, parent: Optional[_Span], elapsed: float) -> None:
+        with self._lock:
+            self._totals[span.name] = self._totals.get(span.name, 0.0) + max(0.0, elapsed - span.child_time)
+            if parent is not None:
+                parent.child_time += elapsed
+
+    def finish(self) -> Dict[str, float]:
+        """Closes the root span and returns the self time of every span name, in seconds."""
+        self._close(self._root, None, time.perf_counter() - self._started)
+        with self._lock:
+            return dict(self._totals, total=time.perf_counter() - self._started)
+
+
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+_parent: ContextVar[Optional[_Span]] = ContextVar("timing_parent", default=None)
+
+
+def start_timings(root: str) -> RequestTimings:
+    """Starts recording spans in the current context; time outside any span goes to `root`."""
+    timings = RequestTimings(root)
+    _timings.set(timings)
+    _parent.set(timings._root)
+    return timings
+
+
+def stop_timings() -> None:
+    """Stops recording spans in the current context."""
+    _timings.set(None)
+    _parent.set(None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Adds the time spent in the block to `name`; a no-op outside start_timings."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    parent = _parent.get()
+    current = _Span(name)
+    token = _parent.set(current)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _parent.reset(token)
+        timings._close(current, parent, time.perf_counter() - started)
+
+
+def timed(name: str) -> Callable:
+    """Decorator that runs a function or coroutine function inside span(name)."""
+    def decorator(f: Callable) -> Callable:
+        if inspect.iscoroutinefunction(f):
+            @wraps(f)
+            async def decorated_coroutine(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await f(*args, **kwargs)
+
+            return decorated_coroutine
+
+        @wraps(f)
+        def decorated_function(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Optional, TypeVar
+
+V = TypeVar('V')
+
+
+@dataclass
+class CacheEntry(Generic[V]):
+    value: V
+    stored_at: float
+    fresh_until: float
+    stale_until: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def is_usable(self, now: float) -> bool:
+        return now < self.stale_until
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    max_entries: int = 0
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe LRU cache whose entries carry a fresh TTL and a stale grace window."""
+
+    def __init__(self, max_entries: int = 1024, clock=time.monotonic):
+        if max_entries < 1:
+            raise ValueError("TTLCache: 'max_entries' must be at least 1")
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, CacheEntry[V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats(max_entries=max_entries)
+
+    def now(self) -> float:
+        return self._clock()
+
+    def get(self, key: Hashable) -> Optional[CacheEntry[V]]:
+        """
+        Returns the entry for `key` while it is fresh or stale, None once it has expired.
+        Stale entries are returned as-is; the caller decides whether to refresh them.
+        Expired entries stay until they are overwritten or evicted, see peek().
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.is_usable(now):
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if entry.is_fresh(now):
+                self._stats.hits += 1
+            else:
+                self._stats.stale_hits += 1
+            return entry
+
+    def peek(self, key: Hashable) -> Optional[CacheEntry[V]]:
+        """Returns the entry for `key` even if it has expired, without counting a hit or a miss."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: Hashable, value: V, ttl: float, stale_ttl: float = 0.0) -> CacheEntry[V]:
+        """Stores `value`, evicting the least recently used entries beyond the cap."""
+        now = self._clock()
+        entry = CacheEntry(
+            value=value,
+            stored_at=now,
+            fresh_until=now + ttl,
+            stale_until=now + ttl + stale_ttl
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+        return entry
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                stale_hits=self._stats.stale_hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                size=len(self._entries),
+                max_entries=self.max_entries
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -3,11 +3,15 @@ Endpoints to evaluate:
 
 GET /breeds
 GET /breeds/<breed_id>
+GET /breeds?ids=<breed_id>,<breed_id>
 GET /facts
+GET /facts?limit=<count>
 GET /groups
 GET /groups/<group_id>
+GET /groups?ids=<group_id>,<group_id>
 GET /group-details/<group_id>
 GET /group-details/<group_id>/breed/<breed_id>
+GET /group-details/<group_id>/breeds
 
 """
 
@@ -23,13 +27,19 @@ basic_endpoints = [
     "http://127.0.0.1:5000/breeds",
     "http://127.0.0.1:5000/breeds/68f47c5a-5115-47cd-9849-e45d3c378f12",
     "http://127.0.0.1:5000/facts",
+    "http://127.0.0.1:5000/facts?limit=5",
     "http://127.0.0.1:5000/groups",
-    "http://127.0.0.1:5000/groups/8000793f-a1ae-4ec4-8d55-ef83f1f644e5"
+    "http://127.0.0.1:5000/groups/8000793f-a1ae-4ec4-8d55-ef83f1f644e5",
+    "http://127.0.0.1:5000/breeds?ids=68f47c5a-5115-47cd-9849-e45d3c378f12",
+    "http://127.0.0.1:5000/groups?ids=8000793f-a1ae-4ec4-8d55-ef83f1f644e5",
+    "http://127.0.0.1:5000/breeds?cursor=",
+    "http://127.0.0.1:5000/groups?cursor="
 ]
 
 complex_endpoints = [
     "http://127.0.0.1:5000/group-details/8000793f-a1ae-4ec4-8d55-ef83f1f644e5",
-    "http://127.0.0.1:5000/group-details/8000793f-a1ae-4ec4-8d55-ef83f1f644e5/breed/68f47c5a-5115-47cd-9849-e45d3c378f12"
+    "http://127.0.0.1:5000/group-details/8000793f-a1ae-4ec4-8d55-ef83f1f644e5/breed/68f47c5a-5115-47cd-9849-e45d3c378f12",
+    "http://127.0.0.1:5000/group-details/8000793f-a1ae-4ec4-8d55-ef83f1f644e5/breeds"
 ]
 
 def eval_resp(task_done= False, fct= 1):